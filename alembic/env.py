@@ -24,6 +24,9 @@ def get_database_url() -> str:
     env_url = os.getenv("TIME_TRACKER_DB_URL")
     if env_url:
         return env_url
+    configured_url = config.attributes.get("database_url")
+    if configured_url:
+        return configured_url
 
     DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
     return f"sqlite:///{DATABASE_PATH}"
@@ -0,0 +1,69 @@
+"""Add the WorkSchedule table for effective dated work times.
+
+The table is seeded with the current config, which applied to the whole history until now.
+
+Revision ID: 9c3e1f2b7a41
+Revises: 348acf3ce3c3
+Create Date: 2026-10-19 10:12:31.518204
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import context, op
+from src.schedule import SCHEDULE_START
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3e1f2b7a41"
+down_revision: str | Sequence[str] | None = "348acf3ce3c3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # the table might already exist, if the app created it before the migration
+    if "WorkSchedule" not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            "WorkSchedule",
+            sa.Column("ID", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("EffectiveFrom", sa.Date(), nullable=False),
+            sa.Column("Workdays", sa.String(), nullable=False),
+            sa.Column("DailyHours", sa.String(), nullable=False),
+        )
+        op.create_index("idx_effective_from", "WorkSchedule", ["EffectiveFrom"], unique=True)
+
+    schedule_table = sa.table(
+        "WorkSchedule",
+        sa.column("EffectiveFrom", sa.Date()),
+        sa.column("Workdays", sa.String()),
+        sa.column("DailyHours", sa.String()),
+    )
+    if bind.execute(sa.select(sa.func.count()).select_from(schedule_table)).scalar():
+        return
+    # other databases than the one of the app (e.g. batch reports) are migrated with their own config,
+    # the config file of the app is only read if none is given
+    config = context.config.attributes.get("app_config")
+    if config is None:
+        from src.config_handler import CONFIG_HANDLER  # noqa: PLC0415
+
+        config = CONFIG_HANDLER.config
+    op.bulk_insert(
+        schedule_table,
+        [
+            {
+                "EffectiveFrom": SCHEDULE_START,
+                "Workdays": ",".join(str(day) for day in sorted(config.workdays)),
+                "DailyHours": ",".join(str(hours) for hours in config.get_all_daily_hours()),
+            }
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_effective_from", "WorkSchedule")
+    op.drop_table("WorkSchedule")
@@ -1,32 +1,74 @@
-from src.utils import prepare_data_location_and_files, run_db_migrations, setup_logging
-
-# Prepare the data location and files. meeds to be done before importing the main application
-setup_logging()
-prepare_data_location_and_files()
-run_db_migrations()
-
 import logging
+import multiprocessing
 import sys
+import time
+from typing import TYPE_CHECKING
 
-from PyQt6.QtWidgets import QApplication
-
-from src.ui_mainwindow import MainWindow
-from src.utils import get_additional_run_args, sync_theme
+if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QApplication
 
 logger = logging.getLogger(__name__)
 
 
-if __name__ == "__main__":
+def main() -> None:
+    start_time = time.perf_counter()
+    from src.instance_channel import send_command
+    from src.startup import prepare_data_location_and_files, run_db_migrations, setup_logging
+
+    # Prepare the data location and files. meeds to be done before importing the main application
+    setup_logging()
+    # only one app should write to the database and hold the caches, so a second launch shows the running one
+    if send_command("show") is not None:
+        logger.info("App is already running, showing it instead of starting a second one")
+        return
+    prepare_data_location_and_files()
+    run_db_migrations()
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    from src.instance_server import InstanceServer
+    from src.theme import THEME
+    from src.ui_mainwindow import MainWindow
+    from src.utils import get_additional_run_args, sync_theme
+
     try:
         app = QApplication(sys.argv + get_additional_run_args())
         w = MainWindow()
+        # later launches and the command line send their commands to this app
+        server = InstanceServer(w.run_command, parent=app)
+        server.listen()
+        start_api(app)
         # in case of active style change, also change theme, need to sync at start
-        # app.paletteChanged.connect(sync_theme)
+        THEME.watch(app)
+        THEME.changed.connect(sync_theme)
         # still keep the app running, even if the main window is closed (we use tray for the app)
         QApplication.setQuitOnLastWindowClosed(False)
         sync_theme()
         w.show()
+        # logged as soon as the event loop runs, so the tray icon and window are visible
+        QTimer.singleShot(0, lambda: logger.info("Startup took %.0f ms", (time.perf_counter() - start_time) * 1000))
         sys.exit(app.exec())
     except Exception as e:
         logger.exception(e)
         raise
+
+
+def start_api(app: "QApplication") -> None:
+    """Start the local JSON API if a port is configured, it is served in a background thread."""
+    from src.config_handler import CONFIG_HANDLER
+
+    if not CONFIG_HANDLER.config.api_port:
+        return
+    from src.api_server import ApiServer
+    from src.database_controller import DB_CONTROLLER
+
+    api = ApiServer(DB_CONTROLLER, port=CONFIG_HANDLER.config.api_port)
+    if api.start():
+        app.aboutToQuit.connect(api.stop)
+
+
+# everything is started within main, since worker processes (month computation) import this module again
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,490 @@
+"""Local JSON API of the running app, e.g. for status bars, editor plugins or dashboards on the same machine.
+
+The server runs an asyncio loop in a background thread and only listens on localhost. It is enabled with the
+api_port config value. Reads are computed out of the store and cached together with the data version
+(changes of the database and the config), so polling the same resource again does not query the database.
+The responses have an ETag, clients sending it back with If-None-Match get a 304 without body.
+Start and stop are sent to the app over the instance channel, so they take the same path as the buttons.
+
+    GET  /api/status                     is the time tracked, work and pause of today
+    GET  /api/events?date=YYYY-MM-DD     events and pause of the day, default is today
+    GET  /api/day?date=YYYY-MM-DD        report of the day, default is today
+    GET  /api/month?month=YYYY-MM        report of each day and totals of the month, default is the current one
+    GET  /api/year?year=YYYY             totals of each month of the year, default is the current one
+    GET  /api/overtime                   overtime of all years
+    GET  /api/metrics                    request count and timings of each route
+    POST /api/start, /api/stop           add the event, optional JSON body {"at": "YYYY-MM-DDTHH:MM:SS"},
+                                         the content type needs to be application/json
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from src.config_handler import CONFIG_HANDLER
+from src.engine import HOUR_COLUMNS, minutes_to_time
+from src.instance_channel import send_command
+from src.work_time import day_work_time
+
+if TYPE_CHECKING:
+    from src.database_controller import DatabaseController
+    from src.datastore import Store
+    from src.engine import MonthReport
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+# other hosts could be a website using DNS rebinding to read the data
+ALLOWED_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+MAX_BODY_SIZE = 64 * 1024
+# number of cached responses, the key is the path with the query
+MAX_CACHED_RESPONSES = 256
+# number of the last request durations of each route used for the percentiles
+TIMING_WINDOW = 1000
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+# sends the command with its arguments to the app, returns its response or None if the app does not answer
+CommandSender = Callable[..., dict[str, Any] | None]
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        """Error answered with the status and the message as JSON."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class RouteTimings:
+    count: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    recent: deque[float] = field(default_factory=lambda: deque(maxlen=TIMING_WINDOW))
+
+    def to_dict(self) -> dict[str, Any]:
+        p50, p95 = np.percentile(self.recent, [50, 95]) if self.recent else (0.0, 0.0)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_s / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(float(p50) * 1000, 3),
+            "p95_ms": round(float(p95) * 1000, 3),
+            "max_ms": round(self.max_s * 1000, 3),
+        }
+
+
+@dataclass
+class RequestMetrics:
+    """Count and duration of the requests of each route, and how many were answered out of the cache."""
+
+    routes: dict[str, RouteTimings] = field(default_factory=dict)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    not_modified: int = 0
+
+    def record(self, route: str, status: int, seconds: float) -> None:
+        timings = self.routes.setdefault(route, RouteTimings())
+        timings.count += 1
+        timings.errors += status >= 400  # noqa: PLR2004
+        timings.total_s += seconds
+        timings.max_s = max(timings.max_s, seconds)
+        timings.recent.append(seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "routes": {route: timings.to_dict() for route, timings in sorted(self.routes.items())},
+            "cache": {"hits": self.cache_hits, "misses": self.cache_misses, "not_modified": self.not_modified},
+        }
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes = b""
+    etag: str | None = None
+
+
+class ApiServer:
+    def __init__(
+        self,
+        database: DatabaseController,
+        store: Store | None = None,
+        port: int = 0,
+        host: str = HOST,
+        send: CommandSender = send_command,
+    ) -> None:
+        """Serve the JSON API in a background thread, see the module docstring for the routes.
+
+        Without store the one of the app is used. It is loaded after the server listens, so the app start
+        is not delayed, until then the data routes answer with 503.
+        Port 0 uses a free port, the used one is available after start.
+        """
+        self.database = database
+        self.store = store
+        self.host = host
+        self.port = port
+        self.send = send
+        self.metrics = RequestMetrics()
+        self._responses: OrderedDict[str, tuple[tuple, Response]] = OrderedDict()
+        self._last_event_cache: tuple[int, tuple[str, str] | None] | None = None
+        self._overtime_version: tuple | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._routes: dict[tuple[str, str], Callable[[dict[str, str]], Any]] = {
+            ("GET", "/api/status"): self._status,
+            ("GET", "/api/events"): self._events,
+            ("GET", "/api/day"): self._day,
+            ("GET", "/api/month"): self._month,
+            ("GET", "/api/year"): self._year,
+            ("GET", "/api/overtime"): self._overtime,
+        }
+
+    def start(self) -> bool:
+        """Start the server thread and wait until it listens, returns if it could listen."""
+        self._thread = threading.Thread(target=self._run, name="api-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self._stopped is not None
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            logger.exception(e)
+        finally:
+            self._ready.set()
+
+    async def _serve(self) -> None:
+        try:
+            server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        except OSError as e:
+            logger.warning("Could not start the API on %s:%s: %s", self.host, self.port, e)
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self.port = server.sockets[0].getsockname()[1]
+        logger.info("API listening on %s", self.url)
+        self._ready.set()
+        async with server:
+            if self.store is None:
+                self.store = await asyncio.to_thread(_load_app_store)
+            await self._stopped.wait()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of the connection, HTTP/1.1 keeps it open for further requests."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                headers = await self._read_headers(reader)
+                keep_alive = request_line.rstrip().endswith(b"HTTP/1.1") and headers.get("connection") != "close"
+                route = "invalid"
+                try:
+                    method, target, _ = request_line.decode("latin-1").split()
+                    route = urlsplit(target).path
+                    body = await self._read_body(reader, headers)
+                    response = await self._respond(method, target, headers, body)
+                except ApiError as e:
+                    response = _json_response(e.status, {"error": e.message})
+                    # the body of the request might not be read, so the next request could not be parsed
+                    keep_alive = keep_alive and e.status != 413  # noqa: PLR2004
+                except ValueError:
+                    response = _json_response(400, {"error": "Invalid request"})
+                    keep_alive = False
+                except Exception as e:
+                    logger.exception(e)
+                    response = _json_response(500, {"error": str(e)})
+                duration = time.perf_counter() - start
+                self.metrics.record(route, response.status, duration)
+                writer.write(_encode(response, keep_alive, duration))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_headers(self, reader: asyncio.StreamReader) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict[str, str]) -> bytes:
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_SIZE:
+            raise ApiError(413, "Request body too large")
+        return await reader.readexactly(length) if length else b""
+
+    async def _respond(self, method: str, target: str, headers: dict[str, str], body: bytes) -> Response:
+        if _host_name(headers.get("host", "")) not in ALLOWED_HOSTS:
+            raise ApiError(403, "Only local hosts are allowed")
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        if url.path == "/api/metrics" and method == "GET":
+            return _json_response(200, self.metrics.to_dict())
+        if url.path in ("/api/start", "/api/stop"):
+            if method != "POST":
+                raise ApiError(405, "Use POST to add events")
+            return await self._add_event(url.path.rpartition("/")[2], headers, body)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):
+                raise ApiError(405, f"Use GET to read {url.path}")
+            raise ApiError(404, f"Unknown route {url.path}")
+        return await self._cached_read(target, query, handler, headers.get("if-none-match"))
+
+    async def _cached_read(
+        self,
+        target: str,
+        query: dict[str, str],
+        handler: Callable[[dict[str, str]], Any],
+        if_none_match: str | None,
+    ) -> Response:
+        """Return the cached response if the data did not change since, otherwise compute it in a worker thread."""
+        version = self._data_version(await self._current_last_event())
+        cached = self._responses.get(target)
+        if cached is not None and cached[0] == version:
+            self.metrics.cache_hits += 1
+            self._responses.move_to_end(target)
+            response = cached[1]
+        else:
+            self.metrics.cache_misses += 1
+            # database and computation would block the other requests
+            response = await asyncio.to_thread(self._read, handler, query)
+            response.etag = f'"{hash((version, target)) & 0xFFFFFFFFFFFFFFFF:x}"'
+            self._responses[target] = (version, response)
+            self._responses.move_to_end(target)
+            while len(self._responses) > MAX_CACHED_RESPONSES:
+                self._responses.popitem(last=False)
+        if if_none_match is not None and if_none_match == response.etag:
+            self.metrics.not_modified += 1
+            return Response(304, etag=response.etag)
+        return response
+
+    def _read(self, handler: Callable[[dict[str, str]], Any], query: dict[str, str]) -> Response:
+        if self.store is None:
+            raise ApiError(503, "The data is still loading")
+        with self.store.lock:
+            return _json_response(200, handler(query))
+
+    def _data_version(self, last_event: tuple[str, str] | None) -> tuple:
+        """Everything the responses depend on, while tracking the running day also changes every minute."""
+        version = (self.database.data_version, CONFIG_HANDLER.config_hash(), datetime.date.today())
+        if last_event is not None and last_event[1] == "start":
+            return (*version, datetime.datetime.now().strftime("%H:%M"))
+        return version
+
+    async def _current_last_event(self) -> tuple[str, str] | None:
+        """Return the last event, only query it in a worker thread if the data changed since."""
+        data_version = self.database.data_version
+        if self._last_event_cache is None or self._last_event_cache[0] != data_version:
+            # the query would block the other requests
+            last_event = await asyncio.to_thread(self.database.get_last_event)
+            self._last_event_cache = (data_version, last_event)
+        return self._last_event_cache[1]
+
+    def _last_event(self) -> tuple[str, str] | None:
+        data_version = self.database.data_version
+        if self._last_event_cache is None or self._last_event_cache[0] != data_version:
+            self._last_event_cache = (data_version, self.database.get_last_event())
+        return self._last_event_cache[1]
+
+    async def _add_event(self, event: str, headers: dict[str, str], body: bytes) -> Response:
+        # a website can not send JSON to another origin without asking first, which is never allowed here,
+        # so the content type is required even without body, forms and simple requests can not set it
+        if not headers.get("content-type", "").startswith("application/json"):
+            raise ApiError(415, "Use the content type application/json")
+        origin = headers.get("origin")
+        if origin is not None and _host_name(urlsplit(origin).netloc) not in ALLOWED_HOSTS:
+            raise ApiError(403, "Only local origins are allowed")
+        arguments = json.loads(body) if body else {}
+        if not isinstance(arguments, dict):
+            raise ApiError(400, "The body needs to be a JSON object")
+        at = arguments.get("at")
+        if at is not None:
+            datetime.datetime.fromisoformat(at)
+        response = await asyncio.to_thread(self.send, event, at=at)
+        if response is None:
+            raise ApiError(503, "The app does not answer")
+        return _json_response(200 if response["ok"] else 400, response)
+
+    def _status(self, query: dict[str, str]) -> dict[str, Any]:
+        now = datetime.datetime.now()
+        last_event = self._last_event()
+        events, pauses = self._day_data(now.date())
+        worked_seconds, _, _ = day_work_time(events, now.date(), now)
+        pause_minutes = pauses[0][1] if pauses else 0
+        return {
+            "tracking": last_event is not None and last_event[1] == "start",
+            "last_event": None if last_event is None else {"time": last_event[0], "event": last_event[1]},
+            "work": round(max(worked_seconds - pause_minutes * 60, 0) / 3600, 2),
+            "pause": pause_minutes,
+            "overtime": self._overtime_totals()[0],
+        }
+
+    def _events(self, query: dict[str, str]) -> dict[str, Any]:
+        day = _parse_date(query.get("date"))
+        events, pauses = self._day_data(day)
+        return {
+            "date": day.isoformat(),
+            "events": [{"time": event_time, "event": event} for event_time, event in events],
+            "pause": pauses[0][1] if pauses else 0,
+        }
+
+    def _day(self, query: dict[str, str]) -> dict[str, Any]:
+        day = _parse_date(query.get("date"))
+        report = self._month_report(day)
+        index = np.flatnonzero(report.days == np.datetime64(day, "D"))
+        if not len(index):
+            return {"date": day.isoformat(), **dict.fromkeys(("start", "end")), **dict.fromkeys(HOUR_COLUMNS.values())}
+        return _day_json(report, int(index[0]))
+
+    def _month(self, query: dict[str, str]) -> dict[str, Any]:
+        month = _parse_month(query.get("month"))
+        report = self._month_report(month)
+        return {
+            "month": month.strftime("%Y-%m"),
+            "days": [_day_json(report, i) for i in range(len(report))],
+            "totals": {name: round(report.hours(column), 2) for column, name in HOUR_COLUMNS.items()},
+        }
+
+    def _year(self, query: dict[str, str]) -> dict[str, Any]:
+        year = int(query.get("year") or datetime.date.today().year)
+        assert self.store is not None
+        totals = self.store.get_year_totals(year)
+        months = [
+            {
+                "month": month.strftime("%Y-%m"),
+                **{name: round(int(totals.sums[column][i]) / 3600, 2) for column, name in HOUR_COLUMNS.items()},
+            }
+            for i, month in enumerate(totals.months.tolist())
+        ]
+        return {
+            "year": year,
+            "months": months,
+            "totals": {name: round(int(totals.sums[column].sum()) / 3600, 2) for column, name in HOUR_COLUMNS.items()},
+        }
+
+    def _overtime(self, query: dict[str, str]) -> dict[str, Any]:
+        total, by_year = self._overtime_totals()
+        return {"total": total, "years": {str(year): overtime for year, overtime in by_year.items()}}
+
+    def _overtime_totals(self) -> tuple[float, dict[int, float]]:
+        """Return the overtime of the store, recalculated once after each change of the data or config."""
+        assert self.store is not None
+        version = (self.database.data_version, CONFIG_HANDLER.config_hash())
+        if self._overtime_version != version:
+            self.store.calculate_overtime_totals()
+            self._overtime_version = version
+        return self.store.total_overtime, self.store.overtime_by_year
+
+    def _day_data(self, day: datetime.date) -> tuple[list[tuple[str, str]], list[tuple[str, int]]]:
+        assert self.store is not None
+        return self.store.generate_month_data(day).get_day_data(day)
+
+    def _month_report(self, day: datetime.date) -> MonthReport:
+        assert self.store is not None
+        return self.store.generate_month_data(day).report
+
+
+def _load_app_store() -> Store:
+    from src.datastore import store  # noqa: PLC0415
+
+    return store
+
+
+def _day_json(report: MonthReport, index: int) -> dict[str, Any]:
+    start, end = minutes_to_time(report.start_min[index]), minutes_to_time(report.end_min[index])
+    return {
+        "date": report.days[index].item().isoformat(),
+        "start": start.strftime("%H:%M") if start else None,
+        "end": end.strftime("%H:%M") if end else None,
+        **{name: round(int(getattr(report, column)[index]) / 3600, 2) for column, name in HOUR_COLUMNS.items()},
+    }
+
+
+def _parse_date(value: str | None) -> datetime.date:
+    if not value:
+        return datetime.date.today()
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"Invalid date {value}, use YYYY-MM-DD") from None
+
+
+def _parse_month(value: str | None) -> datetime.date:
+    if not value:
+        return datetime.date.today().replace(day=1)
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise ApiError(400, f"Invalid month {value}, use YYYY-MM") from None
+
+
+def _host_name(host: str) -> str:
+    """Remove the port of the host header, IPv6 addresses are in brackets."""
+    if host.startswith("["):
+        return host.partition("]")[0] + "]"
+    return host.partition(":")[0]
+
+
+def _json_response(status: int, data: Any) -> Response:
+    return Response(status, json.dumps(data).encode())
+
+
+def _encode(response: Response, keep_alive: bool, duration: float) -> bytes:
+    lines = [
+        f"HTTP/1.1 {response.status} {REASONS.get(response.status, '')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(response.body)}",
+        "Cache-Control: no-cache",
+        f"Server-Timing: app;dur={duration * 1000:.3f}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if response.etag is not None:
+        lines.append(f"ETag: {response.etag}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + response.body
@@ -0,0 +1,145 @@
+"""Startup cache of the generated stylesheet and icon pixmaps.
+
+The stylesheet is generated by qdarktheme and the icons are rendered from fonts by qtawesome on every start,
+which also needs both packages imported. Both results are stored in the app folder and read from there on later
+starts, so the packages are only imported if something is missing. The cache is versioned by the app, package
+and Qt versions, on any change it is cleared and filled again. The theme (colors) is part of each file name.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from PyQt6.QtCore import QT_VERSION_STR, QBuffer, QByteArray, QIODevice, QSize
+from PyQt6.QtGui import QIcon, QPixmap
+
+from src import __version__
+from src.filepath import ASSET_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+# increased when the stored files change
+CACHE_FORMAT = 1
+
+
+class AssetCache:
+    def __init__(self, folder: Path) -> None:
+        """Cache of the assets in the given folder, which is checked on first use."""
+        self.folder = folder
+        self._usable: bool | None = None
+
+    @property
+    def usable(self) -> bool:
+        """Return if the folder is ready for the current versions, clear it if it is from other versions."""
+        if self._usable is None:
+            self._usable = self._prepare()
+        return self._usable
+
+    def get_stylesheet(self, theme: str) -> str:
+        """Return the qdarktheme stylesheet of the theme ('light' or 'dark')."""
+        path = self.folder / f"stylesheet_{theme}.qss"
+        if self.usable and path.exists():
+            try:
+                return path.read_text(encoding="utf-8")
+            except OSError as e:
+                logger.warning("Could not read the cached stylesheet %s: %s", path, e)
+        import qdarktheme  # noqa: PLC0415
+
+        stylesheet = qdarktheme.load_stylesheet(theme)
+        self._store(path, stylesheet.encode("utf-8"))
+        return stylesheet
+
+    def get_icon(self, icon_name: str, color: str, sizes: tuple[int, ...], pixel_ratio: float) -> QIcon:
+        """Return the qtawesome icon with a pixmap for each size (rendered at the device pixel ratio)."""
+        paths = [self.folder / _icon_file_name(icon_name, color, size, pixel_ratio) for size in sizes]
+        if self.usable and all(path.exists() for path in paths):
+            icon = _load_icon(paths, pixel_ratio)
+            if icon is not None:
+                return icon
+        import qtawesome as qta  # noqa: PLC0415
+
+        font_icon = qta.icon(icon_name, color=color)
+        icon = QIcon()
+        for size, path in zip(sizes, paths, strict=True):
+            pixmap = font_icon.pixmap(QSize(size, size))
+            icon.addPixmap(pixmap)
+            self._store(path, _png_bytes(pixmap))
+        return icon
+
+    def _prepare(self) -> bool:
+        manifest_path = self.folder / "manifest.json"
+        manifest = _manifest()
+        try:
+            if json.loads(manifest_path.read_text(encoding="utf-8")) == manifest:
+                return True
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read the asset cache manifest %s: %s", manifest_path, e)
+        try:
+            if self.folder.exists():
+                shutil.rmtree(self.folder)
+            self.folder.mkdir(parents=True)
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+        except OSError as e:
+            # the assets are still generated, only not stored
+            logger.warning("Could not prepare the asset cache at %s: %s", self.folder, e)
+            return False
+        return True
+
+    def _store(self, path: Path, data: bytes) -> None:
+        if not self.usable:
+            return
+        try:
+            path.write_bytes(data)
+        except OSError as e:
+            logger.warning("Could not store %s in the asset cache: %s", path.name, e)
+
+
+def _manifest() -> dict[str, str | int]:
+    return {
+        "format": CACHE_FORMAT,
+        "app": __version__,
+        "qt": QT_VERSION_STR,
+        "pyqtdarktheme": _package_version("pyqtdarktheme"),
+        "qtawesome": _package_version("qtawesome"),
+    }
+
+
+def _package_version(package: str) -> str:
+    # the metadata might not be bundled in the installer build, there the app version changes with the packages
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _icon_file_name(icon_name: str, color: str, size: int, pixel_ratio: float) -> str:
+    return f"icon_{icon_name}_{color.lstrip('#')}_{size}@{pixel_ratio:g}x.png"
+
+
+def _png_bytes(pixmap: QPixmap) -> bytes:
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    pixmap.save(buffer, "PNG")
+    return bytes(data.data())
+
+
+def _load_icon(paths: list[Path], pixel_ratio: float) -> QIcon | None:
+    icon = QIcon()
+    for path in paths:
+        pixmap = QPixmap(str(path))
+        if pixmap.isNull():
+            logger.warning("Could not load the cached icon %s, rendering it again", path.name)
+            return None
+        pixmap.setDevicePixelRatio(pixel_ratio)
+        icon.addPixmap(pixmap)
+    return icon
+
+
+ASSET_CACHE = AssetCache(ASSET_CACHE_PATH)
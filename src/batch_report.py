@@ -0,0 +1,168 @@
+"""Reports of many users at once, e.g. for the month end processing of the databases of all employees.
+
+The folder contains a subfolder for each user, named after the user, with the time_data.db and optionally the
+config.json of the app (without config, the default settings are used). The users are processed in a process pool,
+each worker opens its own database and config, so none of the singletons of the app (bound to the local files)
+is used. The databases are only read, outdated ones are migrated in a temporary copy.
+Each report is exported into a subfolder of the output named after the user, next to a summary of all users.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import logging
+import sqlite3
+import tempfile
+from collections.abc import Generator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing, contextmanager
+from dataclasses import astuple, dataclass, fields
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+
+from src.config_handler import Config, ConfigHandler
+from src.engine import MonthReport, build_month_base, build_month_report, daily_target_seconds
+from src.filepath import CONFIG_PATH, DATABASE_PATH
+from src.free_day_calendar import FreeDayCalendar
+from src.schedule import ScheduleHistory, ScheduleSegment
+from src.schema import is_schema_current
+from src.sqlite_database import SqliteDatabase
+from src.startup import run_db_migrations
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserFiles:
+    name: str
+    database_path: Path
+    config_path: Path
+
+
+@dataclass
+class UserReport:
+    """Sums of the month of one user in hours, the path of the exported report and the error if it failed."""
+
+    name: str
+    work: float = 0.0
+    target_time: float = 0.0
+    overtime: float = 0.0
+    worked_days: int = 0
+    days_off: int = 0
+    report: str = ""
+    error: str = ""
+
+
+def find_users(folder: Path) -> list[UserFiles]:
+    """Return the users of the folder, sorted by name, each subfolder with a database is a user."""
+    return [
+        UserFiles(user_folder.name, user_folder / DATABASE_PATH.name, user_folder / CONFIG_PATH.name)
+        for user_folder in sorted(folder.iterdir())
+        if (user_folder / DATABASE_PATH.name).is_file()
+    ]
+
+
+def month_report(database: SqliteDatabase, config: Config, month: datetime.date) -> tuple[MonthReport, np.ndarray]:
+    """Compute the report of the month, also return the holiday and time off mask of its days (any weekday)."""
+    events, pauses = database.get_month_data(month)
+    base = build_month_base(events, pauses, month.year, month.month)
+    segments = [ScheduleSegment(*row) for row in database.get_work_schedules()]
+    schedule = ScheduleHistory(segments or [ScheduleSegment.from_config(config)])
+    calendar = FreeDayCalendar(schedule, database, config)
+    report = build_month_report(base, daily_target_seconds(schedule.daily_hours(base.days)), calendar.mask(base.days))
+    return report, calendar.mask(base.days, workdays_only=False)
+
+
+def run_batch(folder: Path, month: datetime.date, output: Path, workers: int | None = None) -> list[UserReport]:
+    """Compute and export the reports of all users of the folder and write the summary into the output folder.
+
+    Without number of workers, a worker process is used per CPU, with one worker the users are processed serially.
+    """
+    users = find_users(folder)
+    output.mkdir(parents=True, exist_ok=True)
+    reports = None
+    if len(users) > 1 and workers != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                reports = list(executor.map(process_user, users, repeat(month), repeat(output)))
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning("Could not process the users in parallel, falling back to serial processing: %s", e)
+    if reports is None:
+        reports = [process_user(user, month, output) for user in users]
+    write_summary(reports, get_summary_path(output, month))
+    return reports
+
+
+def get_summary_path(output: Path, month: datetime.date) -> Path:
+    return output / f"summary_{month.strftime('%m_%Y')}.csv"
+
+
+def process_user(user: UserFiles, month: datetime.date, output: Path) -> UserReport:
+    """Compute the report of the month of the user and export it, errors are returned within the report."""
+    # only needed for the export, the report of the command line does not need pandas
+    from src.data_exporter import DataExporter  # noqa: PLC0415
+
+    try:
+        config_handler = ConfigHandler(user.config_path)
+        config_handler.config.name = config_handler.config.name or user.name
+        with _open_database(user.database_path, config_handler.config) as database:
+            report, days_off = month_report(database, config_handler.config, month)
+        user_report = UserReport(
+            name=user.name,
+            work=round(report.hours("work_s"), 2),
+            target_time=round(report.hours("target_s"), 2),
+            overtime=round(report.hours("overtime_s"), 2),
+            worked_days=int(np.count_nonzero(report.work_s)),
+            days_off=int(np.count_nonzero(days_off)),
+        )
+        if not len(report):
+            return user_report
+        exporter = DataExporter(config_handler)
+        user_output = output / user.name
+        user_output.mkdir(exist_ok=True)
+        message = exporter.export_data(report.to_display_frame(), month, days_off, user_output)
+        report_path = exporter.get_file_path(month, user_output)
+        if report_path.exists():
+            user_report.report = str(report_path)
+        else:
+            user_report.error = message
+        return user_report
+    except Exception as e:
+        logger.exception("Could not create the report of %s", user.name)
+        return UserReport(name=user.name, error=str(e) or type(e).__name__)
+
+
+def write_summary(reports: list[UserReport], file_path: Path) -> None:
+    with file_path.open("w", encoding="utf-8", newline="") as summary_file:
+        writer = csv.writer(summary_file)
+        writer.writerow([field.name for field in fields(UserReport)])
+        writer.writerows(astuple(report) for report in reports)
+
+
+@contextmanager
+def _open_database(database_path: Path, config: Config) -> Generator[SqliteDatabase, None, None]:
+    """Open the database read only, an outdated one is copied and the copy is migrated to the current schema.
+
+    The migration seeds the work schedule out of the config, so the one of the user is needed.
+    """
+    if is_schema_current(database_path):
+        database = SqliteDatabase(database_path, read_only=True)
+        with closing(database):
+            yield database
+        return
+    with tempfile.TemporaryDirectory() as temp_folder:
+        copy_path = Path(temp_folder) / database_path.name
+        # the backup is consistent, even if the database is written at the same time
+        with (
+            closing(SqliteDatabase(database_path, read_only=True)) as source,
+            closing(sqlite3.connect(copy_path)) as target,
+        ):
+            source.connection.backup(target)
+        run_db_migrations(copy_path, config)
+        database = SqliteDatabase(copy_path)
+        with closing(database):
+            yield database
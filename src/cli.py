@@ -0,0 +1,240 @@
+"""Command line interface of the time tracker, e.g. to bind start / stop to hotkeys or to use it in scripts.
+
+Neither Qt nor pandas are imported and the database is accessed with the sqlite module of the standard library,
+so the commands only take a fraction of the app start. The report additionally loads numpy and the holidays,
+the export also pandas and xlsxwriter, they are imported by the commands needing them.
+
+If the app is running, the commands changing the data and the status are sent to it (see instance_channel),
+so the app shows them right away and keeps its caches up to date.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.instance_channel import send_command
+from src.schema import TIME_OFF_REASONS
+from src.sqlite_database import SqliteDatabase
+from src.startup import prepare_data_location_and_files, run_db_migrations, setup_logging
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.engine import MonthReport
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    setup_logging(console=False)
+    if args.standalone is not None:
+        return args.standalone(args)
+    if args.request is not None:
+        response = send_command(**args.request(args))
+        if response is not None:
+            print(response["message"])
+            return 0 if response["ok"] else 1
+        if args.command is None:
+            print("The app is not running")
+            return 1
+    prepare_data_location_and_files()
+    run_db_migrations()
+    database = SqliteDatabase()
+    try:
+        return args.command(database, args)
+    finally:
+        database.close()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="time-tracker", description="Track your time from the command line.")
+    # request: the request to the running app, command: what to do if the app is not running
+    # standalone: commands not using the database of the app
+    parser.set_defaults(request=None, standalone=None)
+    commands = parser.add_subparsers(required=True, metavar="command")
+
+    for event in ("start", "stop"):
+        event_parser = commands.add_parser(event, help=f"add a {event} event")
+        event_parser.add_argument("--at", type=_parse_datetime, help="time (HH:MM) or date and time (YYYY-MM-DD HH:MM)")
+        event_parser.set_defaults(command=_add_event, request=_event_request, event=event)
+
+    pause_parser = commands.add_parser("pause", help="add a pause (negative values correct previous pauses)")
+    pause_parser.add_argument("minutes", type=int)
+    pause_parser.add_argument("--date", type=_parse_date, help="date (YYYY-MM-DD), default is today")
+    pause_parser.set_defaults(command=_add_pause, request=_pause_request)
+
+    status_parser = commands.add_parser("status", help="show if the time is tracked and the work time of today")
+    status_parser.set_defaults(command=_status, request=lambda _: {"command": "status"})
+
+    for name, help_text in (("show", "show the running app"), ("data", "show the data window of the running app")):
+        window_parser = commands.add_parser(name, help=help_text)
+        window_parser.set_defaults(command=None, request=lambda _, name=name: {"command": name})
+
+    for name, help_text, command in (
+        ("report", "show the report of a month", _report),
+        ("export", "export the report of a month to excel", _export),
+    ):
+        month_parser = commands.add_parser(name, help=help_text)
+        month_parser.add_argument("--month", type=_parse_month, help="month (YYYY-MM), default is the current one")
+        month_parser.set_defaults(command=command)
+
+    batch_parser = commands.add_parser("batch", help="report and export a month for each user of a folder")
+    batch_parser.add_argument(
+        "folder", type=Path, help="folder with a subfolder per user, containing its time_data.db and config.json"
+    )
+    batch_parser.add_argument("--month", type=_parse_month, help="month (YYYY-MM), default is the previous one")
+    batch_parser.add_argument(
+        "--output", type=Path, help="folder for the reports and summary, default is folder/reports"
+    )
+    batch_parser.add_argument("--workers", type=int, help="number of worker processes, default is one per CPU")
+    batch_parser.set_defaults(command=None, standalone=_batch)
+
+    time_off_parser = commands.add_parser("timeoff", help="add or remove time off")
+    time_off_commands = time_off_parser.add_subparsers(required=True, metavar="action")
+    add_parser = time_off_commands.add_parser("add", help="add a time off day")
+    add_parser.add_argument("date", type=_parse_date)
+    add_parser.add_argument("--reason", choices=TIME_OFF_REASONS, default=TIME_OFF_REASONS[0])
+    add_parser.set_defaults(command=_add_time_off, request=_time_off_request)
+    remove_parser = time_off_commands.add_parser("remove", help="remove a time off day")
+    remove_parser.add_argument("date", type=_parse_date)
+    remove_parser.set_defaults(command=_remove_time_off, request=_time_off_request)
+    return parser
+
+
+def _event_request(args: argparse.Namespace) -> dict[str, Any]:
+    return {"command": args.event, "at": args.at.isoformat() if args.at else None}
+
+
+def _pause_request(args: argparse.Namespace) -> dict[str, Any]:
+    return {"command": "pause", "minutes": args.minutes, "date": args.date.isoformat() if args.date else None}
+
+
+def _time_off_request(args: argparse.Namespace) -> dict[str, Any]:
+    if args.command is _remove_time_off:
+        return {"command": "timeoff_remove", "date": args.date.isoformat()}
+    return {"command": "timeoff_add", "date": args.date.isoformat(), "reason": args.reason}
+
+
+def _add_event(database: SqliteDatabase, args: argparse.Namespace) -> int:
+    entry_datetime = args.at or datetime.datetime.now().replace(microsecond=0)
+    database.add_event(args.event, entry_datetime)
+    print(f"Added event {args.event} at {entry_datetime.strftime('%d-%m-%Y - %H:%M:%S')}")
+    return 0
+
+
+def _add_pause(database: SqliteDatabase, args: argparse.Namespace) -> int:
+    entry_date = args.date or datetime.date.today()
+    database.add_pause(args.minutes, entry_date)
+    print(f"Added pause of {args.minutes} minutes on date {entry_date.strftime('%d-%m-%Y')}")
+    return 0
+
+
+def _status(database: SqliteDatabase, args: argparse.Namespace) -> int:
+    from src.work_time import day_status
+
+    now = datetime.datetime.now()
+    print(day_status(database.get_last_event(), *database.get_day_data(now.date()), now))
+    return 0
+
+
+def _report(database: SqliteDatabase, args: argparse.Namespace) -> int:
+    month = args.month or datetime.date.today().replace(day=1)
+    report, _ = _month_report(database, month)
+    if not len(report):
+        print(f"No data for {month.strftime('%B %Y')}")
+        return 0
+    from src.engine import minutes_to_time
+
+    print(month.strftime("%B %Y"))
+    print(f"{'Date':<12}{'Start':>7}{'End':>7}{'Pause':>8}{'Work':>8}{'Target':>8}{'Overtime':>10}")
+    for i, day in enumerate(report.days.tolist()):
+        start, end = minutes_to_time(report.start_min[i]), minutes_to_time(report.end_min[i])
+        print(
+            f"{day.strftime('%d.%m.%Y'):<12}"
+            f"{start.strftime('%H:%M') if start else '-':>7}"
+            f"{end.strftime('%H:%M') if end else '-':>7}"
+            f"{report.pause_s[i] / 3600:>8.2f}"
+            f"{report.work_s[i] / 3600:>8.2f}"
+            f"{report.target_s[i] / 3600:>8.2f}"
+            f"{report.overtime_s[i] / 3600:>+10.2f}"
+        )
+    print(
+        f"Work: {report.hours('work_s'):.2f} h, target: {report.hours('target_s'):.2f} h, "
+        f"overtime: {report.hours('overtime_s'):+.2f} h"
+    )
+    return 0
+
+
+def _export(database: SqliteDatabase, args: argparse.Namespace) -> int:
+    month = args.month or datetime.date.today().replace(day=1)
+    report, days_off = _month_report(database, month)
+    from src.data_exporter import EXPORTER
+
+    print(EXPORTER.export_data(report.to_display_frame(), month, days_off))
+    return 0
+
+
+def _month_report(database: SqliteDatabase, month: datetime.date) -> tuple[MonthReport, np.ndarray]:
+    """Compute the report of the month, also return the holiday and time off mask of its days (any weekday)."""
+    from src.batch_report import month_report
+    from src.config_handler import CONFIG_HANDLER
+
+    return month_report(database, CONFIG_HANDLER.config, month)
+
+
+def _batch(args: argparse.Namespace) -> int:
+    from src.batch_report import get_summary_path, run_batch
+
+    month = args.month or (datetime.date.today().replace(day=1) - datetime.timedelta(days=1)).replace(day=1)
+    output = args.output or args.folder / "reports"
+    reports = run_batch(args.folder, month, output, args.workers)
+    if not reports:
+        print(f"No user databases found in {args.folder}")
+        return 1
+    print(month.strftime("%B %Y"))
+    print(f"{'User':<20}{'Work':>8}{'Target':>8}{'Overtime':>10}  Report")
+    for report in reports:
+        print(
+            f"{report.name:<20}{report.work:>8.2f}{report.target_time:>8.2f}{report.overtime:>+10.2f}  "
+            f"{report.error or report.report or '-'}"
+        )
+    print(f"Summary saved at: {get_summary_path(output, month)}")
+    return 1 if any(report.error for report in reports) else 0
+
+
+def _parse_datetime(value: str) -> datetime.datetime:
+    try:
+        return datetime.datetime.combine(datetime.date.today(), datetime.time.fromisoformat(value))
+    except ValueError:
+        return datetime.datetime.fromisoformat(value)
+
+
+def _parse_date(value: str) -> datetime.date:
+    return datetime.date.fromisoformat(value)
+
+
+def _parse_month(value: str) -> datetime.date:
+    return datetime.datetime.strptime(value, "%Y-%m").date()
+
+
+def _add_time_off(database: SqliteDatabase, args: argparse.Namespace) -> int:
+    if not database.add_time_off(args.date, args.reason):
+        print(f"{args.date.strftime('%d-%m-%Y')} is already time off")
+        return 1
+    print(f"Added {args.reason} on {args.date.strftime('%d-%m-%Y')}")
+    return 0
+
+
+def _remove_time_off(database: SqliteDatabase, args: argparse.Namespace) -> int:
+    if not database.remove_time_off(args.date):
+        print(f"{args.date.strftime('%d-%m-%Y')} is no time off")
+        return 1
+    print(f"Removed time off on {args.date.strftime('%d-%m-%Y')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
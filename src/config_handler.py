@@ -1,12 +1,10 @@
 import datetime
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from inspect import signature
+from pathlib import Path
 from typing import Any, Literal
 
-import holidays
-from dataclasses_json import dataclass_json
-
 from src.filepath import CONFIG_PATH
 
 # Fill data currently not in the config file,
@@ -21,6 +19,9 @@ NEEDED_DATA = {
     "workdays": [0, 1, 2, 3, 4],  # 0-6, 0=Monday, 6=Sunday
     "different_workdays": False,
     "time_per_day": (8.0, 8.0, 8.0, 8.0, 8.0, 0, 0),
+    "cached_months": 24,  # number of months kept with full daily data in memory
+    "compute_workers": 0,  # processes to compute many months at once, 0 or 1 computes them serially
+    "api_port": 0,  # port of the local JSON API (on localhost), 0 disables it
 }
 CONFIG_NAMES = Literal[
     "name",
@@ -32,11 +33,13 @@ CONFIG_NAMES = Literal[
     "workdays",
     "different_workdays",
     "time_per_day",
+    "cached_months",
+    "compute_workers",
+    "api_port",
 ]
 
 
 @dataclass
-@dataclass_json
 class Config:
     name: str
     save_path: str
@@ -47,6 +50,9 @@ class Config:
     workdays: list[int]
     different_workdays: bool
     time_per_day: tuple[float, float, float, float, float, float, float]
+    cached_months: int
+    compute_workers: int
+    api_port: int
 
     @classmethod
     def from_kwargs(cls, **kwargs: Any) -> "Config":
@@ -67,6 +73,9 @@ class Config:
     def __getitem__(self, item: str) -> Any:
         return getattr(self, item)
 
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
     def get_weekly_hours(self) -> float:
         """Get the total work time for the week."""
         if self.different_workdays:
@@ -93,15 +102,17 @@ class Config:
         return [self.get_daily_hours_at(day) for day in range(7)]
 
     def get_holidays(self, year: int) -> list[datetime.date]:
-        available_holidays = holidays.country_holidays(
-            CONFIG_HANDLER.config.country, subdiv=CONFIG_HANDLER.config.subdiv or None, years=year
-        )
+        # holidays is only needed to compute the data, not to start the app
+        import holidays  # noqa: PLC0415
+
+        available_holidays = holidays.country_holidays(self.country, subdiv=self.subdiv or None, years=year)
         return list(available_holidays.keys())
 
 
 class ConfigHandler:
-    def __init__(self) -> None:
-        """Class for managing configuration file and settings ."""
+    def __init__(self, config_path: Path = CONFIG_PATH) -> None:
+        """Class for managing configuration file and settings, the app uses the config file in its folder."""
+        self.config_path = config_path
         self.config = self._get_config()
 
     def _get_config(self) -> Config:
@@ -109,9 +120,9 @@ class ConfigHandler:
         return Config.from_kwargs(**config_file)
 
     def read_config_file(self) -> dict:
-        if not CONFIG_PATH.exists():
+        if not self.config_path.exists():
             return NEEDED_DATA
-        with CONFIG_PATH.open(encoding="utf-8") as f:
+        with self.config_path.open(encoding="utf-8") as f:
             config = json.load(f)
         for d in NEEDED_DATA.items():
             if d[0] not in config:
@@ -119,9 +130,8 @@ class ConfigHandler:
         return config
 
     def write_config_file(self) -> None:
-        with CONFIG_PATH.open("w", encoding="utf-8") as write_file:
-            # pylint: disable=no-member
-            json.dump(self.config.to_dict(), write_file)  # type: ignore
+        with self.config_path.open("w", encoding="utf-8") as write_file:
+            json.dump(self.config.to_dict(), write_file)
 
     def set_config_value(self, key: CONFIG_NAMES, value: Any, write: bool = True) -> None:
         setattr(self.config, key, value)
@@ -131,7 +141,7 @@ class ConfigHandler:
 
     def config_hash(self) -> int:
         """Get a hash of the current config."""
-        return hash(json.dumps(self.config.to_dict()))  # type: ignore
+        return hash(json.dumps(self.config.to_dict()))
 
 
 CONFIG_HANDLER = ConfigHandler()
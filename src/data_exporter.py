@@ -1,30 +1,51 @@
+from __future__ import annotations
+
 import datetime
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
-import xlsxwriter
-import xlsxwriter.format
-from xlsxwriter.exceptions import XlsxWriterException
 
-from src.config_handler import CONFIG_HANDLER
-from src.database_controller import DB_CONTROLLER
+from src.config_handler import CONFIG_HANDLER, ConfigHandler
 from src.filepath import REPORTS_PATH
 
+if TYPE_CHECKING:
+    import xlsxwriter
+    import xlsxwriter.format
+
 logger = logging.getLogger(__name__)
 
 
 class DataExporter:
-    def export_data(self, df: pd.DataFrame, report_date: datetime.date) -> str:
+    def __init__(self, config_handler: ConfigHandler = CONFIG_HANDLER) -> None:
+        """Export reports with the name and save folder of the config, the one of the app by default."""
+        self.config_handler = config_handler
+
+    def get_file_path(self, report_date: datetime.date, folder: Path | None = None) -> Path:
+        """Return the path of the report of the month, in the given folder or the save folder of the config."""
+        config = self.config_handler.config
+        file_suffix = "time"
+        file_name = f"{config.name.replace(' ', '_')}_{report_date.strftime('%m_%Y')}_{file_suffix}.xlsx"
+        if folder is None:
+            folder = REPORTS_PATH if not config.save_path else Path(config.save_path)
+        return folder / file_name
+
+    def export_data(
+        self, df: pd.DataFrame, report_date: datetime.date, days_off: np.ndarray, folder: Path | None = None
+    ) -> str:
+        """Export the month to excel, days off (holidays and time off, on any weekday) are marked as free days."""
         if df.empty:
             message = "No data to export, will no generate file..."
             logger.warning(message)
             return message
-        file_suffix = "time"
-        file_name = f"{CONFIG_HANDLER.config.name.replace(' ', '_')}_{report_date.strftime('%m_%Y')}_{file_suffix}.xlsx"
-        config_save_path = CONFIG_HANDLER.config.save_path
-        save_path = REPORTS_PATH if not config_save_path else Path(config_save_path)
-        file_path = save_path / file_name
+        file_path = self.get_file_path(report_date, folder)
+        file_name = file_path.name
+        # xlsxwriter is only loaded when a report is exported
+        import xlsxwriter  # noqa: PLC0415
+        from xlsxwriter.exceptions import XlsxWriterException  # noqa: PLC0415
+
         try:
             workbook = xlsxwriter.Workbook(file_path)
             bold = workbook.add_format({"bold": True})
@@ -34,7 +55,7 @@ class DataExporter:
             cell_width = 20
             worksheet.set_column("A:G", cell_width)
             self._write_information(worksheet, bold, normal_color, vacation_color, report_date)
-            self._write_times(worksheet, df, normal_color, vacation_color, report_date)
+            self._write_times(worksheet, df, days_off, normal_color, vacation_color)
             workbook.close()
             return f"File saved at: {file_path}"
         except XlsxWriterException:
@@ -54,7 +75,7 @@ class DataExporter:
         report_date: datetime.date,
     ) -> None:
         worksheet.write("A1", "Name:", bold)
-        worksheet.write("B1", CONFIG_HANDLER.config.name, normal_color)
+        worksheet.write("B1", self.config_handler.config.name, normal_color)
         worksheet.write("A3", "Month:", bold)
         worksheet.write("B3", report_date.strftime("%B"), normal_color)
         worksheet.write("A4", "Year", bold)
@@ -74,15 +95,12 @@ class DataExporter:
         self,
         worksheet: xlsxwriter.Workbook.worksheet_class,
         df: pd.DataFrame,
+        days_off: np.ndarray,
         normal_color: xlsxwriter.format.Format,
         vacation_color: xlsxwriter.format.Format,
-        report_date: datetime.date,
     ) -> None:
-        free_days = set(
-            CONFIG_HANDLER.config.get_holidays(report_date.year) + DB_CONTROLLER.get_time_off_days(report_date.year)
-        )
         for i, (index, row) in enumerate(df.iterrows()):
-            color = vacation_color if index.date() in free_days else normal_color  # type: ignore
+            color = vacation_color if days_off[i] else normal_color
             worksheet.write(f"A{7 + i}", index.strftime("%d.%m.%Y"))  # type: ignore
             _time = self._round_quarterly(max(row["work"], 0))
             worksheet.write(f"B{7 + i}", _time, color)
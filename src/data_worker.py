@@ -0,0 +1,233 @@
+"""Background computation of the data shown in the data window.
+
+Refresh requests are debounced by the RefreshScheduler, so one user action computes the data only once,
+and table, plot and overtime label are all filled from the same result.
+Each request gets a generation number. Only the result of the latest generation is applied,
+requests which are outdated before or while computing are dropped.
+After a result is shown, the adjacent months are prefetched into the store cache with the same generation.
+"""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from src.datastore import store
+
+logger = logging.getLogger(__name__)
+
+# change notifications within this time are combined into one computation
+REFRESH_DELAY_MS = 30
+
+
+@dataclass(frozen=True)
+class DataRequest:
+    generation: int
+    selected_date: datetime.date
+    plot_month: bool
+    plot: bool
+    table: bool
+
+
+@dataclass
+class DataResult:
+    """Snapshot of the store data for one request, so the UI does not need to access the store."""
+
+    request: DataRequest
+    current_date: datetime.date
+    df: pd.DataFrame
+    daily_data: list[tuple[str, str]]
+    total_overtime: float
+    overtime_by_year: dict[int, float]
+    years_df: pd.DataFrame = field(default_factory=pd.DataFrame)
+    plot_df: pd.DataFrame = field(default_factory=pd.DataFrame)
+    # holidays and time off of the days of df, also on non workdays, used for the export
+    days_off: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+
+
+class DataWorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object, str)
+
+
+class DataWorker(QRunnable):
+    def __init__(self, request: DataRequest, is_current: Callable[[int], bool]) -> None:
+        """Compute the data of the request, is_current is used to skip outdated requests."""
+        super().__init__()
+        self.request = request
+        self.is_current = is_current
+        self.signals = DataWorkerSignals()
+
+    def run(self) -> None:
+        if not self.is_current(self.request.generation):
+            return
+        try:
+            result = compute_data(self.request, self.is_current)
+        except Exception as e:
+            logger.exception(e)
+            self.signals.failed.emit(self.request, str(e))
+            return
+        if result is not None and self.is_current(self.request.generation):
+            self.signals.finished.emit(result)
+
+
+class RefreshScheduler(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, selection: Callable[[], tuple[datetime.date, bool]], parent: QObject | None = None) -> None:
+        """Debounce refresh requests and compute them in the background, selection returns (date, plot_month)."""
+        super().__init__(parent)
+        self.selection = selection
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(REFRESH_DELAY_MS)
+        self.timer.timeout.connect(self._start_request)
+        self.generation = 0
+        self.pending_plot = False
+        self.pending_table = False
+
+    @property
+    def is_pending(self) -> bool:
+        return self.pending_plot or self.pending_table
+
+    def request(self, plot: bool, table: bool) -> None:
+        """Request a refresh of the plot and / or table.
+
+        The request takes over the flags of all requests not finished yet, which are outdated by it.
+        """
+        self.pending_plot |= plot
+        self.pending_table |= table
+        self.generation += 1
+        # requests not started yet are not needed anymore
+        self.thread_pool.clear()
+        self.timer.start()
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    def _start_request(self) -> None:
+        selected_date, plot_month = self.selection()
+        request = DataRequest(
+            self.generation, selected_date, plot_month, plot=self.pending_plot, table=self.pending_table
+        )
+        worker = DataWorker(request, self.is_current)
+        worker.signals.finished.connect(self._request_finished)
+        worker.signals.failed.connect(self._request_failed)
+        self.thread_pool.start(worker)
+
+    def _request_finished(self, result: DataResult) -> None:
+        if not self.is_current(result.request.generation):
+            return
+        self.pending_plot = False
+        self.pending_table = False
+        self.finished.emit(result)
+        # lower priority, so a new request is started first if both are waiting
+        prefetch = PrefetchWorker(
+            result.request.generation, result.current_date, result.request.plot_month, self.is_current
+        )
+        self.thread_pool.start(prefetch, priority=-1)
+
+    def _request_failed(self, request: DataRequest, message: str) -> None:
+        if not self.is_current(request.generation):
+            return
+        self.pending_plot = False
+        self.pending_table = False
+        self.failed.emit(message)
+
+
+class PrefetchWorker(QRunnable):
+    def __init__(
+        self, generation: int, selected_date: datetime.date, plot_month: bool, is_current: Callable[[int], bool]
+    ) -> None:
+        """Compute the months around the selected date into the store cache, so navigating there is fast."""
+        super().__init__()
+        self.generation = generation
+        self.selected_date = selected_date
+        self.plot_month = plot_month
+        self.is_current = is_current
+
+    def run(self) -> None:
+        months, years = adjacent_periods(self.selected_date, self.plot_month)
+        try:
+            for month in months:
+                # stop as soon as the user navigates again, the new request has priority
+                if not self.is_current(self.generation):
+                    return
+                with store.lock:
+                    store.generate_month_data(month)
+            for year in years:
+                if not self.is_current(self.generation):
+                    return
+                with store.lock:
+                    store.get_year_data(year)
+        except Exception as e:
+            # prefetching is only an optimization, the data is computed again on request
+            logger.warning("Could not prefetch data around %s: %s", self.selected_date, e)
+
+
+def adjacent_periods(selected_date: datetime.date, plot_month: bool) -> tuple[list[datetime.date], list[int]]:
+    """Return the months and years the user will likely navigate to next."""
+    first_day = selected_date.replace(day=1)
+    months = [first_day + relativedelta(months=-1), first_day + relativedelta(months=+1)]
+    years = [] if plot_month else [selected_date.year - 1]
+    return months, years
+
+
+def compute_data(request: DataRequest, is_current: Callable[[int], bool]) -> DataResult | None:
+    """Update the store and take a snapshot of it, returns None if the request got outdated in between."""
+    with store.lock:
+        store.update_data(request.selected_date)
+        result = DataResult(
+            request=request,
+            current_date=store.current_date,
+            df=store.df,
+            daily_data=list(store.daily_data),
+            total_overtime=store.total_overtime,
+            overtime_by_year=dict(store.overtime_by_year),
+            years_df=store.get_years_data(),
+            days_off=store.calendar.mask(store.df.index.to_numpy(), workdays_only=False),
+        )
+        if not request.plot:
+            return result
+        if not is_current(request.generation):
+            return None
+        df = store.df.copy() if request.plot_month else store.get_year_data(store.current_date.year)
+        result.plot_df = adjust_df_for_plot(df, request.plot_month, store.current_date)
+    return result
+
+
+def adjust_df_for_plot(df: pd.DataFrame, plot_month: bool, current_date: datetime.date) -> pd.DataFrame:
+    """Adjust the dataframe for plotting."""
+    if df.empty:
+        df = _create_dummy_df(plot_month, current_date)
+    df["color"] = df["overtime"].apply(lambda x: "positive" if x >= 0 else "negative")
+    if plot_month:
+        df["is_free_day"] = store.calendar.mask(df.index.to_numpy())
+    else:
+        df["is_free_day"] = False
+    to_keep = ["work", "overtime", "color", "target_time", "is_free_day"]
+    return df[to_keep]
+
+
+def _create_dummy_df(plot_month: bool, date: datetime.date) -> pd.DataFrame:
+    """Create a dummy dataframe if no data is available."""
+    if plot_month:
+        data_points = calendar.monthrange(date.year, date.month)[1]
+        index = pd.date_range(start=date.replace(day=1), periods=data_points, freq="D")
+    else:
+        data_points = 12
+        index = pd.date_range(start=date.replace(month=1, day=1), periods=data_points, freq="ME")
+    zeros = [0] * data_points
+    data = {"work": zeros, "pause": zeros, "overtime": zeros, "target_time": zeros}
+    return pd.DataFrame(data, index=index)
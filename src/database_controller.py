@@ -8,6 +8,7 @@ The DatabaseController class provides high-level methods for:
 - Event tracking (start/stop events)
 - Pause time management
 - Vacation day management
+- Work schedule history
 - Data retrieval for daily and monthly reports
 """
 
@@ -21,7 +22,8 @@ from sqlalchemy import create_engine, delete, func, select, update
 from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from src.filepath import DATABASE_PATH
-from src.models import Base, Event, Pause, TimeOff
+from src.models import Base, Event, Pause, TimeOff, WorkSchedule
+from src.schema import is_schema_current
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +36,11 @@ class DatabaseController:
     def __init__(self, db_url: str | None = None) -> None:
         """Initialize the database controller with SQLAlchemy ORM."""
         self.call_count = 0
+        # increased on every change of the time off days, so caches of them know when to reload
+        self.time_off_version = 0
+        # increased on every change of the data, so caches of reports know when to reload
+        self.data_version = 0
+        uses_app_database = db_url is None
         if db_url is None:
             # Ensure parent directory exists
             DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -47,7 +54,9 @@ class DatabaseController:
             logger.debug("No database detected, creating Database at %s", self.database_path)
 
         self.engine = create_engine(self.db_url, echo=False)
-        Base.metadata.create_all(self.engine)
+        # the app database is already migrated to the current schema on start
+        if not (uses_app_database and is_schema_current(self.database_path)):
+            Base.metadata.create_all(self.engine)
         self.Session = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
 
     def __del__(self) -> None:
@@ -76,6 +85,7 @@ class DatabaseController:
         with self.session_scope() as session:
             new_event = Event(date=entry_datetime, action=event)
             session.add(new_event)
+        self.data_version += 1
 
     def add_pause(self, pause_time: int, entry_date: datetime.date) -> None:
         if self.day_exists(entry_date):
@@ -88,12 +98,14 @@ class DatabaseController:
         with self.session_scope() as session:
             stmt = update(Pause).where(Pause.date == date).values(time=Pause.time + pause_time)
             session.execute(stmt)
+        self.data_version += 1
 
     def insert_pause(self, pause_time: int, date: datetime.date) -> None:
         logger.info("Inserting pause time by %s at %s", pause_time, date.isoformat())
         with self.session_scope() as session:
             new_pause = Pause(date=date, time=pause_time)
             session.add(new_pause)
+        self.data_version += 1
 
     def day_exists(self, date: datetime.date) -> int:
         with self.session_scope() as session:
@@ -123,6 +135,12 @@ class DatabaseController:
             results = session.execute(stmt).scalars().all()
             return [(event.date.isoformat(), event.action) for event in results]
 
+    def get_last_event(self) -> tuple[str, str] | None:
+        with self.session_scope() as session:
+            stmt = select(Event).order_by(Event.date.desc(), Event.ID.desc()).limit(1)
+            event = session.execute(stmt).scalar_one_or_none()
+            return None if event is None else (event.date.isoformat(), event.action)
+
     def get_period_pause(self, start: datetime.date, end: datetime.date) -> list[tuple[str, int]]:
         with self.session_scope() as session:
             stmt = select(Pause).where(Pause.date >= start, Pause.date <= end).order_by(Pause.date)
@@ -144,6 +162,7 @@ class DatabaseController:
         with self.session_scope() as session:
             stmt = delete(Event).where(Event.date == delete_datetime)
             session.execute(stmt)
+        self.data_version += 1
 
     def add_time_off(self, day: datetime.date, reason: str) -> None:
         date_string = day.isoformat()
@@ -154,6 +173,8 @@ class DatabaseController:
             if not existing:
                 new_vacation = TimeOff(date=day, reason=reason)
                 session.add(new_vacation)
+        self.time_off_version += 1
+        self.data_version += 1
 
     def get_time_off_days(self, year: int) -> list[datetime.date]:
         return [vacation.date for vacation in self.get_time_off(year)]
@@ -172,12 +193,29 @@ class DatabaseController:
         with self.session_scope() as session:
             stmt = delete(TimeOff).where(TimeOff.date == vacation_date)
             session.execute(stmt)
+        self.time_off_version += 1
+        self.data_version += 1
 
     def change_time_off_reason(self, vacation_date: datetime.date, new_reason: str) -> None:
         logger.info("Changing Time Off reason on %s to %s", vacation_date.isoformat(), new_reason)
         with self.session_scope() as session:
             stmt = update(TimeOff).where(TimeOff.date == vacation_date).values(reason=new_reason)
             session.execute(stmt)
+        self.data_version += 1
+
+    def get_work_schedules(self) -> list[WorkSchedule]:
+        with self.session_scope() as session:
+            stmt = select(WorkSchedule).order_by(WorkSchedule.effective_from)
+            results = session.execute(stmt).scalars().all()
+            return list(results)
+
+    def set_work_schedule(self, effective_from: datetime.date, workdays: list[int], daily_hours: list[float]) -> None:
+        """Add a work schedule, which replaces all schedules starting at or after the effective date."""
+        logger.info("Setting work schedule from %s: workdays %s, hours %s", effective_from, workdays, daily_hours)
+        with self.session_scope() as session:
+            session.execute(delete(WorkSchedule).where(WorkSchedule.effective_from >= effective_from))
+            session.add(WorkSchedule(effective_from=effective_from, workdays=workdays, daily_hours=daily_hours))
+        self.data_version += 1
 
 
 DB_CONTROLLER = DatabaseController()
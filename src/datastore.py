@@ -1,22 +1,119 @@
 import datetime
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import numpy as np
 from dateutil.relativedelta import relativedelta
 
 from src.config_handler import CONFIG_HANDLER
 from src.database_controller import DB_CONTROLLER
+from src.engine import (
+    MonthBase,
+    MonthColumns,
+    MonthReport,
+    PeriodTotals,
+    build_month_base,
+    build_month_base_from_columns,
+    build_month_report,
+    daily_target_seconds,
+    day_offsets,
+    month_totals,
+    sum_by_year,
+)
+from src.free_day_calendar import FreeDayCalendar
+from src.schedule import SCHEDULE_START, ScheduleHistory, ScheduleSegment
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# below this number of months to compute, starting worker processes takes longer than computing serially
+PARALLEL_MIN_MONTHS = 12
 
 
 @dataclass
 class MonthData:
-    df: pd.DataFrame
+    """Cached data of one month.
+
+    The base holds the config independent values (worked_s, start_min, end_min, pause_s), which only change
+    with the database data. The report holds all values, including the config dependent ones
+    (free day credit, target_s, overtime_s), which are recomputed from the base if only the config changes.
+    The config_hash only covers the schedules valid in this month, so schedule changes for the future keep it valid.
+
+    Both are numpy arrays computed by the engine, see there for the units.
+    The df property converts the report into a frame of hours and times for display and export.
+
+    The events of the month are kept sorted by time together with a per day offset index into them,
+    so the data of a single day is a slice and does not need another database query.
+    As long as the data version of the database did not change since the rows were read, they are still valid,
+    so a cached month is returned without any query.
+    """
+
+    base: MonthBase
     data_hash: int
-    config_hash: int = field(default_factory=CONFIG_HANDLER.config_hash)
+    report: MonthReport = field(default_factory=MonthReport.empty)
+    config_hash: int = field(default=0)
+    # events of the i-th day of the month are events[day_offsets[i] : day_offsets[i + 1]]
+    events: list[tuple[str, str]] = field(default_factory=list)
+    day_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.int32))
+    pauses: dict[datetime.date, int] = field(default_factory=dict)
+    # data version of the database controller at the time the rows were read
+    data_version: int = field(default=-1)
+
+    @property
+    def df(self) -> "pd.DataFrame":
+        """Report of the month in display types, hours as float and start / end as time."""
+        return self.report.to_display_frame()
+
+    def get_day_data(self, day: datetime.date) -> tuple[list[tuple[str, str]], list[tuple[str, int]]]:
+        """Return the events and pause of the day, in the same format as the database controller."""
+        index = day.day - 1
+        if index + 1 >= len(self.day_offsets):
+            return [], []
+        day_work = self.events[self.day_offsets[index] : self.day_offsets[index + 1]]
+        day_pause = [(day.isoformat(), self.pauses[day])] if day in self.pauses else []
+        return day_work, day_pause
+
+    def get_pause_rows(self) -> list[tuple[str, int]]:
+        """Return the pauses of the month, in the same format as the database controller."""
+        return [(day.isoformat(), pause) for day, pause in self.pauses.items()]
 
     def is_same_data(self, data_hash: int) -> bool:
         """Compare the data hash of the current month with the stored hash."""
-        return self.data_hash == data_hash and self.config_hash == CONFIG_HANDLER.config_hash()
+        return self.data_hash == data_hash
+
+    def is_same_config(self, config_hash: int) -> bool:
+        """Check if the config dependent columns were computed with the current config."""
+        return self.config_hash == config_hash
+
+
+@dataclass(slots=True)
+class MonthSummary:
+    """Compact sums of one month, kept for every month even if the full data was evicted from the cache."""
+
+    overtime: float
+    work: float
+    target_time: float
+    data_hash: int
+    config_hash: int
+
+    @classmethod
+    def from_month_data(cls, month_data: MonthData) -> "MonthSummary":
+        report = month_data.report
+        return cls(
+            overtime=report.hours("overtime_s"),
+            work=report.hours("work_s"),
+            target_time=report.hours("target_s"),
+            data_hash=month_data.data_hash,
+            config_hash=month_data.config_hash,
+        )
 
 
 @dataclass
@@ -26,194 +123,304 @@ class Store:
     The data frame contains total_time, start_time, end_time, pause, work, break_time, and overtime for days.
     """
 
-    df: pd.DataFrame = field(default_factory=pd.DataFrame)
+    # report of the current month, the data frame of it is only built when needed
+    report: MonthReport = field(default_factory=MonthReport.empty)
     daily_data: list[tuple[str, str]] = field(default_factory=list)
     current_date: datetime.date = field(default_factory=datetime.date.today)
-    # dict with key: (year, month) and value: MonthData, which contains the needed hashes for data and config)
-    all_data: dict[(tuple[int, int]), MonthData] = field(default_factory=dict)
+    # LRU cache with key: (year, month) and value: MonthData, which contains the needed hashes for data and config)
+    all_data: OrderedDict[tuple[int, int], MonthData] = field(default_factory=OrderedDict)
+    # summaries of all months, including the ones evicted from all_data
+    summaries: dict[tuple[int, int], MonthSummary] = field(default_factory=dict)
+    max_cached_months: int = field(default_factory=lambda: CONFIG_HANDLER.config.cached_months)
     total_overtime: float = field(default=0.0)
     overtime_by_year: dict[int, float] = field(default_factory=dict)
     # workaround for not to not always recompute the overtime if fast changes are done
     last_overtime_calculation: datetime.datetime = field(default_factory=lambda: datetime.datetime.min)
     overtime_min_delta: datetime.timedelta = field(default_factory=lambda: datetime.timedelta(minutes=5))
+    # free days (holidays, time off) and workdays, shared with the plot and the export
+    calendar: FreeDayCalendar = field(init=False)
+    # the data window computes in a background thread, this guards all changes of the caches
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    _df: "pd.DataFrame | None" = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
+        self.calendar = FreeDayCalendar(self._load_schedule(), DB_CONTROLLER, CONFIG_HANDLER.config)
         self.generate_all_data()
 
+    @property
+    def df(self) -> "pd.DataFrame":
+        """Report of the current month in display types, pandas is only loaded on first use."""
+        if self._df is None:
+            self._df = self.report.to_display_frame()
+        return self._df
+
+    @property
+    def schedule(self) -> ScheduleHistory:
+        return self.calendar.schedule
+
+    @schedule.setter
+    def schedule(self, schedule: ScheduleHistory) -> None:
+        self.calendar.set_schedule(schedule)
+
+    def _load_schedule(self) -> ScheduleHistory:
+        """Load the schedule history, seed it with the current config if there is none yet."""
+        segments = [ScheduleSegment.from_model(schedule) for schedule in DB_CONTROLLER.get_work_schedules()]
+        if segments:
+            return ScheduleHistory(segments)
+        segment = ScheduleSegment.from_config(CONFIG_HANDLER.config, SCHEDULE_START)
+        DB_CONTROLLER.set_work_schedule(segment.effective_from, list(segment.workdays), list(segment.daily_hours))
+        return ScheduleHistory([segment])
+
+    def change_work_schedule(self, effective_from: datetime.date) -> None:
+        """Use the work times of the current config from the given date on."""
+        segment = ScheduleSegment.from_config(CONFIG_HANDLER.config, effective_from)
+        current = self.schedule.segment_at(effective_from)
+        if (current.workdays, current.daily_hours) == (segment.workdays, segment.daily_hours):
+            return
+        DB_CONTROLLER.set_work_schedule(segment.effective_from, list(segment.workdays), list(segment.daily_hours))
+        self.schedule = self.schedule.with_segment(segment)
+
     def update_data(self, selected_date: datetime.date | None) -> None:
         if selected_date is None:
             selected_date = self.current_date
         self.current_date = selected_date
-        self.generate_daily_data(selected_date)
         month_data = self.generate_month_data(selected_date)
-        self.df = month_data.df
+        self.generate_daily_data(selected_date, month_data)
+        self.report = month_data.report
+        self._df = None
         if datetime.datetime.now() - self.last_overtime_calculation > self.overtime_min_delta:
             self.calculate_overtime_totals()
 
     def get_free_days(self, year: int) -> list[datetime.date]:
-        vacation_days = DB_CONTROLLER.get_time_off_days(year)
-        holiday_list = CONFIG_HANDLER.config.get_holidays(year)
-        unique_days = list(set(vacation_days + holiday_list))
-        return [day for day in unique_days if day.weekday() in CONFIG_HANDLER.config.workdays]
+        """Return the holidays and time off days of the year, which are on a workday."""
+        return self.calendar.free_days(year)
 
     def generate_all_data(self) -> None:
         months_with_data = DB_CONTROLLER.get_months_with_data()
-        for year, month in months_with_data:
-            self.all_data[(year, month)] = self.generate_month_data(datetime.date(year, month, 1))
-
-    def get_year_data(self, year: int) -> pd.DataFrame:
-        year_data = []
-        for month in range(1, 13):
-            selected_date = datetime.datetime(year, month, 1).date()
+        # months without any data (e.g. all events deleted) do not count into the totals
+        for key in set(self.summaries) - set(months_with_data):
+            del self.summaries[key]
+        self._generate_months([datetime.date(year, month, 1) for year, month in months_with_data])
+
+    def _generate_months(self, dates: list[datetime.date]) -> None:
+        """Generate the data of all given months, in worker processes if configured and worth it."""
+        workers = CONFIG_HANDLER.config.compute_workers
+        # never start a pool from within a worker process
+        if len(dates) >= PARALLEL_MIN_MONTHS and workers > 1 and multiprocessing.parent_process() is None:
+            try:
+                self._generate_months_parallel(dates, workers)
+                return
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning("Could not compute months in parallel, falling back to serial computation: %s", e)
+        for selected_date in dates:
+            self._update_summary(selected_date)
+
+    def _generate_months_parallel(self, dates: list[datetime.date], workers: int) -> None:
+        """Query all months, compute the base data of the changed ones in a process pool and merge them back.
+
+        The workers only get the events and pauses as arrays, the config dependent values are added afterwards.
+        The pool is started with spawn, since forking the multithreaded Qt process is not safe.
+        """
+        pending: dict[datetime.date, tuple[list[tuple[str, str]], list[tuple[str, int]], int]] = {}
+        data_version = DB_CONTROLLER.data_version
+        for selected_date in dates:
+            work_data, pause_data = DB_CONTROLLER.get_month_data(selected_date)
+            data_hash = self._data_hash(selected_date, work_data, pause_data)
+            if not self._is_up_to_date(selected_date, data_hash):
+                pending[selected_date] = (work_data, pause_data, data_hash)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                selected_date: executor.submit(
+                    build_month_base_from_columns,
+                    MonthColumns.from_rows(work, pause),
+                    selected_date.year,
+                    selected_date.month,
+                )
+                for selected_date, (work, pause, _) in pending.items()
+                if work
+            }
+            for selected_date, (work_data, pause_data, data_hash) in pending.items():
+                base = futures[selected_date].result() if selected_date in futures else MonthBase.empty()
+                month_data = self._add_month_data(selected_date, base, data_hash, work_data, pause_data)
+                month_data.data_version = data_version
+
+    def get_year_totals(self, year: int) -> PeriodTotals:
+        """Return the sums of each month of the year, from the first to the last month with data."""
+        return month_totals([self.generate_month_data(datetime.date(year, month, 1)).report for month in range(1, 13)])
+
+    def get_year_data(self, year: int) -> "pd.DataFrame":
+        """Return the hours of each month of the year as frame, see get_year_totals."""
+        return self.get_year_totals(year).to_display_frame()
+
+    def get_years_data(self) -> "pd.DataFrame":
+        """Return the work, target and overtime hours of every year, summed up from the month summaries."""
+        import pandas as pd  # noqa: PLC0415
+
+        columns = ["work", "target_time", "overtime"]
+        if not self.summaries:
+            return pd.DataFrame(columns=columns, dtype=float)
+        keys = sorted(self.summaries)
+        values = [[getattr(self.summaries[key], column) for column in columns] for key in keys]
+        years, sums = sum_by_year(keys, np.array(values))
+        return pd.DataFrame(sums.round(2), columns=columns, index=pd.Index(years, name="year"))
+
+    def generate_daily_data(self, selected_date: datetime.date, month_data: MonthData | None = None) -> None:
+        """Generate the events of the day out of the month data, which already holds all events of the month."""
+        if month_data is None:
             month_data = self.generate_month_data(selected_date)
-            year_data.append(month_data.df)
-        year_data_df = pd.concat(year_data)
-
-        if year_data_df.empty:
-            return year_data_df
-
-        # Only sum numeric columns, exclude time-based columns
-        numeric_columns = ["total_time", "pause", "work", "break_time", "overtime", "target_time"]
-        columns_to_sum = [col for col in numeric_columns if col in year_data_df.columns]
-
-        year_data_df = year_data_df[columns_to_sum].resample("ME").sum()
-        year_data_df.index = year_data_df.index.to_period("M")  # type: ignore
-        return year_data_df
-
-    def generate_daily_data(self, selected_date: datetime.date) -> None:
-        day_work, day_pause = DB_CONTROLLER.get_day_data(selected_date)
+        day_work, day_pause = month_data.get_day_data(selected_date)
         if day_pause:
             day_work.append(("Pause", str(day_pause[0][1])))
         self.daily_data = day_work
 
     def generate_month_data(self, selected_date: datetime.date) -> MonthData:
-        work_data, pause_data = DB_CONTROLLER.get_month_data(selected_date)
-        free_days = self.get_free_days(selected_date.year)
-        data_hash = hash((tuple(work_data), tuple(pause_data), tuple(free_days)))
-        # check if we already have the same data computes (no config or DB data changes)
-        # skip for current month, since it constantly changes
+        # read before the query, so a change while querying is noticed next time
+        data_version = DB_CONTROLLER.data_version
         last_data = self.all_data.get((selected_date.year, selected_date.month))
-        if last_data and last_data.is_same_data(data_hash) and not self.is_current_month(selected_date):
-            return last_data
-        if not work_data:
-            return MonthData(df=pd.DataFrame([]), data_hash=data_hash)
-        return MonthData(
-            df=self._generate_month_report(work_data, selected_date, free_days, pause_data),
-            data_hash=data_hash,
+        if last_data is not None and last_data.data_version == data_version:
+            # the rows of the cached month are still the ones of the database, e.g. when selecting another day
+            work_data, pause_data, data_hash = last_data.events, last_data.get_pause_rows(), last_data.data_hash
+        else:
+            work_data, pause_data = DB_CONTROLLER.get_month_data(selected_date)
+            data_hash = self._data_hash(selected_date, work_data, pause_data)
+        cached_data = self._get_cached_month(selected_date, data_hash)
+        if cached_data is not None:
+            cached_data.data_version = data_version
+            return cached_data
+        return self._build_month_data(selected_date, data_hash, work_data, pause_data, data_version)
+
+    def _update_summary(self, selected_date: datetime.date) -> None:
+        """Bring the summary of the month up to date, months which did not change are not built again."""
+        data_version = DB_CONTROLLER.data_version
+        work_data, pause_data = DB_CONTROLLER.get_month_data(selected_date)
+        data_hash = self._data_hash(selected_date, work_data, pause_data)
+        if not self._is_up_to_date(selected_date, data_hash):
+            self._build_month_data(selected_date, data_hash, work_data, pause_data, data_version)
+
+    def _is_up_to_date(self, selected_date: datetime.date, data_hash: int) -> bool:
+        """Check if the cached month, or the summary of an evicted month, was computed with the current data and config.
+
+        Evicted months only need to be built again if they changed, their summary is enough for the totals.
+        """
+        if self._get_cached_month(selected_date, data_hash) is not None:
+            return True
+        key = (selected_date.year, selected_date.month)
+        summary = self.summaries.get(key)
+        return (
+            key not in self.all_data
+            and summary is not None
+            and summary.data_hash == data_hash
+            and summary.config_hash == self._config_hash(*key)
+            and not self.is_current_month(selected_date)
         )
 
-    def _generate_month_report(
+    def _build_month_data(
         self,
+        selected_date: datetime.date,
+        data_hash: int,
         work_data: list[tuple[str, str]],
+        pause_data: list[tuple[str, int]],
+        data_version: int,
+    ) -> MonthData:
+        base = MonthBase.empty()
+        if work_data:
+            base = self._generate_month_base(work_data, selected_date, pause_data)
+        month_data = self._add_month_data(selected_date, base, data_hash, work_data, pause_data)
+        month_data.data_version = data_version
+        return month_data
+
+    def _data_hash(
+        self, selected_date: datetime.date, work_data: list[tuple[str, str]], pause_data: list[tuple[str, int]]
+    ) -> int:
+        time_off_days = self.calendar.time_off_days(selected_date.year)
+        return hash((tuple(work_data), tuple(pause_data), tuple(time_off_days)))
+
+    def _get_cached_month(self, selected_date: datetime.date, data_hash: int) -> MonthData | None:
+        """Return the cached month if its data did not change, the config dependent columns are updated if needed."""
+        # check if we already have the same data computes (no DB data changes)
+        # skip for current month, since it constantly changes
+        key = (selected_date.year, selected_date.month)
+        last_data = self.all_data.get(key)
+        if not last_data or not last_data.is_same_data(data_hash) or self.is_current_month(selected_date):
+            return None
+        # only the config changed, so the base data can be reused
+        if not last_data.is_same_config(self._config_hash(*key)):
+            self._apply_config(last_data, *key)
+        self._cache_month(key, last_data)
+        return last_data
+
+    def _add_month_data(
+        self,
         selected_date: datetime.date,
-        free_days: list[datetime.date],
+        base: MonthBase,
+        data_hash: int,
+        work_data: list[tuple[str, str]],
         pause_data: list[tuple[str, int]],
-    ) -> pd.DataFrame:
-        """Generate the complete monthly report DataFrame with all columns."""
-        work_df = pd.DataFrame(work_data, columns=["datetime", "event"])
-        work_df["datetime"] = work_df["datetime"].apply(pd.to_datetime)
-        work_df["time"] = work_df["datetime"].dt.time
-        work_df["date"] = work_df["datetime"].dt.date
-
-        start = datetime.date(selected_date.year, selected_date.month, 1)
-        end = start + relativedelta(months=+1)
-
-        report_data = []
-
-        for day in pd.date_range(start, end - datetime.timedelta(days=1), freq="d"):
-            days_data = work_df[work_df["date"] == day.date()]
-            calculated_time = 0.0
-            # Free days adds the daily target time to the total time (in case the user still worked to get overtime)
-            if day.date() in free_days:
-                calculated_time += CONFIG_HANDLER.config.get_daily_hours_at(day.weekday()) * 60
-
-            day_work_time, start_time, end_time = self._calculate_day_time_with_times(days_data)
-            calculated_time += day_work_time
-            report_data.append(
-                {
-                    "day": day,
-                    "total_time": calculated_time,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                }
-            )
-
-        combined_df = pd.DataFrame(report_data)
-        combined_df.set_index("day", inplace=True)
-
-        if pause_data:
-            pause_df = pd.DataFrame(pause_data, columns=["day", "pause"])
-            pause_df["day"] = pause_df["day"].apply(pd.to_datetime)
-            pause_df.set_index("day", inplace=True)
-            combined_df = pd.concat([combined_df, pause_df], axis=1, sort=False)
-        else:
-            combined_df["pause"] = 0.0
-
-        combined_df["pause"] = combined_df["pause"].fillna(0.0).astype(float)
-        combined_df["pause"] = combined_df["pause"].apply(lambda x: round(x / 60, 2))
-        combined_df["total_time"] = combined_df["total_time"].apply(lambda x: round(x / 60, 2))
-        combined_df["work"] = combined_df["total_time"] - combined_df["pause"]
-        combined_df["work"] = combined_df["work"].apply(lambda x: max(x, 0)).round(2)
-        combined_df["break_time"] = combined_df.apply(_calculate_break_time, axis=1)
-        combined_df["target_time"] = combined_df.apply(_calculate_target_time, axis=1)
-        combined_df["overtime"] = combined_df.apply(lambda row: _calculate_overtime(row), axis=1)
-        combined_df["overtime"] = combined_df["overtime"].round(2)
-
-        return combined_df
-
-    def _calculate_day_time_with_times(
-        self, df: pd.DataFrame
-    ) -> tuple[float, datetime.time | None, datetime.time | None]:
-        """Calculate the total work time for a day, along with the start and end times.
-
-        Args:
-            df (pd.DataFrame): DataFrame containing work log entries for a specific day.
-
-        Returns:
-            tuple[float, datetime.time | None, datetime.time | None]: A tuple containing the total work time in minutes,
-            the earliest start time, and the latest end time.
-
+    ) -> MonthData:
+        """Create the month data out of the computed base data, add the config dependent values and cache it."""
+        key = (selected_date.year, selected_date.month)
+        month_data = MonthData(
+            base=base,
+            data_hash=data_hash,
+            events=work_data,
+            day_offsets=day_offsets(work_data, *key),
+            pauses={datetime.date.fromisoformat(day): pause for day, pause in pause_data},
+        )
+        self._apply_config(month_data, *key)
+        self._cache_month(key, month_data)
+        return month_data
+
+    def _cache_month(self, key: tuple[int, int], month_data: MonthData) -> None:
+        """Put the month on top of the LRU cache and evict the least recently used months, keeping their summary."""
+        self.all_data[key] = month_data
+        self.all_data.move_to_end(key)
+        self.summaries[key] = MonthSummary.from_month_data(month_data)
+        while len(self.all_data) > max(self.max_cached_months, 1):
+            self.all_data.popitem(last=False)
+
+    def apply_config_change(self) -> None:
+        """Recompute the config dependent values of all cached months affected by the config change.
+
+        The config independent base data is not affected by the config, so there is no need to access the database.
+        Months outside the changed schedule range keep their cached results.
+        Only evicted months, which are affected by the change, need to be generated again from the database.
         """
-        if df.empty:
-            return 0.0, None, None
-
-        total_time = datetime.timedelta()
-        start_found = False
-        earliest_start = None
-        latest_end = None
-
-        for _, row in df.iterrows():
-            if not start_found and row["event"] == "start":
-                start_found = True
-                start_time: datetime.datetime = row["datetime"]
-                if earliest_start is None:
-                    earliest_start = start_time.time()
-            elif start_found and row["event"] == "stop":
-                start_found = False
-                end_time: datetime.datetime = row["datetime"]
-                latest_end = end_time.time()
-                total_time += row["datetime"] - start_time
-
-        # check if a start was found, but no stop, in this case, either the user forgot to stop the clock or the
-        # day is currently ongoing (date = today)
-        if not start_found:
-            return round(total_time.seconds / 60, 2), earliest_start, latest_end
-
-        # check for today.
-        today = datetime.date.today()
-        # check if start clock is the same day as today
-        if df.iloc[0]["date"] == today:
-            current_time = datetime.datetime.now()
-            total_time += current_time - start_time
-            latest_end = current_time.time()
-        # else, use the midnight of this day as end
-        else:
-            next_day = start_time + datetime.timedelta(days=1)
-            end_of_day = datetime.datetime.combine(next_day, datetime.time.min)  # type: ignore
-            total_time += end_of_day - start_time
-            latest_end = end_of_day.time()
-
-        return round(total_time.seconds / 60, 2), earliest_start, latest_end
+        for key, month_data in self.all_data.items():
+            if not month_data.is_same_config(self._config_hash(*key)):
+                self._apply_config(month_data, *key)
+                self.summaries[key] = MonthSummary.from_month_data(month_data)
+        self._generate_months(
+            [
+                datetime.date(year, month, 1)
+                for (year, month), summary in list(self.summaries.items())
+                if summary.config_hash != self._config_hash(year, month)
+            ]
+        )
+        self._sum_overtime_totals()
+
+    def _config_hash(self, year: int, month: int) -> int:
+        """Hash of all the config values the given month depends on."""
+        start = datetime.date(year, month, 1)
+        end = start + relativedelta(months=+1, days=-1)
+        config = CONFIG_HANDLER.config
+        return hash((self.schedule.fingerprint(start, end), config.country, config.subdiv))
+
+    def _apply_config(self, month_data: MonthData, year: int, month: int) -> None:
+        """Compute the config dependent values of the month data from its base data."""
+        days = month_data.base.days
+        is_free_day = self.calendar.month_mask(year, month)
+        daily_seconds = daily_target_seconds(self.schedule.daily_hours(days))
+        month_data.report = build_month_report(month_data.base, daily_seconds, is_free_day)
+        month_data.config_hash = self._config_hash(year, month)
+
+    def _generate_month_base(
+        self,
+        work_data: list[tuple[str, str]],
+        selected_date: datetime.date,
+        pause_data: list[tuple[str, int]],
+    ) -> MonthBase:
+        """Generate the config independent values of the month, see build_month_base."""
+        return build_month_base(work_data, pause_data, selected_date.year, selected_date.month)
 
     def is_current_month(self, date: datetime.date) -> bool:
         now = datetime.date.today()
@@ -221,72 +428,21 @@ class Store:
 
     def calculate_overtime_totals(self) -> None:
         """Calculate total overtime and overtime by year."""
-        self.total_overtime = 0.0
-        self.overtime_by_year = {}
-
         # re-calculate all data (caches might be invalid)
         self.generate_all_data()
-        dfs = [month_data.df for month_data in self.all_data.values() if not month_data.df.empty]
-        if not dfs:
-            return
-        merged_df = pd.concat(dfs)
-        overtime_by_year = merged_df.groupby(merged_df.index.year)["overtime"].sum()  # type: ignore
+        self._sum_overtime_totals()
+
+    def _sum_overtime_totals(self) -> None:
+        """Sum up the overtime of all months, only the summaries are needed for this."""
+        self.total_overtime = 0.0
+        self.overtime_by_year = {}
+        self.last_overtime_calculation = datetime.datetime.now()
+        overtime_by_year: dict[int, float] = {}
+        for (year, _), summary in sorted(self.summaries.items()):
+            overtime_by_year[year] = overtime_by_year.get(year, 0.0) + summary.overtime
         for year, value in overtime_by_year.items():
             self.overtime_by_year[year] = round(value, 2)
-        self.total_overtime = round(merged_df["overtime"].sum(), 2)
-        self.last_overtime_calculation = datetime.datetime.now()
-
-
-def _calculate_break_time(row: pd.Series) -> float:
-    start_time = row["start_time"]
-    end_time = row["end_time"]
-
-    if pd.isna(start_time) or pd.isna(end_time) or start_time is None or end_time is None:
-        return 0.0
-    if not isinstance(start_time, datetime.time) or not isinstance(end_time, datetime.time):
-        return 0.0
-
-    try:
-        start_dt = datetime.datetime.combine(datetime.date.today(), start_time)
-        end_dt = datetime.datetime.combine(datetime.date.today(), end_time)
-        if end_dt < start_dt:
-            end_dt += datetime.timedelta(days=1)
-
-        total_minutes = (end_dt - start_dt).total_seconds() / 60
-        break_minutes = total_minutes - row["total_time"] * 60
-        return round(max(break_minutes / 60, 0), 2)
-
-    except (TypeError, ValueError, AttributeError):
-        return 0.0
-
-
-def _calculate_target_time(row: pd.Series) -> float:
-    """Calculate the target time for a given row."""
-    day_date = row.name.date() if hasattr(row.name, "date") else row.name  # type: ignore
-    # Make typing happy, should not happen here
-
-    if not isinstance(day_date, datetime.date):
-        return 0.0
-    if day_date > datetime.date.today():
-        return 0.0
-
-    return CONFIG_HANDLER.config.get_daily_hours_at(day_date.weekday())
-
-
-def _calculate_overtime(row: pd.Series) -> float:
-    today = datetime.date.today()
-    daily_target: float = row["target_time"]
-    day_date = row.name.date() if hasattr(row.name, "date") else row.name  # type: ignore
-    work_hours: float = row["work"]
-
-    # Make typing happy, should not happen here
-    if not isinstance(day_date, datetime.date):
-        return 0.0
-    overtime = work_hours - daily_target
-    if day_date >= today:
-        return max(0.0, overtime)
-
-    return overtime
+        self.total_overtime = round(sum(overtime_by_year.values()), 2)
 
 
 store = Store()
@@ -0,0 +1,308 @@
+"""Computation of the daily, monthly and yearly values with numpy, without pandas.
+
+Events and pauses are taken as they come from the database, the targets and free days as arrays with one entry per
+day of the month. Durations are int32 seconds, start / end are int16 minutes of the day (NO_MINUTE if the day has no
+events). This module has no side effects on import (no database or config access), so the functions can also run
+in the worker processes of a process pool. pandas frames are only built as adapter for the UI and the export.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.work_time import day_work_time
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SECONDS_PER_HOUR = 3600
+# start / end minute of days without events, valid minutes are 0 to 1440 (end of an unfinished day)
+NO_MINUTE = -1
+# duration columns of the reports, mapped to their name in the display frames
+HOUR_COLUMNS = {
+    "total_s": "total_time",
+    "pause_s": "pause",
+    "work_s": "work",
+    "break_s": "break_time",
+    "target_s": "target_time",
+    "overtime_s": "overtime",
+}
+
+
+@dataclass(frozen=True)
+class MonthBase:
+    """Config independent values of each day of a month, which only change with the database data."""
+
+    days: np.ndarray
+    worked_s: np.ndarray
+    start_min: np.ndarray
+    end_min: np.ndarray
+    pause_s: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @classmethod
+    def empty(cls) -> MonthBase:
+        """Create the base of a month without events."""
+        seconds, minutes = np.array([], dtype=np.int32), np.array([], dtype=np.int16)
+        return cls(np.array([], dtype="datetime64[D]"), seconds, minutes, minutes, seconds)
+
+
+@dataclass(frozen=True)
+class MonthReport:
+    """Report of each day of a month, including the targets, free day credits and overtime."""
+
+    days: np.ndarray
+    total_s: np.ndarray
+    start_min: np.ndarray
+    end_min: np.ndarray
+    pause_s: np.ndarray
+    work_s: np.ndarray
+    break_s: np.ndarray
+    target_s: np.ndarray
+    overtime_s: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @classmethod
+    def empty(cls) -> MonthReport:
+        """Create the report of a month without events."""
+        return build_month_report(MonthBase.empty(), np.array([], dtype=np.int32), np.array([], dtype=bool))
+
+    def seconds(self, column: str) -> int:
+        """Return the sum of the duration column in seconds."""
+        return int(getattr(self, column).sum(dtype=np.int64))
+
+    def hours(self, column: str) -> float:
+        """Return the sum of the duration column in hours."""
+        return self.seconds(column) / SECONDS_PER_HOUR
+
+    def to_display_frame(self) -> pd.DataFrame:
+        """Return the report in hours and times, as used by the UI and the export."""
+        import pandas as pd  # noqa: PLC0415
+
+        if not len(self):
+            return pd.DataFrame([])
+        return pd.DataFrame(
+            {
+                "total_time": _to_hours(self.total_s),
+                "start_time": _to_times(self.start_min),
+                "end_time": _to_times(self.end_min),
+                "pause": _to_hours(self.pause_s),
+                "work": _to_hours(self.work_s),
+                "break_time": _to_hours(self.break_s),
+                "target_time": _to_hours(self.target_s),
+                "overtime": _to_hours(self.overtime_s),
+            },
+            index=pd.DatetimeIndex(self.days.astype("datetime64[ns]"), freq="D", name="day"),
+        )
+
+
+@dataclass(frozen=True)
+class PeriodTotals:
+    """Sums of the durations of consecutive months, in seconds (int64) for each month."""
+
+    months: np.ndarray
+    sums: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    def to_display_frame(self) -> pd.DataFrame:
+        """Return the sums in hours with a monthly period index, as used by the UI."""
+        import pandas as pd  # noqa: PLC0415
+
+        if not len(self):
+            return pd.DataFrame([])
+        return pd.DataFrame(
+            {name: _to_hours(self.sums[column]) for column, name in HOUR_COLUMNS.items()},
+            index=pd.PeriodIndex(self.months, freq="M", name="day"),
+        )
+
+
+@dataclass(frozen=True)
+class MonthColumns:
+    """Events and pauses of a month as arrays, which are pickled much smaller than the rows for a process pool."""
+
+    event_times: np.ndarray
+    is_start: np.ndarray
+    pause_days: np.ndarray
+    pause_minutes: np.ndarray
+
+    @classmethod
+    def from_rows(cls, events: list[tuple[str, str]], pauses: list[tuple[str, int]]) -> MonthColumns:
+        """Create the columns out of the (iso datetime, event) and (iso date, minutes) rows of the database."""
+        return cls(
+            event_times=np.array([event_time for event_time, _ in events], dtype="datetime64[us]"),
+            is_start=np.array([event == "start" for _, event in events], dtype=bool),
+            pause_days=np.array([day for day, _ in pauses], dtype="datetime64[D]"),
+            pause_minutes=np.array([minutes for _, minutes in pauses], dtype=np.int32),
+        )
+
+    def to_rows(self) -> tuple[list[tuple[str, str]], list[tuple[str, int]]]:
+        """Return the rows again, in the same format as the database controller."""
+        events = [
+            (event_time.isoformat(), "start" if is_start else "stop")
+            for event_time, is_start in zip(self.event_times.tolist(), self.is_start.tolist(), strict=True)
+        ]
+        pauses = [
+            (day.isoformat(), minutes)
+            for day, minutes in zip(self.pause_days.tolist(), self.pause_minutes.tolist(), strict=True)
+        ]
+        return events, pauses
+
+
+def month_days(year: int, month: int) -> np.ndarray:
+    """Return all days of the month as numpy days."""
+    start = np.datetime64(f"{year:04d}-{month:02d}", "M")
+    return np.arange(start.astype("datetime64[D]"), (start + 1).astype("datetime64[D]"))
+
+
+def build_month_base(
+    events: list[tuple[str, str]],
+    pauses: list[tuple[str, int]],
+    year: int,
+    month: int,
+    now: datetime.datetime | None = None,
+) -> MonthBase:
+    """Compute the config independent values of the month out of the (iso datetime, event) and (iso date, minutes) rows.
+
+    Months without events have no days, like the store does not report them.
+    """
+    if not events:
+        return MonthBase.empty()
+    days = month_days(year, month)
+    offsets = day_offsets(events, year, month)
+    worked_s = np.zeros(len(days), dtype=np.int32)
+    start_min = np.full(len(days), NO_MINUTE, dtype=np.int16)
+    end_min = np.full(len(days), NO_MINUTE, dtype=np.int16)
+    for i, day in enumerate(days.tolist()):
+        day_events = events[offsets[i] : offsets[i + 1]]
+        worked, start, end = day_work_time(day_events, day, now)
+        worked_s[i] = worked
+        if start is not None:
+            start_min[i] = start
+        if end is not None:
+            end_min[i] = end
+    pause_s = np.zeros(len(days), dtype=np.int32)
+    for day, minutes in pauses:
+        index = (np.datetime64(day, "D") - days[0]).astype(np.int64)
+        if 0 <= index < len(days):
+            pause_s[index] = minutes * 60
+    return MonthBase(days, worked_s, start_min, end_min, pause_s)
+
+
+def build_month_base_from_columns(columns: MonthColumns, year: int, month: int) -> MonthBase:
+    """Compute the config independent values of the month, see build_month_base, used in the worker processes."""
+    events, pauses = columns.to_rows()
+    return build_month_base(events, pauses, year, month)
+
+
+def day_offsets(events: list[tuple[str, str]], year: int, month: int) -> np.ndarray:
+    """Offsets of the first event of each day in the month, the last entry is the number of events.
+
+    The events of the i-th day of the month are events[offsets[i] : offsets[i + 1]].
+    """
+    days = month_days(year, month)
+    # events are iso formatted and sorted, so the first 10 characters are the date
+    event_days = np.array([event_time[:10] for event_time, _ in events], dtype="datetime64[D]")
+    return np.searchsorted(event_days, np.append(days, days[-1] + 1)).astype(np.int32)
+
+
+def build_month_report(
+    base: MonthBase,
+    daily_seconds: np.ndarray,
+    is_free_day: np.ndarray,
+    today: datetime.date | None = None,
+) -> MonthReport:
+    """Add the config dependent values to the base, with the target seconds and free day mask of each day.
+
+    Free days add the daily target time to the total time (in case the user still worked to get overtime).
+    """
+    if today is None:
+        today = datetime.date.today()
+    today_day = np.datetime64(today, "D")
+    days = base.days
+    daily_seconds = np.asarray(daily_seconds, dtype=np.int32)[: len(days)]
+    is_free_day = np.asarray(is_free_day, dtype=bool)[: len(days)]
+
+    total_seconds = base.worked_s + np.where(is_free_day, daily_seconds, 0)
+    work_seconds = np.maximum(total_seconds - base.pause_s, 0)
+    # break is the time between first start and last stop, which was not worked
+    has_span = (base.start_min != NO_MINUTE) & (base.end_min != NO_MINUTE)
+    span_seconds = (base.end_min.astype(np.int32) - base.start_min) * 60
+    break_seconds = np.where(has_span, np.maximum(span_seconds - total_seconds, 0), 0)
+    target_seconds = np.where(days <= today_day, daily_seconds, 0)
+    overtime_seconds = work_seconds - target_seconds
+    # do not count missing hours for today or future days, since the day is not over yet
+    overtime_seconds = np.where(days < today_day, overtime_seconds, np.maximum(overtime_seconds, 0))
+    return MonthReport(
+        days=days,
+        total_s=total_seconds.astype(np.int32),
+        start_min=base.start_min,
+        end_min=base.end_min,
+        pause_s=base.pause_s,
+        work_s=work_seconds.astype(np.int32),
+        break_s=break_seconds.astype(np.int32),
+        target_s=target_seconds.astype(np.int32),
+        overtime_s=overtime_seconds.astype(np.int32),
+    )
+
+
+def month_totals(reports: list[MonthReport]) -> PeriodTotals:
+    """Sum up the durations of each month, from the first to the last month with data.
+
+    Months in between without data are included with zero sums.
+    """
+    reports = [report for report in reports if len(report)]
+    if not reports:
+        return PeriodTotals(
+            np.array([], dtype="datetime64[M]"), {column: np.array([], dtype=np.int64) for column in HOUR_COLUMNS}
+        )
+    report_months = np.array([report.days[0] for report in reports]).astype("datetime64[M]")
+    months = np.arange(report_months.min(), report_months.max() + 1)
+    index = (report_months - months[0]).astype(np.int64)
+    sums = {}
+    for column in HOUR_COLUMNS:
+        sums[column] = np.zeros(len(months), dtype=np.int64)
+        sums[column][index] = [report.seconds(column) for report in reports]
+    return PeriodTotals(months, sums)
+
+
+def sum_by_year(months: list[tuple[int, int]], values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sum up the rows of the values belonging to the same year, return the sorted years and their sums."""
+    years, index = np.unique(np.array([year for year, _ in months], dtype=np.int64), return_inverse=True)
+    sums = np.zeros((len(years), *np.shape(values)[1:]))
+    np.add.at(sums, index, values)
+    return years, sums
+
+
+def daily_target_seconds(daily_hours: np.ndarray) -> np.ndarray:
+    """Convert the daily target hours into whole seconds."""
+    return np.rint(np.asarray(daily_hours, dtype=float) * SECONDS_PER_HOUR).astype(np.int32)
+
+
+def free_day_mask(days: np.ndarray, free_days: list[datetime.date], workdays: np.ndarray) -> np.ndarray:
+    """Return for each day if it is a free day (holiday or time off), which is also a workday."""
+    return np.isin(days, np.array(free_days, dtype="datetime64[D]")) & workdays
+
+
+def minutes_to_time(minute: int) -> datetime.time | None:
+    if minute == NO_MINUTE:
+        return None
+    minute = int(minute)
+    return datetime.time(minute // 60 % 24, minute % 60)
+
+
+def _to_hours(seconds: np.ndarray) -> np.ndarray:
+    return np.round(seconds / SECONDS_PER_HOUR, 2)
+
+
+def _to_times(minutes: np.ndarray) -> list[datetime.time | None]:
+    return [minutes_to_time(minute) for minute in minutes]
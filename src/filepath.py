@@ -44,6 +44,12 @@ DATABASE_PATH = SAVE_FOLDER / "time_data.db"
 OLD_CONFIG_PATH = ROOT_PATH / "config" / "config.json"
 CONFIG_PATH = SAVE_FOLDER / "config.json"
 
+# supported countries and subdivisions of the holidays package, cached per package version
+HOLIDAY_CATALOG_PATH = SAVE_FOLDER / "holiday_catalog.json"
+
+# generated stylesheets and icon pixmaps, cached per app and package version
+ASSET_CACHE_PATH = SAVE_FOLDER / "asset_cache"
+
 # saved reports (default one)
 REPORTS_PATH = SAVE_FOLDER / "reports"
 
@@ -0,0 +1,159 @@
+"""Calendar of free days (holidays and time off) with one boolean array per year.
+
+Lookups of single days are O(1) and masks for whole date ranges are vectorized.
+A year is rebuilt lazily when the time off in the database, the holiday settings or the schedule change.
+The app uses the calendar with its own database and config, the batch reports with the ones of each user.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.schedule import ScheduleHistory
+
+if TYPE_CHECKING:
+    from src.config_handler import Config
+    from src.database_controller import DatabaseController
+    from src.sqlite_database import SqliteDatabase
+
+DAYS_PER_YEAR = 366
+
+
+@dataclass(slots=True)
+class YearCalendar:
+    """Boolean arrays of one year, indexed by the day of the year (0 = 1st January)."""
+
+    holidays: np.ndarray
+    time_off: np.ndarray
+    workdays: np.ndarray
+    time_off_days: list[datetime.date]
+    holiday_key: tuple[str, str | None]
+    time_off_version: int
+
+    @property
+    def days_off(self) -> np.ndarray:
+        return self.holidays | self.time_off
+
+    @property
+    def free_days(self) -> np.ndarray:
+        return self.days_off & self.workdays
+
+
+class FreeDayCalendar:
+    def __init__(
+        self,
+        schedule: ScheduleHistory,
+        database: DatabaseController | SqliteDatabase | None = None,
+        config: Config | None = None,
+    ) -> None:
+        """Calendar service for free days, the workdays are taken from the schedule.
+
+        Without database and config, the ones of the app are used (imported here, so other users don't load them).
+        """
+        if database is None:
+            from src.database_controller import DB_CONTROLLER  # noqa: PLC0415
+
+            database = DB_CONTROLLER
+        if config is None:
+            from src.config_handler import CONFIG_HANDLER  # noqa: PLC0415
+
+            config = CONFIG_HANDLER.config
+        self.schedule = schedule
+        self.database = database
+        self.config = config
+        self._years: dict[int, YearCalendar] = {}
+
+    def set_schedule(self, schedule: ScheduleHistory) -> None:
+        """Use a new schedule, only the workdays of the cached years are rebuilt (no database access)."""
+        self.schedule = schedule
+        for year, year_calendar in self._years.items():
+            year_calendar.workdays = self._workday_mask(year)
+
+    def invalidate(self, year: int | None = None) -> None:
+        """Drop the cached year (or all years), it will be rebuilt on next access."""
+        if year is None:
+            self._years.clear()
+            return
+        self._years.pop(year, None)
+
+    def is_free_day(self, day: datetime.date, workdays_only: bool = True) -> bool:
+        """Check if the day is a holiday or time off, by default only if it is also a workday."""
+        year_calendar = self._get_year(day.year)
+        mask = year_calendar.free_days if workdays_only else year_calendar.days_off
+        return bool(mask[day.timetuple().tm_yday - 1])
+
+    def mask(self, days: np.ndarray, workdays_only: bool = True) -> np.ndarray:
+        """Return for each of the given days if it is a free day, see is_free_day."""
+        days = np.asarray(days, dtype="datetime64[D]")
+        year_starts = days.astype("datetime64[Y]")
+        years = year_starts.astype(np.int64) + 1970
+        day_of_year = (days - year_starts.astype("datetime64[D]")).astype(np.int64)
+        result = np.zeros(days.shape, dtype=bool)
+        for year in np.unique(years):
+            year_calendar = self._get_year(int(year))
+            year_mask = year_calendar.free_days if workdays_only else year_calendar.days_off
+            selected = years == year
+            result[selected] = year_mask[day_of_year[selected]]
+        return result
+
+    def month_mask(self, year: int, month: int, workdays_only: bool = True) -> np.ndarray:
+        """Return the free day mask for all days of the month."""
+        start = np.datetime64(datetime.date(year, month, 1), "D")
+        end = np.datetime64(f"{year:04d}-{month:02d}", "M") + 1
+        return self.mask(np.arange(start, end.astype("datetime64[D]")), workdays_only)
+
+    def free_days(self, year: int) -> list[datetime.date]:
+        """Return all free days of the year, which are also workdays."""
+        start = datetime.date(year, 1, 1)
+        return [start + datetime.timedelta(days=int(i)) for i in np.flatnonzero(self._get_year(year).free_days)]
+
+    def time_off_days(self, year: int) -> list[datetime.date]:
+        """Return the time off days of the year, as stored in the database."""
+        return self._get_year(year).time_off_days
+
+    def _get_year(self, year: int) -> YearCalendar:
+        year_calendar = self._years.get(year)
+        config = self.config
+        holiday_key = (config.country, config.subdiv)
+        time_off_version = self.database.time_off_version
+        if year_calendar is None:
+            year_calendar = self._build_year(year, holiday_key, time_off_version)
+            self._years[year] = year_calendar
+            return year_calendar
+        if year_calendar.holiday_key != holiday_key:
+            year_calendar.holidays = self._to_mask(year, config.get_holidays(year))
+            year_calendar.holiday_key = holiday_key
+        if year_calendar.time_off_version != time_off_version:
+            year_calendar.time_off_days = self.database.get_time_off_days(year)
+            year_calendar.time_off = self._to_mask(year, year_calendar.time_off_days)
+            year_calendar.time_off_version = time_off_version
+        return year_calendar
+
+    def _build_year(self, year: int, holiday_key: tuple[str, str | None], time_off_version: int) -> YearCalendar:
+        time_off_days = self.database.get_time_off_days(year)
+        return YearCalendar(
+            holidays=self._to_mask(year, self.config.get_holidays(year)),
+            time_off=self._to_mask(year, time_off_days),
+            workdays=self._workday_mask(year),
+            time_off_days=time_off_days,
+            holiday_key=holiday_key,
+            time_off_version=time_off_version,
+        )
+
+    def _workday_mask(self, year: int) -> np.ndarray:
+        start = np.datetime64(datetime.date(year, 1, 1), "D")
+        days = np.arange(start, start + DAYS_PER_YEAR)
+        workdays = self.schedule.workday_mask(days)
+        # non leap years only have 365 days, the last entry is the 1st January of the next year
+        workdays[days.astype("datetime64[Y]") != start.astype("datetime64[Y]")] = False
+        return workdays
+
+    def _to_mask(self, year: int, days: list[datetime.date]) -> np.ndarray:
+        mask = np.zeros(DAYS_PER_YEAR, dtype=bool)
+        day_of_year = [day.timetuple().tm_yday - 1 for day in days if day.year == year]
+        mask[day_of_year] = True
+        return mask
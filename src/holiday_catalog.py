@@ -0,0 +1,60 @@
+"""Supported countries and subdivisions of the holidays package.
+
+Building the catalog loads every country of the holidays package, which takes a noticeable time.
+It is only built once per holidays version and stored in the app folder, later starts read the file.
+The version is read from the package metadata, so the holidays package is only imported to build the catalog.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from src.filepath import HOLIDAY_CATALOG_PATH
+
+logger = logging.getLogger(__name__)
+
+_catalog: dict[str, list[str]] | None = None
+
+
+def get_country_catalog() -> dict[str, list[str]]:
+    """Return the subdivisions by country code, loaded only once per process."""
+    global _catalog  # noqa: PLW0603
+    if _catalog is None:
+        _catalog = load_country_catalog(HOLIDAY_CATALOG_PATH)
+    return _catalog
+
+
+def load_country_catalog(path: Path) -> dict[str, list[str]]:
+    """Read the catalog from the file, build and store it again if it is missing or from another version."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data["holidays_version"] == _holidays_version():
+            return data["countries"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Could not read the holiday catalog at %s, building it again: %s", path, e)
+
+    import holidays  # noqa: PLC0415
+
+    countries = {country: list(subdivs) for country, subdivs in holidays.list_supported_countries().items()}
+    try:
+        data = {"holidays_version": holidays.__version__, "countries": countries}
+        path.write_text(json.dumps(data), encoding="utf-8")
+    except OSError as e:
+        # the catalog still works, it is only built again on next start
+        logger.warning("Could not store the holiday catalog at %s: %s", path, e)
+    return countries
+
+
+def _holidays_version() -> str:
+    # the metadata might not be bundled in the installer build, then the package itself is needed
+    try:
+        return version("holidays")
+    except PackageNotFoundError:
+        import holidays  # noqa: PLC0415
+
+        return holidays.__version__
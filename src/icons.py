@@ -1,8 +1,9 @@
 from dataclasses import dataclass
+from functools import cache
 
-import qtawesome as qta
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QGuiApplication, QIcon
 
+from src.asset_cache import ASSET_CACHE
 from src.utils import get_background_color, get_font_color
 
 
@@ -34,13 +35,28 @@ class PresetIcon:
     edit_inverted: QIcon
 
 
+# sizes the icons are used with (menus, buttons, window and tray), including high dpi variants
+ICON_SIZES = (16, 20, 24, 32, 48, 64)
+
+
+@cache
 def generate_icon(icon_name: str, color: str = "white") -> QIcon:
-    return qta.icon(icon_name, color=color)
+    """Return the icon in the given color, each (name, color) is only created once.
+
+    The pixmaps are rendered once for the used sizes, qtawesome would paint the font glyph on every draw.
+    They are also stored in the asset cache, so later starts do not need to render them (or load qtawesome).
+    """
+    app = QGuiApplication.instance()
+    pixel_ratio = app.devicePixelRatio() if isinstance(app, QGuiApplication) else 1.0
+    return ASSET_CACHE.get_icon(icon_name, color, ICON_SIZES, pixel_ratio)
 
 
 def get_preset_icons() -> PresetIcon:
-    default_color = get_font_color()
-    bg_color = get_background_color()
+    return _get_preset_icons(get_font_color(), get_background_color())
+
+
+@cache
+def _get_preset_icons(default_color: str, bg_color: str) -> PresetIcon:
     return PresetIcon(
         start=generate_icon(PresetIconNames.start, "green"),
         stop=generate_icon(PresetIconNames.stop, "orange"),
@@ -0,0 +1,82 @@
+"""Control channel to the running app, so later launches and the command line forward their commands to it.
+
+The app listens on a local socket (QLocalServer), which is a unix domain socket on Linux / macOS and a named pipe
+on Windows. Each request and response is a single line of JSON. The client only uses the standard library,
+so the command line can talk to the app without importing Qt.
+"""
+
+from __future__ import annotations
+
+import getpass
+import json
+import logging
+import socket
+import sys
+from typing import Any
+
+from src.filepath import APP_NAME, SAVE_FOLDER
+
+logger = logging.getLogger(__name__)
+
+# the app answers right away, only the data window takes a moment to open
+RESPONSE_TIMEOUT = 10.0
+
+
+def get_server_name() -> str:
+    """Name of the local socket of the app, Qt maps it to a named pipe on Windows and uses the path elsewhere."""
+    if sys.platform.startswith("win"):
+        return f"{APP_NAME}_{getpass.getuser()}"
+    return str(SAVE_FOLDER / "instance.sock")
+
+
+def send_command(command: str, server_name: str | None = None, **arguments: Any) -> dict[str, Any] | None:
+    """Send the command to the running app and return its response, None if there is no app running.
+
+    The response contains if the command succeeded ("ok") and the message to show to the user ("message").
+    """
+    if server_name is None:
+        server_name = get_server_name()
+    request = json.dumps({"command": command, **arguments}).encode() + b"\n"
+    try:
+        if sys.platform.startswith("win"):
+            response = _send_pipe(server_name, request)
+        else:
+            response = _send_socket(server_name, request)
+    # no socket or a stale one of a crashed app
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    # the app got the request, so it must not be done again without the app
+    except TimeoutError:
+        return {"ok": False, "message": "The running app did not answer in time"}
+    except OSError as e:
+        logger.warning("Could not reach the running app: %s", e)
+        return None
+    if not response:
+        return {"ok": False, "message": "The running app closed the connection without answer"}
+    return json.loads(response)
+
+
+def encode_response(ok: bool, message: str) -> bytes:
+    return json.dumps({"ok": ok, "message": message}).encode() + b"\n"
+
+
+def _send_socket(server_name: str, request: bytes) -> bytes:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(RESPONSE_TIMEOUT)
+        client.connect(server_name)
+        client.sendall(request)
+        with client.makefile("rb") as reader:
+            return reader.readline()
+
+
+def _send_pipe(server_name: str, request: bytes) -> bytes:
+    with open(rf"\\.\pipe\{server_name}", "r+b", buffering=0) as pipe:  # noqa: PTH123
+        pipe.write(request)
+        # the pipe is in byte mode, so read until the line is complete
+        response = b""
+        while not response.endswith(b"\n"):
+            chunk = pipe.read(4096)
+            if not chunk:
+                break
+            response += chunk
+        return response
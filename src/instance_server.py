@@ -0,0 +1,76 @@
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from src.instance_channel import encode_response, get_server_name
+
+logger = logging.getLogger(__name__)
+
+# handles the request (command and its arguments), returns if it succeeded and the message for the user
+CommandHandler = Callable[[dict[str, Any]], tuple[bool, str]]
+
+
+class InstanceServer(QObject):
+    def __init__(self, handler: CommandHandler, server_name: str | None = None, parent: QObject | None = None) -> None:
+        """Local socket server of the running app, see instance_channel for the protocol."""
+        super().__init__(parent)
+        self.handler = handler
+        self.server_name = server_name or get_server_name()
+        self.server = QLocalServer(self)
+        # only the user running the app may send commands
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self._accept_connections)
+
+    def listen(self) -> bool:
+        """Start listening, should only be called if no other app answered on the channel.
+
+        A socket left over by a crashed app is removed, otherwise the name would be blocked.
+        """
+        if self.server.listen(self.server_name):
+            return True
+        QLocalServer.removeServer(self.server_name)
+        if self.server.listen(self.server_name):
+            return True
+        logger.warning("Could not listen for commands on %s: %s", self.server_name, self.server.errorString())
+        return False
+
+    def close(self) -> None:
+        self.server.close()
+
+    def _accept_connections(self) -> None:
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            if connection is None:
+                break
+            connection.readyRead.connect(lambda connection=connection: self._read_request(connection))
+            connection.disconnected.connect(connection.deleteLater)
+            # the request could already be there before the signal was connected
+            if connection.canReadLine():
+                self._read_request(connection)
+
+    def _read_request(self, connection: QLocalSocket) -> None:
+        if not connection.canReadLine():
+            return
+        line = bytes(connection.readLine().data())
+        connection.write(self._handle(line))
+        connection.flush()
+        connection.disconnectFromServer()
+
+    def _handle(self, line: bytes) -> bytes:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return encode_response(False, "Invalid request")
+        if not isinstance(request, dict) or "command" not in request:
+            return encode_response(False, "Invalid request")
+        logger.info("Got command %s from another process", request["command"])
+        try:
+            ok, message = self.handler(request)
+        except Exception as e:
+            logger.exception(e)
+            return encode_response(False, f"Could not run command {request['command']}: {e}")
+        return encode_response(ok, message)
@@ -70,6 +70,33 @@ class TimeOff(Base):
         self.reason = reason
 
 
+class WorkSchedule(Base):
+    """Work schedule, valid from the effective date until the next schedule starts.
+
+    Workdays and daily hours are stored as comma separated values, 0=Monday, 6=Sunday.
+    """
+
+    __tablename__ = "WorkSchedule"
+
+    ID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    effective_from: Mapped[datetime.date] = mapped_column(SqlDate, nullable=False, name="EffectiveFrom")
+    workdays: Mapped[str] = mapped_column(String, nullable=False, name="Workdays")
+    daily_hours: Mapped[str] = mapped_column(String, nullable=False, name="DailyHours")
+
+    __table_args__ = (Index("idx_effective_from", "EffectiveFrom", unique=True),)
+
+    def __init__(self, effective_from: datetime.date, workdays: list[int], daily_hours: list[float]) -> None:  # noqa: D107
+        self.effective_from = effective_from
+        self.workdays = ",".join(str(day) for day in workdays)
+        self.daily_hours = ",".join(str(hours) for hours in daily_hours)
+
+    def get_workdays(self) -> list[int]:
+        return [int(day) for day in self.workdays.split(",") if day]
+
+    def get_daily_hours(self) -> list[float]:
+        return [float(hours) for hours in self.daily_hours.split(",")]
+
+
 def create_session_factory(db_url: str) -> sessionmaker:
     """Create a session factory for the given database URL.
 
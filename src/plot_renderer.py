@@ -0,0 +1,230 @@
+"""Work time and overtime plot of the data window.
+
+The bars, value labels and target lines are created once and only updated on data changes,
+they are only created again if the number of bars changes (other month length, month / year view).
+The tight layout is expensive, so it is only computed again if the tick labels or the figure size change.
+The OffscreenPlot renders without any widget (Agg), so this can run in a background thread.
+"""
+
+from __future__ import annotations
+
+import colorsys
+import io
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_hex, to_rgb
+from matplotlib.container import BarContainer
+from matplotlib.figure import Figure
+from matplotlib.gridspec import GridSpec
+from matplotlib.text import Text
+from matplotlib.ticker import FuncFormatter
+
+from src.utils import get_background_color, get_font_color
+
+# dpi of the plot on screen (scaled with the device pixel ratio) and for saved images
+PLOT_DPI = 128
+SAVE_DPI = 300
+BAR_WIDTH = 0.8
+TARGET_WIDTH = 0.9
+# bar colors are slightly desaturated, like the seaborn default used before
+SATURATION = 0.75
+
+
+@dataclass
+class PlotColors:
+    red: str = "#ff4e26"
+    green: str = "#25cf5e"
+    blue: str = "#2693ff"
+    light_blue: str = "#7db8ff"
+    purple: str = "#a26eff"
+    background: str = field(default_factory=get_background_color)
+    text: str = field(default_factory=get_font_color)
+
+
+@dataclass
+class PlotContent:
+    """Data and title of one plot."""
+
+    df: pd.DataFrame
+    plot_month: bool
+    title: str
+
+    @property
+    def version(self) -> int:
+        """Hash of the shown data, equal data results in the same image."""
+        data_hash = pd.util.hash_pandas_object(self.df, index=True).to_numpy().tobytes()
+        return hash((self.plot_month, self.title, data_hash))
+
+
+@dataclass
+class BarArtists:
+    """Bars of one axis with their value labels."""
+
+    bars: BarContainer
+    labels: list[Text]
+
+    def remove(self) -> None:
+        self.bars.remove()
+        for label in self.labels:
+            label.remove()
+
+
+class WorkTimePlot:
+    def __init__(self, figure: Figure, colors: PlotColors) -> None:
+        """Create the axes of the plot, bottom: work time with targets, top: overtime."""
+        self.figure = figure
+        self.colors = colors
+        grid = GridSpec(2, 1, height_ratios=[1, 4], figure=figure)
+        self.ax_work = figure.add_subplot(grid[1])
+        self.ax_overtime = figure.add_subplot(grid[0], sharex=self.ax_work)
+        self.target_lines = LineCollection([], colors=colors.text, linewidths=1, linestyles="--", zorder=3)
+        self.ax_work.add_collection(self.target_lines)
+        self.work: BarArtists | None = None
+        self.overtime: BarArtists | None = None
+        self.layout_key: tuple[int, bool, int, int, tuple[float, ...]] | None = None
+        self._style_axes()
+
+    def update(self, df: pd.DataFrame, plot_month: bool, title: str) -> None:
+        """Show the new data, the canvas still needs to be drawn afterwards."""
+        if self.work is None or len(self.work.bars) != len(df):
+            self._create_bars(len(df))
+        self._update_work(df, plot_month)
+        self._update_overtime(df)
+        self.figure.suptitle(title, weight="bold", fontsize=15)
+        layout_key = (
+            len(df),
+            plot_month,
+            _label_digits(self.ax_work),
+            _label_digits(self.ax_overtime),
+            tuple(self.figure.get_size_inches()),
+        )
+        if layout_key != self.layout_key:
+            self.figure.tight_layout()
+            self.layout_key = layout_key
+
+    def _style_axes(self) -> None:
+        ax = self.ax_work
+        ax.yaxis.grid(True, lw=1, ls=":", color=self.colors.text, alpha=0.2, zorder=1)
+        ax.tick_params(axis="x", which="both", bottom=False, top=False)
+        ax.set_ylabel("Work Time (h)")
+
+        ax = self.ax_overtime
+        ax.tick_params(axis="x", which="both", bottom=False, top=False, labelbottom=False)
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{int(x)}"))
+        ax.spines["bottom"].set_position(("data", 0))
+        ax.set_ylabel("Overtime (h)")
+
+    def _create_bars(self, number: int) -> None:
+        for artists in (self.work, self.overtime):
+            if artists is not None:
+                artists.remove()
+        self.work = self._create_bar_artists(self.ax_work, number, fontsize=8, with_box=True)
+        self.overtime = self._create_bar_artists(self.ax_overtime, number, fontsize=6, with_box=False)
+        self.ax_work.set_xticks(range(number))
+        self.ax_work.set_xlim(-0.5, number - 0.5)
+
+    def _create_bar_artists(self, ax: Axes, number: int, fontsize: int, with_box: bool) -> BarArtists:
+        bars = ax.bar(range(number), np.zeros(number), width=BAR_WIDTH, zorder=2)
+        bbox = None
+        if with_box:
+            background = self.colors.background
+            bbox = {"boxstyle": "round,pad=0.0", "fc": background, "ec": background, "alpha": 0.8}
+        labels = [
+            ax.text(i, 0, "", ha="center", fontsize=fontsize, weight="bold", bbox=bbox, zorder=5, visible=False)
+            for i in range(number)
+        ]
+        return BarArtists(bars, labels)
+
+    def _update_work(self, df: pd.DataFrame, plot_month: bool) -> None:
+        assert self.work is not None
+        work = df["work"].to_numpy(dtype=float)
+        target = df["target_time"].to_numpy(dtype=float)
+        free_color = _desaturate(self.colors.purple)
+        work_color = _desaturate(self.colors.blue)
+        for bar, value, is_free_day in zip(self.work.bars, work, df["is_free_day"], strict=True):
+            bar.set_height(value)
+            bar.set_facecolor(free_color if is_free_day else work_color)
+
+        # value labels and target lines are only shown for days with work
+        offset = work.max() * 0.012
+        for i, (label, value) in enumerate(zip(self.work.labels, work, strict=True)):
+            label.set_visible(value > 0.0)
+            label.set_text(f"{value:.1f}")
+            label.set_position((i, value + offset))
+            label.set_verticalalignment("bottom")
+        worked = np.flatnonzero(work > 0.0)
+        half_width = TARGET_WIDTH / 2
+        self.target_lines.set_segments([[(i - half_width, target[i]), (i + half_width, target[i])] for i in worked])
+
+        if plot_month:
+            self.ax_work.set_xticklabels([day.strftime("%a %d") for day in df.index], rotation="vertical")
+        else:
+            self.ax_work.set_xticklabels([month.strftime("%b") for month in df.index], rotation="horizontal")
+        self.ax_work.relim()
+        if len(worked):
+            self.ax_work.update_datalim([(0, value) for value in target[worked]])
+        self.ax_work.autoscale_view(scalex=False)
+
+    def _update_overtime(self, df: pd.DataFrame) -> None:
+        assert self.overtime is not None
+        overtime = df["overtime"].to_numpy(dtype=float)
+        positive_color = _desaturate(self.colors.green)
+        negative_color = _desaturate(self.colors.red)
+        for bar, value in zip(self.overtime.bars, overtime, strict=True):
+            bar.set_height(value)
+            bar.set_facecolor(positive_color if value >= 0 else negative_color)
+
+        add_max = overtime.max() * 0.01
+        # Min value needs more shift because of other va behavior
+        add_min = overtime.min() * 0.05
+        for i, (label, value) in enumerate(zip(self.overtime.labels, overtime, strict=True)):
+            label.set_visible(value != 0.0)
+            label.set_text(f"{abs(value):.1f}")
+            label.set_position((i, value + (add_max if value > 0 else add_min)))
+            label.set_verticalalignment("bottom" if value >= 0 else "top")
+        self.ax_overtime.relim()
+        self.ax_overtime.autoscale_view(scalex=False)
+
+
+class OffscreenPlot:
+    def __init__(self, colors: PlotColors) -> None:
+        """Work time plot on its own figure, rendered with Agg into raw pixels or png."""
+        self.colors = colors
+        self.figure = Figure(dpi=PLOT_DPI)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.plot = WorkTimePlot(self.figure, colors)
+
+    def render_rgba(self, content: PlotContent, width: int, height: int, dpi: float = PLOT_DPI) -> bytes:
+        """Render the plot with the size in pixels at the given dpi, returns RGBA pixel data (row major)."""
+        self._update(content, width / dpi, height / dpi)
+        self.figure.set_dpi(dpi)
+        self.canvas.draw()
+        return bytes(self.canvas.buffer_rgba())
+
+    def render_png(
+        self, content: PlotContent, width_inches: float, height_inches: float, dpi: float = SAVE_DPI
+    ) -> bytes:
+        """Render the plot as png, the size is in inches, so a higher dpi keeps the layout."""
+        self._update(content, width_inches, height_inches)
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format="png", transparent=False, dpi=dpi)
+        return buffer.getvalue()
+
+    def _update(self, content: PlotContent, width_inches: float, height_inches: float) -> None:
+        self.figure.set_size_inches(width_inches, height_inches, forward=False)
+        self.plot.update(content.df, content.plot_month, content.title)
+
+
+def _label_digits(ax: Axes) -> int:
+    """Return the digits (including sign) of the longest y tick label, which changes the needed margin."""
+    return max(len(f"{int(limit)}") for limit in ax.get_ylim())
+
+
+def _desaturate(color: str, saturation: float = SATURATION) -> str:
+    hue, lightness, color_saturation = colorsys.rgb_to_hls(*to_rgb(color))
+    return to_hex(colorsys.hls_to_rgb(hue, lightness, color_saturation * saturation))
@@ -0,0 +1,191 @@
+"""Off-screen rendering of the data window plot.
+
+The plot is rendered with Agg in a background thread, the GUI thread only shows the resulting image.
+Saving renders png bytes in the same thread, so the GUI stays responsive also at the high save dpi.
+Rendered images are cached per (period, data version, theme, size), so navigating back and forth
+or resizing to a previous size shows the image without rendering it again.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap, QResizeEvent
+from PyQt6.QtWidgets import QLabel, QSizePolicy, QWidget
+
+from src.plot_renderer import PLOT_DPI, SAVE_DPI, OffscreenPlot, PlotColors, PlotContent
+
+logger = logging.getLogger(__name__)
+
+# one image of a full window plot needs a few MB, only keep the latest ones
+IMAGE_CACHE_SIZE = 8
+# resizing is rendered again when the size did not change for this time
+RESIZE_DELAY_MS = 100
+
+ImageKey = tuple[bool, str, int, tuple[str, str], tuple[int, int, float]]
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    generation: int
+    # saved plots are not cached, so they have no key
+    key: ImageKey | None
+    content: PlotContent
+    width: int
+    height: int
+    dpi: float
+    save_path: Path | None = None
+
+
+class RenderSignals(QObject):
+    rendered = pyqtSignal(object, object)
+    saved = pyqtSignal(object)
+    failed = pyqtSignal(object, str)
+
+
+class RenderWorker(QRunnable):
+    def __init__(self, job: RenderJob, plot: OffscreenPlot, is_current: Callable[[int], bool]) -> None:
+        """Render the job with the plot, which is only used within the (single) render thread."""
+        super().__init__()
+        self.job = job
+        self.plot = plot
+        self.is_current = is_current
+        self.signals = RenderSignals()
+
+    def run(self) -> None:
+        job = self.job
+        try:
+            if job.save_path is not None:
+                png = self.plot.render_png(job.content, job.width / PLOT_DPI, job.height / PLOT_DPI, dpi=job.dpi)
+                job.save_path.write_bytes(png)
+                self.signals.saved.emit(job.save_path)
+                return
+            # displayed plots are skipped if there is already a newer one
+            if not self.is_current(job.generation):
+                return
+            image = render_image(self.plot, job)
+        except Exception as e:
+            logger.exception(e)
+            self.signals.failed.emit(job, str(e))
+            return
+        self.signals.rendered.emit(job, image)
+
+
+class PlotView(QLabel):
+    saved = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, colors: PlotColors, parent: QWidget | None = None) -> None:
+        """Label showing the plot, which is rendered in the background at the size of the label."""
+        super().__init__(parent)
+        self.colors = colors
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.setMinimumSize(200, 150)
+        self.setStyleSheet(f"background-color: {colors.background};")
+        self.offscreen_plot = OffscreenPlot(colors)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DELAY_MS)
+        self.resize_timer.timeout.connect(self._render)
+        self.cache: OrderedDict[ImageKey, QImage] = OrderedDict()
+        self.content: PlotContent | None = None
+        self.content_version = 0
+        self.generation = 0
+
+    def show_plot(self, content: PlotContent) -> None:
+        """Show the content, from the cache if it was already rendered at this size."""
+        self.content = content
+        self.content_version = content.version
+        self._render()
+
+    def save(self, path: Path) -> None:
+        """Render the current plot with the save dpi and write it to the path, emits saved when done."""
+        if self.content is None:
+            self.failed.emit("There is no plot to save yet")
+            return
+        job = RenderJob(
+            self.generation,
+            None,
+            self.content,
+            self.width(),
+            self.height(),
+            SAVE_DPI,
+            save_path=path,
+        )
+        self._start(job)
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    def resizeEvent(self, event: QResizeEvent | None) -> None:
+        super().resizeEvent(event)
+        self.resize_timer.start()
+
+    def _image_key(self, dpi: float) -> ImageKey:
+        assert self.content is not None
+        size = (self.width(), self.height(), dpi)
+        return (self.content.plot_month, self.content.title, self.content_version, self._theme, size)
+
+    @property
+    def _theme(self) -> tuple[str, str]:
+        return (self.colors.background, self.colors.text)
+
+    def _render(self) -> None:
+        if self.content is None:
+            return
+        key = self._image_key(PLOT_DPI * self.devicePixelRatioF())
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            self.generation += 1
+            self._set_image(image)
+            return
+        # a displayed plot not started yet is outdated by this one and skipped by its worker,
+        # the pool is not cleared, it may also hold a save waiting to be done
+        self.generation += 1
+        ratio = self.devicePixelRatioF()
+        job = RenderJob(
+            self.generation,
+            key,
+            self.content,
+            round(self.width() * ratio),
+            round(self.height() * ratio),
+            PLOT_DPI * ratio,
+        )
+        self._start(job)
+
+    def _start(self, job: RenderJob) -> None:
+        worker = RenderWorker(job, self.offscreen_plot, self.is_current)
+        worker.signals.rendered.connect(self._rendered)
+        worker.signals.saved.connect(self.saved.emit)
+        worker.signals.failed.connect(lambda _, message: self.failed.emit(message))
+        self.thread_pool.start(worker)
+
+    def _rendered(self, job: RenderJob, image: QImage) -> None:
+        assert job.key is not None
+        self.cache[job.key] = image
+        self.cache.move_to_end(job.key)
+        while len(self.cache) > IMAGE_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        if self.is_current(job.generation):
+            self._set_image(image)
+
+    def _set_image(self, image: QImage) -> None:
+        self.setPixmap(QPixmap.fromImage(image))
+
+
+def render_image(plot: OffscreenPlot, job: RenderJob) -> QImage:
+    """Render the job into an image, can be used outside of the GUI thread."""
+    rgba = plot.render_rgba(job.content, job.width, job.height, dpi=job.dpi)
+    # figure size is rounded to full pixels by matplotlib
+    width, height = (round(value) for value in plot.figure.bbox.size)
+    image = QImage(rgba, width, height, QImage.Format.Format_RGBA8888).copy()
+    image.setDevicePixelRatio(job.dpi / PLOT_DPI)
+    return image
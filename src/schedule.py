@@ -0,0 +1,93 @@
+"""Effective dated work schedules.
+
+Each schedule is valid from its effective date until the next schedule starts.
+This way, changing the work hours for the future does not rewrite the targets of the past.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.config_handler import Config
+
+if TYPE_CHECKING:
+    from src.models import WorkSchedule
+
+# The first schedule applies to the whole history before any other schedule
+SCHEDULE_START = datetime.date(1900, 1, 1)
+# 1970-01-01 (numpy day zero) was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+@dataclass(frozen=True)
+class ScheduleSegment:
+    effective_from: datetime.date
+    workdays: tuple[int, ...]
+    daily_hours: tuple[float, ...]
+
+    @classmethod
+    def from_config(cls, config: Config, effective_from: datetime.date = SCHEDULE_START) -> ScheduleSegment:
+        """Create a schedule out of the current work time settings of the config."""
+        return cls(effective_from, tuple(sorted(config.workdays)), tuple(config.get_all_daily_hours()))
+
+    @classmethod
+    def from_model(cls, model: WorkSchedule) -> ScheduleSegment:
+        return cls(model.effective_from, tuple(model.get_workdays()), tuple(model.get_daily_hours()))
+
+
+class ScheduleHistory:
+    def __init__(self, segments: list[ScheduleSegment]) -> None:
+        """Lookup table of all schedules, vectorized over arrays of days."""
+        if not segments:
+            raise ValueError("At least one schedule is needed")
+        self.segments = sorted(segments, key=lambda segment: segment.effective_from)
+        self._starts = np.array([segment.effective_from for segment in self.segments], dtype="datetime64[D]")
+        self._hours = np.array([segment.daily_hours for segment in self.segments], dtype=float)
+        self._workdays = np.zeros((len(self.segments), 7), dtype=bool)
+        for i, segment in enumerate(self.segments):
+            self._workdays[i, list(segment.workdays)] = True
+
+    def segment_at(self, day: datetime.date) -> ScheduleSegment:
+        """Return the schedule valid at the given day."""
+        return self.segments[int(self._segment_index(np.array([day], dtype="datetime64[D]"))[0])]
+
+    def daily_hours(self, days: np.ndarray) -> np.ndarray:
+        """Return the target hours for each of the given days."""
+        days = np.asarray(days, dtype="datetime64[D]")
+        return self._hours[self._segment_index(days), _weekday(days)]
+
+    def workday_mask(self, days: np.ndarray) -> np.ndarray:
+        """Return for each of the given days if it is a workday."""
+        days = np.asarray(days, dtype="datetime64[D]")
+        return self._workdays[self._segment_index(days), _weekday(days)]
+
+    def fingerprint(self, start: datetime.date, end: datetime.date) -> int:
+        """Hash of the schedules applying to the given (inclusive) date range.
+
+        Schedules outside the range do not change the fingerprint, so changes for the future keep the past valid.
+        """
+        first, last = self._segment_index(np.array([start, end], dtype="datetime64[D]"))
+        return hash(
+            tuple(
+                (max(segment.effective_from, start), segment.workdays, segment.daily_hours)
+                for segment in self.segments[first : last + 1]
+            )
+        )
+
+    def with_segment(self, segment: ScheduleSegment) -> ScheduleHistory:
+        """Return a new history where the segment replaces all schedules starting at or after its date."""
+        kept = [existing for existing in self.segments if existing.effective_from < segment.effective_from]
+        return ScheduleHistory([*kept, segment])
+
+    def _segment_index(self, days: np.ndarray) -> np.ndarray:
+        # days before the first schedule use the first one
+        return np.clip(np.searchsorted(self._starts, days, side="right") - 1, 0, None)
+
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    """Weekday of numpy days, 0=Monday, 6=Sunday."""
+    return (days.astype(np.int64) + _EPOCH_WEEKDAY) % 7
@@ -0,0 +1,46 @@
+"""Revision of the database schema, read without alembic.
+
+Alembic needs its config, the script directory, env.py and an engine to find out the database is up to date,
+which takes a noticeable time on every start. The revision is read here with sqlite directly and compared
+against the head revision of the shipped migrations, alembic is only used if they differ.
+"""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+# head revision of alembic/versions, needs to be updated with every new migration (checked by a test)
+SCHEMA_HEAD = "9c3e1f2b7a41"
+# first revision, databases without revision but with the tables of the models are at this state
+SCHEMA_BASE = "348acf3ce3c3"
+# reasons to choose from for time off days, stored in the Reason column of the TimeOff table
+TIME_OFF_REASONS = ("Vacation", "Sick Leave", "Personal Day", "Other")
+
+
+def get_schema_revision(database_path: Path) -> str | None:
+    """Return the alembic revision of the database, None if it does not exist or was never migrated."""
+    if not database_path.exists():
+        return None
+    try:
+        with closing(_connect_read_only(database_path)) as connection:
+            row = connection.execute("SELECT version_num FROM alembic_version").fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def get_table_names(database_path: Path) -> set[str]:
+    if not database_path.exists():
+        return set()
+    with closing(_connect_read_only(database_path)) as connection:
+        rows = connection.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+    return {row[0] for row in rows}
+
+
+def is_schema_current(database_path: Path) -> bool:
+    return get_schema_revision(database_path) == SCHEMA_HEAD
+
+
+def _connect_read_only(database_path: Path) -> sqlite3.Connection:
+    # read only, so checking does not create or lock the database
+    return sqlite3.connect(f"{database_path.resolve().as_uri()}?mode=ro", uri=True)
@@ -0,0 +1,125 @@
+"""Access to the app database with the sqlite module of the standard library.
+
+The command line should start fast enough for hotkeys and scripts, importing sqlalchemy alone takes longer than that.
+This covers the few queries the command line needs, using the same tables and storage formats as the
+DatabaseController (and returning the same row formats), so both can work on the same database.
+Each query mirrors the one of the controller, tests/sqlite_database_test.py checks both store and return the same.
+"""
+
+import datetime
+import logging
+import sqlite3
+from pathlib import Path
+
+from src.filepath import DATABASE_PATH
+
+logger = logging.getLogger(__name__)
+
+# storage format of sqlalchemy for DateTime columns in sqlite, the tests compare it with the one of the controller
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+class SqliteDatabase:
+    def __init__(self, database_path: Path = DATABASE_PATH, read_only: bool = False) -> None:
+        """Connect to the (already migrated) database at the given path, read only ones can not be changed."""
+        self.database_path = database_path
+        # increased on every change of the time off days, like the one of the database controller
+        self.time_off_version = 0
+        if read_only:
+            self.connection = sqlite3.connect(f"{database_path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            self.connection = sqlite3.connect(database_path)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add_event(self, event: str, entry_datetime: datetime.datetime) -> None:
+        logger.info("Add Event: %s, timestamp: %s", event, entry_datetime.isoformat())
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO Events (Date, Action) VALUES (?, ?)", (entry_datetime.strftime(DATETIME_FORMAT), event)
+            )
+
+    def add_pause(self, pause_time: int, entry_date: datetime.date) -> None:
+        """Add the pause to the pause of the day."""
+        logger.info("Adding pause time of %s at %s", pause_time, entry_date.isoformat())
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO Pause (Date, Time) VALUES (?, ?) ON CONFLICT (Date) DO UPDATE SET Time = Time + ?",
+                (entry_date.isoformat(), pause_time, pause_time),
+            )
+
+    def get_last_event(self) -> tuple[str, str] | None:
+        row = self.connection.execute("SELECT Date, Action FROM Events ORDER BY Date DESC, ID DESC LIMIT 1").fetchone()
+        return None if row is None else _event_row(row)
+
+    def get_day_data(self, day: datetime.date) -> tuple[list[tuple[str, str]], list[tuple[str, int]]]:
+        return self.get_period_work(day, day + datetime.timedelta(days=1)), self.get_period_pause(day, day)
+
+    def get_month_data(self, search_date: datetime.date) -> tuple[list[tuple[str, str]], list[tuple[str, int]]]:
+        start = search_date.replace(day=1)
+        end = (start + datetime.timedelta(days=31)).replace(day=1)
+        # same bounds as the controller, which also includes the pause of the first day of the next month
+        return self.get_period_work(start, end), self.get_period_pause(start, end)
+
+    def get_period_work(self, start: datetime.date, end: datetime.date) -> list[tuple[str, str]]:
+        """Return the (iso datetime, event) rows from start to (exclusive) end, sorted by time."""
+        rows = self.connection.execute(
+            "SELECT Date, Action FROM Events WHERE Date >= ? AND Date < ? ORDER BY Date",
+            (_datetime_value(start), _datetime_value(end)),
+        ).fetchall()
+        return [_event_row(row) for row in rows]
+
+    def get_period_pause(self, start: datetime.date, end: datetime.date) -> list[tuple[str, int]]:
+        """Return the (iso date, minutes) rows from start to (inclusive) end, sorted by date."""
+        return self.connection.execute(
+            "SELECT Date, Time FROM Pause WHERE Date >= ? AND Date <= ? ORDER BY Date",
+            (start.isoformat(), end.isoformat()),
+        ).fetchall()
+
+    def add_time_off(self, day: datetime.date, reason: str) -> bool:
+        """Add the time off, return False if the day is already time off."""
+        logger.info("Adding Time Off on %s", day.isoformat())
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO TimeOff (Date, Reason) VALUES (?, ?)", (day.isoformat(), reason)
+            )
+        self.time_off_version += 1
+        return cursor.rowcount > 0
+
+    def remove_time_off(self, day: datetime.date) -> bool:
+        """Remove the time off, return False if the day was no time off."""
+        logger.info("Removing Time Off on %s", day.isoformat())
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM TimeOff WHERE Date = ?", (day.isoformat(),))
+        self.time_off_version += 1
+        return cursor.rowcount > 0
+
+    def get_time_off_days(self, year: int) -> list[datetime.date]:
+        rows = self.connection.execute(
+            "SELECT Date FROM TimeOff WHERE Date >= ? AND Date <= ? ORDER BY Date", (f"{year}-01-01", f"{year}-12-31")
+        ).fetchall()
+        return [datetime.date.fromisoformat(date) for (date,) in rows]
+
+    def get_work_schedules(self) -> list[tuple[datetime.date, tuple[int, ...], tuple[float, ...]]]:
+        """Return the (effective from, workdays, daily hours) of all schedules, sorted by date."""
+        rows = self.connection.execute(
+            "SELECT EffectiveFrom, Workdays, DailyHours FROM WorkSchedule ORDER BY EffectiveFrom"
+        ).fetchall()
+        return [
+            (
+                datetime.date.fromisoformat(effective_from),
+                tuple(int(day) for day in workdays.split(",") if day),
+                tuple(float(hours) for hours in daily_hours.split(",")),
+            )
+            for effective_from, workdays, daily_hours in rows
+        ]
+
+
+def _datetime_value(day: datetime.date) -> str:
+    return datetime.datetime.combine(day, datetime.time.min).strftime(DATETIME_FORMAT)
+
+
+def _event_row(row: tuple[str, str]) -> tuple[str, str]:
+    event_time, action = row
+    return datetime.datetime.fromisoformat(event_time).isoformat(), action
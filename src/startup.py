@@ -0,0 +1,114 @@
+"""Preparation of the app folder, logging and database, done before the app (or command line) is imported.
+
+This module does not import Qt, so the command line can use it as well.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.filepath import (
+    ALEMBIC_INI_PATH,
+    ALEMBIC_SCRIPT_PATH,
+    CONFIG_PATH,
+    DATABASE_PATH,
+    LOG_FILE_PATH,
+    OLD_CONFIG_PATH,
+    OLD_DATABASE_PATH,
+    REPORTS_PATH,
+    SAVE_FOLDER,
+)
+from src.schema import SCHEMA_BASE, SCHEMA_HEAD, get_schema_revision, get_table_names
+
+if TYPE_CHECKING:
+    from src.config_handler import Config
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_data_location_and_files() -> None:
+    """Create the app folder if not exists.
+
+    Move the old config and database files to the new location.
+    """
+    # need to create the folder once
+    if not SAVE_FOLDER.exists():
+        SAVE_FOLDER.mkdir(parents=True)
+    if not REPORTS_PATH.exists():
+        REPORTS_PATH.mkdir(parents=True)
+    # move config file
+    if OLD_CONFIG_PATH.exists():
+        logger.debug("Old Config found at %s, moving to new location to %s", OLD_DATABASE_PATH, DATABASE_PATH)
+        OLD_CONFIG_PATH.rename(CONFIG_PATH)
+    # move database file
+    if OLD_DATABASE_PATH.exists():
+        logger.debug("Old Database found at %s, moving to new location to %s", OLD_DATABASE_PATH, DATABASE_PATH)
+        OLD_DATABASE_PATH.rename(DATABASE_PATH)
+
+
+def setup_logging(log_file_path: Path = LOG_FILE_PATH, console: bool = True) -> None:
+    """Log into the log file and the console, without console only errors are printed (to stderr).
+
+    The handlers are set up directly, logging.config alone would take a good part of the command line start.
+    """
+    if not log_file_path.parent.exists():
+        log_file_path.parent.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s | %(name)s | %(message)s", "%Y-%m-%d %H:%M:%S")
+    handlers: list[tuple[logging.Handler, int]] = [
+        (logging.StreamHandler(sys.stderr), logging.ERROR),
+        (logging.FileHandler(log_file_path), logging.DEBUG),
+    ]
+    if console:
+        handlers.insert(0, (logging.StreamHandler(sys.stdout), logging.INFO))
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(logging.INFO)
+    for handler, level in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+
+def run_db_migrations(database_path: Path = DATABASE_PATH, config: Config | None = None) -> None:
+    """Run the alembic migrations to update the database schema.
+
+    Alembic is only loaded if the database is not at the head revision, which is the case for most starts.
+    Migrations seeding data out of the settings use the given config, the one of the app by default.
+    """
+    revision = get_schema_revision(database_path)
+    if revision == SCHEMA_HEAD:
+        return
+    from alembic.config import Config  # noqa: PLC0415
+
+    from alembic import command  # noqa: PLC0415
+
+    logger.info("Migrating the database from revision %s to %s", revision, SCHEMA_HEAD)
+    database_url = f"sqlite:///{database_path}"
+    alembic_cfg = Config(str(ALEMBIC_INI_PATH))
+    alembic_cfg.attributes["configure_logger"] = False
+    alembic_cfg.attributes["database_url"] = database_url
+    if config is not None:
+        alembic_cfg.attributes["app_config"] = config
+    alembic_cfg.set_main_option("script_location", str(ALEMBIC_SCRIPT_PATH))
+    alembic_cfg.set_main_option("sqlalchemy.url", database_url)
+    # new databases (or ones created by the models without migrating) got no tables of the first migration yet,
+    # they are created with the models and then only the later migrations are applied
+    if revision is None and "Vacation" not in get_table_names(database_path):
+        _create_tables(database_url)
+        command.stamp(alembic_cfg, SCHEMA_BASE)
+    command.upgrade(alembic_cfg, "head")
+
+
+def _create_tables(database_url: str) -> None:
+    from sqlalchemy import create_engine  # noqa: PLC0415
+
+    from src.models import Base  # noqa: PLC0415
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
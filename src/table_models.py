@@ -0,0 +1,171 @@
+"""Table model of the data window.
+
+The model only keeps the columns of the shown data and formats a cell when the view requests it.
+On new data of the same view, only the changed rows are announced (dataChanged, rows inserted / removed),
+so the view keeps its selection and scroll position and no cells are created again.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+from PyQt6.QtGui import QFont
+
+HEADER_FONT_SIZE = 14
+# overtime of the years table is shown with sign, like the overtime label
+YEARS_OVERTIME_COLUMN = 2
+
+
+class TableMode(Enum):
+    MONTH = "Month"
+    DAY = "Day"
+    YEARS = "Years"
+
+    @property
+    def next(self) -> TableMode:
+        modes = list(TableMode)
+        return modes[(modes.index(self) + 1) % len(modes)]
+
+
+HEADERS = {
+    TableMode.MONTH: ("Date", "Time (h)"),
+    TableMode.DAY: ("Date / Type", "Event / Pause (min)"),
+    TableMode.YEARS: ("Year", "Work (h)", "Overtime (h)"),
+}
+
+
+@dataclass
+class TableData:
+    """Columns of one table view, all columns have the same length."""
+
+    mode: TableMode
+    columns: tuple[np.ndarray, ...] = field(default_factory=tuple)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    @classmethod
+    def month(cls, df: pd.DataFrame) -> TableData:
+        """Days of the month with the work time."""
+        if df.empty:
+            return cls.empty(TableMode.MONTH)
+        days = np.array(df.index.date, dtype=object)
+        return cls(TableMode.MONTH, (days, df["work"].to_numpy(dtype=float)))
+
+    @classmethod
+    def day(cls, daily_data: list[tuple[str, str]]) -> TableData:
+        """Events of the day, the pause is already formatted as the last entry."""
+        if not daily_data:
+            return cls.empty(TableMode.DAY)
+        times, events = zip(*daily_data, strict=True)
+        return cls(TableMode.DAY, (np.array(times, dtype=object), np.array(events, dtype=object)))
+
+    @classmethod
+    def years(cls, years_df: pd.DataFrame) -> TableData:
+        """Work time and overtime of all years."""
+        if years_df.empty:
+            return cls.empty(TableMode.YEARS)
+        return cls(
+            TableMode.YEARS,
+            (
+                years_df.index.to_numpy(dtype=int),
+                years_df["work"].to_numpy(dtype=float),
+                years_df["overtime"].to_numpy(dtype=float),
+            ),
+        )
+
+    @classmethod
+    def empty(cls, mode: TableMode) -> TableData:
+        return cls(mode, tuple(np.array([], dtype=object) for _ in HEADERS[mode]))
+
+    def changed_rows(self, other: TableData) -> np.ndarray:
+        """Return the rows (within the common length) which differ from the other data of the same mode."""
+        rows = min(len(self), len(other))
+        changed = np.zeros(rows, dtype=bool)
+        for own, others in zip(self.columns, other.columns, strict=True):
+            changed |= own[:rows] != others[:rows]
+        return np.flatnonzero(changed)
+
+
+class DataTableModel(QAbstractTableModel):
+    def __init__(self, parent: QObject | None = None) -> None:
+        """Model for the month, day and years table of the data window."""
+        super().__init__(parent)
+        self.table = TableData.empty(TableMode.MONTH)
+        self.header_font = QFont()
+        self.header_font.setPointSize(HEADER_FONT_SIZE)
+
+    @property
+    def mode(self) -> TableMode:
+        return self.table.mode
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.table)
+
+    def columnCount(self, parent: QModelIndex | None = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return len(HEADERS[self.mode])
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = self.table.columns[index.column()][index.row()]
+        return _format_value(self.mode, index.column(), value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation != Qt.Orientation.Horizontal:
+            return super().headerData(section, orientation, role)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[self.mode][section]
+        if role == Qt.ItemDataRole.FontRole:
+            return self.header_font
+        return None
+
+    def set_table(self, table: TableData) -> None:
+        """Show the new data, only the changed rows are updated if the mode stays the same."""
+        old = self.table
+        if old.mode != table.mode:
+            self.beginResetModel()
+            self.table = table
+            self.endResetModel()
+            return
+        changed = table.changed_rows(old)
+        if len(table) < len(old):
+            self.beginRemoveRows(QModelIndex(), len(table), len(old) - 1)
+            self.table = table
+            self.endRemoveRows()
+        elif len(table) > len(old):
+            self.beginInsertRows(QModelIndex(), len(old), len(table) - 1)
+            self.table = table
+            self.endInsertRows()
+        else:
+            self.table = table
+        if len(changed):
+            first = self.index(int(changed[0]), 0)
+            last = self.index(int(changed[-1]), self.columnCount() - 1)
+            self.dataChanged.emit(first, last, [Qt.ItemDataRole.DisplayRole])
+
+    def row_values(self, row: int) -> tuple[Any, ...]:
+        """Return the raw values of the row, e.g. the date of a month row."""
+        return tuple(column[row] for column in self.table.columns)
+
+
+def _format_value(mode: TableMode, column: int, value: Any) -> str:
+    if isinstance(value, datetime.date):
+        return value.strftime("%d/%m/%Y")
+    if mode == TableMode.MONTH:
+        return str(round(float(value), 1))
+    if mode == TableMode.YEARS and column == YEARS_OVERTIME_COLUMN:
+        return f"{float(value):+.1f}"
+    if mode == TableMode.YEARS and column > 0:
+        return f"{float(value):.1f}"
+    return str(value)
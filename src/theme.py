@@ -0,0 +1,72 @@
+"""Light / dark theme of the app, following the OS.
+
+Querying the OS theme is slow on some systems (e.g. a subprocess on linux), so it is only done once.
+It is queried again when the OS color scheme (or palette on older Qt versions) changes,
+the changed signal is only emitted if the theme really switched.
+"""
+
+from __future__ import annotations
+
+import darkdetect
+from PyQt6.QtCore import QEvent, QObject, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+
+class ThemeService(QObject):
+    changed = pyqtSignal()
+
+    def __init__(self) -> None:
+        """Cache of the OS theme, the theme is queried on first use."""
+        super().__init__()
+        self._is_light: bool | None = None
+        self.version = 0
+
+    @property
+    def is_light(self) -> bool:
+        if self._is_light is None:
+            self._is_light = _query_is_light()
+        return self._is_light
+
+    @property
+    def style_name(self) -> str:
+        return "light" if self.is_light else "dark"
+
+    @property
+    def background_color(self) -> str:
+        return "#f8f9fa" if self.is_light else "#202124"
+
+    @property
+    def font_color(self) -> str:
+        return "#4d5157" if self.is_light else "#e4e7eb"
+
+    def refresh(self) -> bool:
+        """Query the OS theme again, return if it changed."""
+        was_light = self._is_light
+        self._is_light = _query_is_light()
+        if was_light is None or was_light == self._is_light:
+            return False
+        self.version += 1
+        self.changed.emit()
+        return True
+
+    def watch(self, app: QGuiApplication) -> None:
+        """Refresh the theme when the OS changes it."""
+        style_hints = app.styleHints()
+        # the color scheme signal is only available since Qt 6.5, before only the palette change event is sent
+        if style_hints is not None and hasattr(style_hints, "colorSchemeChanged"):
+            style_hints.colorSchemeChanged.connect(lambda _: self.refresh())
+        else:
+            app.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject | None, event: QEvent | None) -> bool:
+        if event is not None and event.type() == QEvent.Type.ApplicationPaletteChange:
+            self.refresh()
+        return super().eventFilter(watched, event)
+
+
+def _query_is_light() -> bool:
+    # darkdetect returns None if the theme cannot be detected, which was always treated as dark
+    return bool(darkdetect.isLight())
+
+
+THEME = ThemeService()
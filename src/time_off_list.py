@@ -0,0 +1,280 @@
+"""Time off list of the vacation window.
+
+The time off days are cached per year, so switching the year only queries the database once per year.
+Changes done through the cache are applied to it directly, changes from anywhere else are noticed by the
+time off version of the database controller and drop the cache.
+The list itself is a model / view list, the delegate paints date, reason and delete button of each row,
+only the reason editor (combo box) is created as a widget while editing.
+"""
+
+from __future__ import annotations
+
+import datetime
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from PyQt6.QtCore import (
+    QAbstractItemModel,
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    QRect,
+    QSize,
+    Qt,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QIcon, QMouseEvent, QPainter
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QComboBox,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionComboBox,
+    QStyleOptionViewItem,
+    QWidget,
+)
+
+from src.database_controller import DB_CONTROLLER
+
+ROW_HEIGHT = 36
+REASON_WIDTH = 160
+DELETE_WIDTH = 30
+SPACING = 6
+DELETE_COLOR = "red"
+REASON_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+@dataclass(frozen=True)
+class TimeOffEntry:
+    date: datetime.date
+    reason: str
+
+    @property
+    def label(self) -> str:
+        """Return the date as shown in the list, e.g. '05-02 | May 2nd'."""
+        day = self.date.day
+        # choose the correct suffix for the day
+        no_special_suffix = 4 <= day <= 20 or 24 <= day <= 30  # noqa: PLR2004
+        suffix = "th" if no_special_suffix else ["st", "nd", "rd"][day % 10 - 1]
+        return f"{self.date.strftime('%m-%d | %B')} {day}{suffix}"
+
+
+class TimeOffCache:
+    def __init__(self) -> None:
+        """Time off entries per year, the newest entry first."""
+        self.years: dict[int, list[TimeOffEntry]] = {}
+        self.version = DB_CONTROLLER.time_off_version
+
+    def get_year(self, year: int) -> list[TimeOffEntry]:
+        self._sync()
+        if year not in self.years:
+            entries = [TimeOffEntry(time_off.date, time_off.reason) for time_off in DB_CONTROLLER.get_time_off(year)]
+            self.years[year] = _sorted(entries)
+        return list(self.years[year])
+
+    def add(self, day: datetime.date, reason: str) -> None:
+        """Add the time off, an existing entry of this day gets the new reason."""
+        # the database keeps an existing day as it is, so only its reason is changed
+        if any(entry.date == day for entry in self.get_year(day.year)):
+            self.change_reason(day, reason)
+            return
+        DB_CONTROLLER.add_time_off(day, reason)
+        self._own_change(day.year, lambda entries: [*_without(entries, day), TimeOffEntry(day, reason)])
+
+    def remove(self, day: datetime.date) -> None:
+        DB_CONTROLLER.remove_time_off(day)
+        self._own_change(day.year, lambda entries: _without(entries, day))
+
+    def change_reason(self, day: datetime.date, reason: str) -> None:
+        # the reason does not change any computation, so the database does not change the version
+        DB_CONTROLLER.change_time_off_reason(day, reason)
+        if day.year in self.years:
+            self.years[day.year] = [
+                TimeOffEntry(entry.date, reason) if entry.date == day else entry for entry in self.years[day.year]
+            ]
+
+    def _own_change(self, year: int, change: Callable[[list[TimeOffEntry]], list[TimeOffEntry]]) -> None:
+        """Apply the change to the cached year, if the version only changed by this single change."""
+        if DB_CONTROLLER.time_off_version != self.version + 1:
+            self.years.clear()
+        self.version = DB_CONTROLLER.time_off_version
+        if year in self.years:
+            self.years[year] = _sorted(change(self.years[year]))
+
+    def _sync(self) -> None:
+        if DB_CONTROLLER.time_off_version != self.version:
+            self.years.clear()
+            self.version = DB_CONTROLLER.time_off_version
+
+
+def _sorted(entries: list[TimeOffEntry]) -> list[TimeOffEntry]:
+    return sorted(entries, key=lambda entry: entry.date, reverse=True)
+
+
+def _without(entries: list[TimeOffEntry], day: datetime.date) -> list[TimeOffEntry]:
+    return [entry for entry in entries if entry.date != day]
+
+
+class TimeOffListModel(QAbstractListModel):
+    def __init__(self, cache: TimeOffCache, parent: QObject | None = None) -> None:
+        """List of the time off days of one year."""
+        super().__init__(parent)
+        self.cache = cache
+        self.year = datetime.date.today().year
+        self.entries: list[TimeOffEntry] = []
+
+    def set_year(self, year: int) -> None:
+        self.beginResetModel()
+        self.year = year
+        self.entries = self.cache.get_year(year)
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.entries)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.label
+        if role in (Qt.ItemDataRole.EditRole, REASON_ROLE):
+            return entry.reason
+        if role == Qt.ItemDataRole.UserRole:
+            return entry.date
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        entry = self.entries[index.row()]
+        if value == entry.reason:
+            return False
+        self.cache.change_reason(entry.date, value)
+        self.entries[index.row()] = TimeOffEntry(entry.date, value)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.EditRole, REASON_ROLE])
+        return True
+
+    def add_entry(self, day: datetime.date, reason: str) -> None:
+        self.cache.add(day, reason)
+        if day.year == self.year:
+            self.set_year(self.year)
+
+    def remove_entry(self, row: int) -> None:
+        entry = self.entries[row]
+        self.cache.remove(entry.date)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.entries[row]
+        self.endRemoveRows()
+
+
+class TimeOffDelegate(QStyledItemDelegate):
+    delete_requested = pyqtSignal(QPersistentModelIndex)
+
+    def __init__(self, reasons: list[str], delete_icon: QIcon, parent: QObject | None = None) -> None:
+        """Paint the rows of the time off list, the reason combo box is only created while editing."""
+        super().__init__(parent)
+        self.reasons = reasons
+        self.delete_icon = delete_icon
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        size = super().sizeHint(option, index)
+        return QSize(size.width() + REASON_WIDTH + DELETE_WIDTH + 2 * SPACING, max(size.height(), ROW_HEIGHT))
+
+    def paint(self, painter: QPainter | None, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        if painter is None:
+            return
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        if style is None:
+            return
+        text_rect, reason_rect, delete_rect = _row_rects(option.rect)
+        painter.save()
+        font = painter.font()
+        font.setPixelSize(16)
+        painter.setFont(font)
+        painter.setPen(option.palette.text().color())
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, index.data())
+        painter.restore()
+
+        combo_option = QStyleOptionComboBox()
+        combo_option.rect = reason_rect
+        combo_option.palette = option.palette
+        combo_option.state = QStyle.StateFlag.State_Enabled
+        combo_option.currentText = index.data(REASON_ROLE)
+        style.drawComplexControl(QStyle.ComplexControl.CC_ComboBox, combo_option, painter, widget)
+        style.drawControl(QStyle.ControlElement.CE_ComboBoxLabel, combo_option, painter, widget)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QColor(DELETE_COLOR))
+        painter.setBrush(QColor(DELETE_COLOR))
+        painter.drawRoundedRect(delete_rect, 5, 5)
+        painter.restore()
+        self.delete_icon.paint(painter, delete_rect.adjusted(5, 5, -5, -5))
+
+    def editorEvent(
+        self,
+        event: QEvent | None,
+        model: QAbstractItemModel | None,
+        option: QStyleOptionViewItem,
+        index: QModelIndex,
+    ) -> bool:
+        if not isinstance(event, QMouseEvent) or event.type() != QEvent.Type.MouseButtonRelease:
+            return super().editorEvent(event, model, option, index)
+        _, reason_rect, delete_rect = _row_rects(option.rect)
+        position = event.position().toPoint()
+        if delete_rect.contains(position):
+            self.delete_requested.emit(QPersistentModelIndex(index))
+            return True
+        if reason_rect.contains(position) and isinstance(option.widget, QAbstractItemView):
+            option.widget.edit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def createEditor(self, parent: QWidget | None, option: QStyleOptionViewItem, index: QModelIndex) -> QWidget:
+        editor = QComboBox(parent)
+        editor.addItems(self.reasons)
+        # the change is applied as soon as a reason is chosen, like the combo box of each row before
+        editor.activated.connect(lambda _: self._commit(editor))
+        QTimer.singleShot(0, editor.showPopup)
+        return editor
+
+    def setEditorData(self, editor: QWidget | None, index: QModelIndex) -> None:
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(index.data(REASON_ROLE))
+
+    def setModelData(self, editor: QWidget | None, model: QAbstractItemModel | None, index: QModelIndex) -> None:
+        if isinstance(editor, QComboBox) and model is not None:
+            model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor: QWidget | None, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        if editor is not None:
+            editor.setGeometry(_row_rects(option.rect)[1])
+
+    def _commit(self, editor: QComboBox) -> None:
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QStyledItemDelegate.EndEditHint.NoHint)
+
+
+def _row_rects(rect: QRect) -> tuple[QRect, QRect, QRect]:
+    """Return the rectangles of the date text, reason and delete button within the row."""
+    delete_rect = QRect(rect.right() - DELETE_WIDTH - SPACING, rect.top() + 3, DELETE_WIDTH, rect.height() - 6)
+    reason_rect = QRect(delete_rect.left() - REASON_WIDTH - SPACING, rect.top() + 3, REASON_WIDTH, rect.height() - 6)
+    text_rect = QRect(rect.left() + SPACING, rect.top(), reason_rect.left() - rect.left() - 2 * SPACING, rect.height())
+    return text_rect, reason_rect, delete_rect
+
+
+TIME_OFF_CACHE = TimeOffCache()
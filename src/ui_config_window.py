@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-import holidays
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QDoubleSpinBox, QRadioButton, QWidget
+from PyQt6.QtCore import QDate, QObject, QSortFilterProxyModel, QStringListModel, Qt
+from PyQt6.QtWidgets import QComboBox, QDoubleSpinBox, QRadioButton, QWidget
 
 from src.config_handler import CONFIG_HANDLER
+from src.holiday_catalog import get_country_catalog
 from src.icons import get_app_icon
 from ui import Ui_ConfigWindow
 
@@ -28,8 +28,16 @@ class ConfigWindow(QWidget, Ui_ConfigWindow):
             | Qt.WindowType.WindowCloseButtonHint
         )
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
-        self.country_list = holidays.list_supported_countries()
-        self._update_country_list()
+        # the combo boxes show all entries of the models, filtering is done by the proxies
+        self.country_list = get_country_catalog()
+        self.country_model = QStringListModel(list(self.country_list), self)
+        self.country_proxy = _filter_proxy(self.country_model, self)
+        self.input_country.setModel(self.country_proxy)
+        self.subdiv_model = QStringListModel(self)
+        self.subdiv_proxy = _filter_proxy(self.subdiv_model, self)
+        self.input_subdiv.setModel(self.subdiv_proxy)
+        # the combo box selects its first entry on model change, so the config country is given explicitly
+        self._update_country_list(CONFIG_HANDLER.config.country)
         self.apply_button.clicked.connect(self.apply_config)
         self.filter_subdiv.textEdited.connect(self._apply_subdiv_filter)
         self.filter_country.textEdited.connect(self._apply_country_filter)
@@ -70,29 +78,20 @@ class ConfigWindow(QWidget, Ui_ConfigWindow):
             country = self.input_country.currentText()
         elif country is None:
             country = CONFIG_HANDLER.config.country
-        subdiv_list = self.country_list.get(country, [])
-        country_list = list(self.country_list.keys())
-        # if there is a filter, apply it
-        country_filter = self.filter_country.text()
-        if country_filter:
-            country_list = [c for c in country_list if country_filter.lower() in c.lower()]
-        self.input_country.clear()
-        self.input_country.addItems(country_list)
-        self.input_country.setCurrentText(country)
-
         # clear filter, choose new subdiv
         self.filter_country.clear()
-        self.input_subdiv.clear()
-        self.input_subdiv.addItems(subdiv_list)
-        self.input_subdiv.setCurrentText(CONFIG_HANDLER.config.subdiv or "")
+        self.country_proxy.setFilterFixedString("")
+        self.input_country.setCurrentText(country)
         self.filter_subdiv.clear()
+        self.subdiv_proxy.setFilterFixedString("")
+        self.subdiv_model.setStringList(self.country_list.get(country, []))
+        self.input_subdiv.setCurrentText(CONFIG_HANDLER.config.subdiv or "")
 
     def _adjust_subdiv(self) -> None:
         """Triggered when the country selection changes."""
         country = self.input_country.currentText()
         subdiv_list = self.country_list.get(country, [])
-        self.input_subdiv.clear()
-        self.input_subdiv.addItems(subdiv_list)
+        self.subdiv_model.setStringList(subdiv_list)
         if CONFIG_HANDLER.config.subdiv not in subdiv_list:
             return
         self.input_subdiv.setCurrentText(CONFIG_HANDLER.config.subdiv)
@@ -107,6 +106,7 @@ class ConfigWindow(QWidget, Ui_ConfigWindow):
             radio: QRadioButton = getattr(self, f"radio_weekday_{day}")
             radio.setChecked(True)
         self.input_different_times.setChecked(CONFIG_HANDLER.config.different_workdays)
+        self.input_valid_from.setDate(QDate.currentDate())
         for i, time in enumerate(CONFIG_HANDLER.config.time_per_day):
             input_box: QDoubleSpinBox = getattr(self, f"input_hours_day_{i}")
             input_box.setValue(time)
@@ -131,31 +131,40 @@ class ConfigWindow(QWidget, Ui_ConfigWindow):
             CONFIG_HANDLER.config.time_per_day = tuple(getattr(self, f"input_hours_day_{i}").value() for i in range(7))
 
         CONFIG_HANDLER.write_config_file()
+        # the store computes all data on import, so opening the window does not load it, only applying
+        from src.datastore import store  # noqa: PLC0415
+
+        # wait for a running computation of the data window, before changing the caches
+        with store.lock:
+            # changed work times only apply from the selected date on, past months keep their targets
+            store.change_work_schedule(self.input_valid_from.date().toPyDate())
+            # only the config dependent values need to be recomputed, the cached base data stays valid
+            store.apply_config_change()
         self.main_window.update_data_window()
         self.close()
 
     def _apply_subdiv_filter(self) -> None:
-        """Apply the filter to the subdiv list and update the list."""
-        country = self.input_country.currentText()
-        subdiv_list = self.country_list.get(country, [])
-        filter_text = self.filter_subdiv.text()
+        """Apply the filter to the subdiv list, keep the selection if it still matches."""
         current_subdiv = self.input_subdiv.currentText()
-        if filter_text:
-            subdiv_list = [s for s in subdiv_list if filter_text.lower() in s.lower()]
-        self.input_subdiv.clear()
-        self.input_subdiv.addItems(subdiv_list)
-        if current_subdiv in subdiv_list:
-            self.input_subdiv.setCurrentText(current_subdiv)
+        self.subdiv_proxy.setFilterFixedString(self.filter_subdiv.text())
+        _select_text_or_first(self.input_subdiv, current_subdiv)
 
     def _apply_country_filter(self) -> None:
-        """Apply the filter to the country list and update the list."""
-        country_list = list(self.country_list.keys())
-        filter_text = self.filter_country.text()
+        """Apply the filter to the country list, keep the selection if it still matches.
+
+        If the selected country is filtered out, the subdivs are adjusted by the changed country selection.
+        """
         current_country = self.input_country.currentText()
-        if filter_text:
-            country_list = [c for c in country_list if filter_text.lower() in c.lower()]
-        self.input_country.clear()
-        self.input_country.addItems(country_list)
-        if current_country in country_list:
-            self.input_country.setCurrentText(current_country)
-        self._adjust_subdiv()
+        self.country_proxy.setFilterFixedString(self.filter_country.text())
+        _select_text_or_first(self.input_country, current_country)
+
+
+def _select_text_or_first(combo_box: QComboBox, text: str) -> None:
+    combo_box.setCurrentIndex(max(combo_box.findText(text), 0))
+
+
+def _filter_proxy(model: QStringListModel, parent: QObject) -> QSortFilterProxyModel:
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(model)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
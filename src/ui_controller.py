@@ -1,15 +1,11 @@
 import sys
-from collections.abc import Sequence
 
 from PyQt6.QtWidgets import (
     QDialog,
     QFileDialog,
     QInputDialog,
-    QLayout,
     QMessageBox,
     QSystemTrayIcon,
-    QTableWidget,
-    QTableWidgetItem,
     QWidget,
 )
 
@@ -86,24 +82,6 @@ class UiController:
             return dialog.selectedFiles()[0]
         return ""
 
-    def fill_table(self, table: QTableWidget, entry: Sequence) -> None:
-        row_position = table.rowCount()
-        table.insertRow(row_position)
-        for i, data in enumerate(entry):
-            table.setItem(row_position, i, QTableWidgetItem(data))
-
-    def clear_table(self, table: QTableWidget) -> None:
-        while table.rowCount() > 0:
-            table.removeRow(0)
-
-    def set_header_names(self, table: QTableWidget, name1: str, name2: str) -> None:
-        header_1 = table.horizontalHeaderItem(0)
-        if header_1 is not None:
-            header_1.setText(name1)
-        header_2 = table.horizontalHeaderItem(1)
-        if header_2 is not None:
-            header_2.setText(name2)
-
     def get_save_folder(self) -> None:
         user_path = CONFIG_HANDLER.config.save_path
         returned_path = self.get_folder(user_path)
@@ -111,18 +89,5 @@ class UiController:
             CONFIG_HANDLER.config.save_path = returned_path
         CONFIG_HANDLER.write_config_file()
 
-    def delete_items_of_layout(self, layout: QLayout | None = None) -> None:
-        """Recursively delete all items of the given layout."""
-        if layout is not None:
-            while layout.count():
-                item = layout.takeAt(0)
-                if item is None:
-                    continue
-                widget = item.widget()
-                if widget is not None:
-                    widget.setParent(None)  # type: ignore
-                else:
-                    self.delete_items_of_layout(item.layout())
-
 
 UI_CONTROLLER = UiController()
@@ -1,30 +1,25 @@
 from __future__ import annotations
 
-import calendar
 import datetime
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
-import pandas as pd
-import seaborn as sns
-from matplotlib.axes import Axes
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.gridspec import GridSpec
-from matplotlib.ticker import FuncFormatter
-from PyQt6.QtCore import QDate, QDateTime, Qt
-from PyQt6.QtWidgets import QTableWidgetItem, QWidget
+from PyQt6.QtCore import QDate, QDateTime, QModelIndex, Qt
+from PyQt6.QtWidgets import QWidget
 
 from src.config_handler import CONFIG_HANDLER
 from src.data_exporter import EXPORTER
+from src.data_worker import DataResult, RefreshScheduler
 from src.database_controller import DB_CONTROLLER
-from src.datastore import store
 from src.filepath import REPORTS_PATH
 from src.icons import get_app_icon
+from src.plot_renderer import PlotColors, PlotContent
+from src.plot_worker import PlotView
+from src.table_models import DataTableModel, TableData, TableMode
 from src.ui_controller import UI_CONTROLLER as UIC
-from src.utils import get_background_color, get_font_color
 from ui import Ui_DataWindow
 
 if TYPE_CHECKING:
@@ -40,17 +35,6 @@ class EventData:
     event: str
 
 
-@dataclass
-class PlotColors:
-    red: str = "#ff4e26"
-    green: str = "#25cf5e"
-    blue: str = "#2693ff"
-    light_blue: str = "#7db8ff"
-    purple: str = "#a26eff"
-    background: str = field(default_factory=get_background_color)
-    text: str = field(default_factory=get_font_color)
-
-
 class DataWindow(QWidget, Ui_DataWindow):
     def __init__(self, main_window: MainWindow) -> None:
         """Init the Data Window. Connect all the signals and slots."""
@@ -68,9 +52,11 @@ class DataWindow(QWidget, Ui_DataWindow):
         self.date_edit.setDateTime(QDateTime.currentDateTime())
         self.colors = PlotColors()
         _set_plot_parameters(self.colors)
-        self.figure = plt.figure(figsize=(13, 8), dpi=128, tight_layout=True)
-        self.canvas = FigureCanvas(self.figure)
-        self.container.addWidget(self.canvas)
+        # the plot is rendered off-screen in the background, the view only shows the image
+        self.plot_view = PlotView(self.colors, self)
+        self.plot_view.saved.connect(lambda path: UIC.show_message(f"Plot saved to {path}"))
+        self.plot_view.failed.connect(lambda message: UIC.show_message(f"Could not render the plot: {message}"))
+        self.container.addWidget(self.plot_view)
 
         # keep track of prev date to only update the plot on month change
         self.prev_date = self.date_edit.date()
@@ -84,16 +70,25 @@ class DataWindow(QWidget, Ui_DataWindow):
         self.button_month_prev.clicked.connect(lambda: self.change_month(-1))
         self.button_month_next.clicked.connect(lambda: self.change_month(1))
 
+        # the table only shows the columns of the latest result, cells are formatted on demand
+        self.table_model = DataTableModel(self)
+        self.table_view.setModel(self.table_model)
+        self.table_mode = TableMode.MONTH
+        self.delete_event_button.hide()
         # set the date to the selected date if click on table
-        self.tableWidget.itemClicked.connect(self.on_item_click)
+        self.table_view.clicked.connect(self.on_item_click)
 
         self.delete_button = None
         # workaround to prevent the date change to trigger the plot
         self.programmatic_change = False
 
-    @property
-    def view_day(self) -> bool:
-        return self.switch_button.isChecked()
+        # data is computed in the background, table, plot and label are all filled from the same result
+        self.refresh_scheduler = RefreshScheduler(lambda: (self.selected_date, self.plot_month), self)
+        self.refresh_scheduler.finished.connect(self.apply_data)
+        self.refresh_scheduler.failed.connect(
+            lambda message: UIC.show_message(f"Could not compute the data: {message}")
+        )
+        self.data: DataResult | None = None
 
     @property
     def selected_date(self) -> datetime.date:
@@ -109,13 +104,10 @@ class DataWindow(QWidget, Ui_DataWindow):
         self.prev_date = self.date_edit.date()
         if self.programmatic_change:
             return
-        store.current_date = self.selected_date
-        self.update_table_data()
         # do not change plot on day change
         month_changed = prev_date.month() != self.date_edit.date().month()
         year_changed = prev_date.year() != self.date_edit.date().year()
-        if (month_changed and self.plot_month) or year_changed:
-            self.plot()
+        self.refresh_scheduler.request(plot=(month_changed and self.plot_month) or year_changed, table=True)
 
     def _only_change_date(self, set_date: QDate | datetime.date) -> None:
         """Change date while suppressing the on change event of the date edit."""
@@ -123,148 +115,35 @@ class DataWindow(QWidget, Ui_DataWindow):
         self.date_edit.setDate(set_date)
         self.programmatic_change = False
 
+    def refresh(self) -> None:
+        """Refresh plot and table with one computation."""
+        self.refresh_scheduler.request(plot=True, table=True)
+
+    def apply_data(self, result: DataResult) -> None:
+        """Show the computed data of the latest request."""
+        self.data = result
+        if result.request.plot:
+            self._draw_plot(result)
+        if result.request.table:
+            self._fill_table(result)
+
     def plot(self) -> None:
-        # clears the old values and then adds a subplot to insert all the data
-        self.figure.clear()
-        # Top: small plot with only the overtime
-        # Bottom: main plot with the data
-        gs = GridSpec(2, 1, height_ratios=[1, 4])
-        ax1 = self.figure.add_subplot(gs[1])
-        ax2 = self.figure.add_subplot(gs[0], sharex=ax1)
-
-        # update the store before plotting
-        store.update_data(self.selected_date)
+        self.refresh_scheduler.request(plot=True, table=False)
+
+    def _draw_plot(self, result: DataResult) -> None:
         # get the store date -> this is needed to show the correct month in the dropdown
         # if the user did not change it there before
-        self._only_change_date(store.current_date)
+        self._only_change_date(result.current_date)
 
-        df = store.df.copy() if self.plot_month else store.get_year_data(store.current_date.year)
-        plot_df = self.adjust_df_for_plot(df)
-        self._plot_work_time(ax1, plot_df)
-        self._plot_overtime(ax2, plot_df)
-
-        if self.plot_month:
-            title = f"Working time for {store.current_date.strftime('%B %Y')}"
+        plot_df = result.plot_df
+        if result.request.plot_month:
+            title = f"Working time for {result.current_date.strftime('%B %Y')}"
         else:
-            title = f"Working time for {store.current_date.year}"
+            title = f"Working time for {result.current_date.year}"
         sum_overtime = plot_df.overtime.sum()
         sum_work = plot_df.work.sum()
         title += f" | Work: {sum_work:.0f} h | Overtime: {sum_overtime:.0f} h"
-        self.figure.suptitle(title, weight="bold", fontsize=15)
-        # self.figure.autofmt_xdate(rotation=90)
-        self.canvas.draw()
-
-    def _plot_work_time(self, ax: Axes, df: pd.DataFrame) -> None:
-        sns.barplot(
-            data=df,
-            x=df.index,
-            y="work",
-            # color=self.colors.blue,
-            ax=ax,
-            zorder=2,
-            width=0.8,
-            hue=df["is_free_day"],
-            palette={True: self.colors.purple, False: self.colors.blue},
-            legend=False,
-        )
-
-        ax.yaxis.grid(True, lw=1, ls=":", color=self.colors.text, alpha=0.2, zorder=1)
-        ax.xaxis.get_label().set_visible(False)
-
-        if self.plot_month:
-            tick_labels = [day.strftime("%a %d") for day in df.index]
-            rotation = "vertical"
-        else:
-            tick_labels = [month.strftime("%b") for month in df.index]
-            rotation = "horizontal"
-        ax.set_xticks(range(len(tick_labels)))
-        ax.set_xticklabels(tick_labels, rotation=rotation)
-        ax.tick_params(axis="x", which="both", bottom=False, top=False)
-        ax.set_ylabel("Work Time (h)")
-
-        # Add numbers above the bars
-        max_value = df.work.max()
-        for i, (_, row) in enumerate(df.iterrows()):
-            total_time = row["work"]
-            if total_time <= 0.0:
-                continue
-            position = (i, total_time + max_value * 0.012)
-            ax.annotate(
-                f"{total_time:.1f}",
-                position,
-                ha="center",
-                va="bottom",
-                fontsize=8,
-                weight="bold",
-                bbox={
-                    "boxstyle": "round,pad=0.0",
-                    "fc": self.colors.background,
-                    "ec": self.colors.background,
-                    "alpha": 0.8,
-                },
-                zorder=5,
-            )
-            target = row["target_time"]
-            bar_width = 0.9
-            x_start = i - bar_width / 2
-            x_end = i + bar_width / 2
-            ax.hlines(target, x_start, x_end, color=self.colors.text, lw=1, ls="--", zorder=3)
-
-    def _plot_overtime(self, ax: Axes, df: pd.DataFrame) -> None:
-        sns.barplot(
-            data=df,
-            x=df.index,
-            y="overtime",
-            hue="color",
-            palette={"positive": self.colors.green, "negative": self.colors.red},
-            ax=ax,
-            zorder=2,
-            legend=False,
-        )
-
-        add_max = df.overtime.max() * 0.01
-        # Min value needs more shift because of other va behavior
-        add_min = df.overtime.min() * 0.05
-        for i, (_, row) in enumerate(df.iterrows()):
-            overtime = row["overtime"]
-            if overtime == 0.0:
-                continue
-            add_value = add_max if overtime > 0 else add_min
-            va = "bottom" if overtime >= 0 else "top"
-            position = (i, overtime + add_value)
-            ax.annotate(f"{abs(overtime):.1f}", position, ha="center", va=va, fontsize=6, weight="bold", zorder=5)
-
-        ax.tick_params(axis="x", which="both", bottom=False, top=False, labelbottom=False)
-        ax.xaxis.get_label().set_visible(False)
-        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{int(x)}"))
-        ax.spines["bottom"].set_position(("data", 0))
-        ax.set_ylabel("Overtime (h)")
-
-    def adjust_df_for_plot(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Adjust the dataframe for plotting."""
-        if df.empty:
-            df = self._create_dummy_df()
-        df["color"] = df["overtime"].apply(lambda x: "positive" if x >= 0 else "negative")
-        if self.plot_month:
-            free_days = store.get_free_days(self.selected_date.year)
-            df["is_free_day"] = df.index.to_series().apply(lambda x: x.date() in free_days)
-        else:
-            df["is_free_day"] = False
-        to_keep = ["work", "overtime", "color", "target_time", "is_free_day"]
-        return df[to_keep]
-
-    def _create_dummy_df(self) -> pd.DataFrame:
-        """Create a dummy dataframe if no data is available."""
-        date = store.current_date
-        if self.plot_month:
-            data_points = calendar.monthrange(date.year, date.month)[1]
-            index = pd.date_range(start=date.replace(day=1), periods=data_points, freq="D")
-        else:
-            data_points = 12
-            index = pd.date_range(start=date.replace(month=1, day=1), periods=data_points, freq="ME")
-        zeros = [0] * data_points
-        data = {"work": zeros, "pause": zeros, "overtime": zeros, "target_time": zeros}
-        return pd.DataFrame(data, index=index)
+        self.plot_view.show_plot(PlotContent(plot_df, result.request.plot_month, title))
 
     def save_plot(self) -> None:
         """Save the plot as png."""
@@ -273,10 +152,9 @@ class DataWindow(QWidget, Ui_DataWindow):
         if CONFIG_HANDLER.config.save_path:
             folder = Path(CONFIG_HANDLER.config.save_path)
         # Generate Month or Year name for the file
-        if self.plot_month:
-            name = f"{store.current_date.strftime('%Y_%m')}_plot.png"
-        else:
-            name = f"{store.current_date.strftime('%Y')}_plot.png"
+        plot_date = self.data.current_date if self.data is not None else self.selected_date
+        date_format = "%Y_%m" if self.plot_month else "%Y"
+        name = f"{plot_date.strftime(date_format)}_plot.png"
         file_name = folder / name
 
         # check if the file already exists, if so, add a suffix until the file is unique
@@ -288,53 +166,48 @@ class DataWindow(QWidget, Ui_DataWindow):
             save_file_name = folder / f"{file_name.stem}_{suffix}{file_name.suffix}"
             suffix += 1
 
-        self.figure.savefig(save_file_name, transparent=False, dpi=300)
-        UIC.show_message(f"Plot saved to {save_file_name}")
+        # rendered and written in the background, the view shows a message when done
+        self.plot_view.save(save_file_name)
 
     # Data Things
     def update_table_data(self) -> None:
-        UIC.clear_table(self.tableWidget)
-        store.update_data(self.selected_date)
-        if self.view_day:
-            self.fill_daily_data()
-        else:
-            self.fill_monthly_data()
-        prefix = "+" if store.total_overtime >= 0 else ""
-        current_year = self.selected_date.year
-        overtime_year = store.overtime_by_year.get(current_year, 0)
+        self.refresh_scheduler.request(plot=False, table=True)
+
+    def _fill_table(self, result: DataResult) -> None:
+        self._show_table()
+        prefix = "+" if result.total_overtime >= 0 else ""
+        current_year = result.request.selected_date.year
+        overtime_year = result.overtime_by_year.get(current_year, 0)
         prefix_year = "+" if overtime_year >= 0 else ""
         self.label_overtime.setText(
-            f"Overtime: {prefix}{store.total_overtime:.0f} h ({current_year}: {prefix_year}{overtime_year:.0f} h) "
+            f"Overtime: {prefix}{result.total_overtime:.0f} h ({current_year}: {prefix_year}{overtime_year:.0f} h) "
         )
 
     def export_data(self) -> None:
+        # export what is shown, the store may already be updated for another month in the background
+        if self.data is None:
+            return
         if not UIC.ask_for_report_generation():
             return
-        message = EXPORTER.export_data(store.df, self.selected_date)
+        message = EXPORTER.export_data(self.data.df, self.data.current_date, self.data.days_off)
         UIC.show_message(message)
 
     def switch_data_view(self) -> None:
-        if self.view_day:
-            self.fill_daily_data()
-            self.switch_button.setText("Day")
-            self.delete_event_button.show()
-            return
-        self.fill_monthly_data()
-        self.switch_button.setText("Month")
-        self.delete_event_button.hide()
-
-    def fill_monthly_data(self) -> None:
-        UIC.clear_table(self.tableWidget)
-        UIC.set_header_names(self.tableWidget, "Date", "Time (h)")
-        for index, entry in store.df.iterrows():
-            needed_data = [index.strftime("%d/%m/%Y"), str(round(entry["work"], 1))]  # type: ignore
-            UIC.fill_table(self.tableWidget, needed_data)
-
-    def fill_daily_data(self) -> None:
-        UIC.clear_table(self.tableWidget)
-        UIC.set_header_names(self.tableWidget, "Date / Type", "Event / Pause (min)")
-        for entry in store.daily_data:
-            UIC.fill_table(self.tableWidget, entry)
+        """Switch the table between month, day and years view."""
+        self.table_mode = self.table_mode.next
+        self.switch_button.setText(self.table_mode.value)
+        self.delete_event_button.setVisible(self.table_mode == TableMode.DAY)
+        self._show_table()
+
+    def _show_table(self) -> None:
+        if self.data is None:
+            self.table_model.set_table(TableData.empty(self.table_mode))
+        elif self.table_mode == TableMode.DAY:
+            self.table_model.set_table(TableData.day(self.data.daily_data))
+        elif self.table_mode == TableMode.YEARS:
+            self.table_model.set_table(TableData.years(self.data.years_df))
+        else:
+            self.table_model.set_table(TableData.month(self.data.df))
 
     def delete_selected_event(self) -> None:
         event_data = self.get_selected_event()
@@ -343,16 +216,14 @@ class DataWindow(QWidget, Ui_DataWindow):
         if UIC.user_okay(f"Do you want to delete event {event_data.event} at: {event_data.event_time}?"):
             logger.info("Delete event %s at: %s", event_data.event, event_data.event_time)
             DB_CONTROLLER.delete_event(event_data.event_time)
-            store.update_data(self.selected_date)
-            self.update_table_data()
-            self.plot()
+            self.refresh()
 
     def get_selected_event(self) -> EventData | None:
-        indexes = self.tableWidget.selectionModel().selectedRows()
+        if self.table_mode != TableMode.DAY:
+            return None
+        indexes = self.table_view.selectionModel().selectedRows()
         if indexes:
-            row = indexes[0].row()
-            event_datetime = self.tableWidget.item(row, 0).text()
-            event = self.tableWidget.item(row, 1).text()
+            event_datetime, event = self.table_model.row_values(indexes[0].row())
             if event_datetime == "Pause":
                 return None
             return EventData(datetime.datetime.fromisoformat(event_datetime), event)
@@ -364,15 +235,12 @@ class DataWindow(QWidget, Ui_DataWindow):
         new_date = current_date.addMonths(delta)
         self.date_edit.setDate(new_date)
 
-    def on_item_click(self, item: QTableWidgetItem) -> None:
+    def on_item_click(self, index: QModelIndex) -> None:
         """Set the date to the selected date in the table."""
-        # only continue if this is not the day view
-        if self.view_day:
+        # only the month view has a date per row
+        if self.table_mode != TableMode.MONTH:
             return
-        row = item.row()
-        date_item = self.tableWidget.item(row, 0)
-        date = date_item.text()
-        date = datetime.datetime.strptime(date, "%d/%m/%Y").date()
+        date = self.table_model.row_values(index.row())[0]
         self.date_edit.setDate(date)
 
 
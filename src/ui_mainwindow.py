@@ -1,22 +1,26 @@
 import datetime
 import logging
 from collections.abc import Callable
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtWidgets import QApplication, QMainWindow, QMenu, QSystemTrayIcon
 
 from src.database_controller import DB_CONTROLLER
 from src.icons import get_preset_icons
-from src.ui_config_window import ConfigWindow
+from src.time_off_list import TIME_OFF_CACHE
 from src.ui_controller import UI_CONTROLLER as UIC
-from src.ui_data_window import DataWindow
 from src.ui_vacation_window import VacationWindow
 from src.updater import UPDATER
 from src.utils import open_folder_in_explorer
+from src.work_time import day_status
 from ui import Ui_MainWindow
 
+if TYPE_CHECKING:
+    from src.ui_config_window import ConfigWindow
+    from src.ui_data_window import DataWindow
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,9 +43,22 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.past_datetime_edit.setDateTime(datetime.datetime.now())
         self.back_button.hide()
         self.resize_mainwindow(0, -80)
-        self.data_window = DataWindow(self)
+        # the data and config window (and with them pandas, the plotting stack and the data store)
+        # are only imported when they are opened the first time, so the tray is ready fast
+        self.data_window: DataWindow | None = None
         self.config_window: ConfigWindow | None = None
         self.vacation_window: VacationWindow | None = None
+        # commands forwarded from later launches and the command line, see run_command
+        self.remote_commands: dict[str, Callable[[dict[str, Any]], tuple[bool, str]]] = {
+            "start": self._remote_event,
+            "stop": self._remote_event,
+            "pause": self._remote_pause,
+            "status": self._remote_status,
+            "show": self._remote_show,
+            "data": self._remote_data,
+            "timeoff_add": self._remote_time_off_add,
+            "timeoff_remove": self._remote_time_off_remove,
+        }
 
     def connect_buttons(self) -> None:
         self.start_button.clicked.connect(lambda: self.add_start())
@@ -150,13 +167,16 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         entry_date = datetime.date.today()
         if self.is_past_time and check_past_entry:
             entry_date = self.get_past_date()
-        DB_CONTROLLER.add_pause(pause, entry_date)
+        message = self.save_pause(pause, entry_date)
         self.set_pause(0)
-        UIC.show_notification(
-            self.tray_icon, f"Added pause of {pause} minutes on date {entry_date.strftime('%d-%m-%Y')}", "Pause Added"
-        )
+        UIC.show_notification(self.tray_icon, message, "Pause Added")
         self.update_other_windows()
 
+    def save_pause(self, pause: int, entry_date: datetime.date) -> str:
+        """Add the pause to the database, return the message for the user."""
+        DB_CONTROLLER.add_pause(pause, entry_date)
+        return f"Added pause of {pause} minutes on date {entry_date.strftime('%d-%m-%Y')}"
+
     def get_past_date(self) -> datetime.date:
         """Return the date from the past datetime edit."""
         qt_object = self.past_datetime_edit.dateTime()
@@ -177,10 +197,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         entry_datetime = datetime.datetime.now().replace(microsecond=0)
         if self.is_past_time and check_past_entry:
             entry_datetime = self.get_past_datetime()
+        UIC.show_notification(self.tray_icon, self.save_event(event, entry_datetime), "Event Added")
+
+    def save_event(self, event: str, entry_datetime: datetime.datetime) -> str:
+        """Add the event to the database, return the message for the user."""
         DB_CONTROLLER.add_event(event, entry_datetime)
-        UIC.show_notification(
-            self.tray_icon, f"Added event {event} at {entry_datetime.strftime('%d-%m-%Y - %H:%M:%S')}", "Event Added"
-        )
+        return f"Added event {event} at {entry_datetime.strftime('%d-%m-%Y - %H:%M:%S')}"
 
     def add_start(self, check_past_entry: bool = True) -> None:
         """Add a start event."""
@@ -202,8 +224,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
     def show_data_window(self) -> None:
         """Trigger to update and show the data window."""
-        self.data_window.plot()
-        self.data_window.update_table_data()
+        if self.data_window is None:
+            from src.ui_data_window import DataWindow  # noqa: PLC0415
+
+            self.data_window = DataWindow(self)
+        self.data_window.refresh()
         self.data_window.show()
 
     def update_other_windows(self) -> None:
@@ -212,12 +237,13 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
     def update_data_window(self) -> None:
         """Update the data window if it is visible."""
-        if self.data_window.isVisible():
-            self.data_window.plot()
-            self.data_window.update_table_data()
+        if self.data_window is not None and self.data_window.isVisible():
+            self.data_window.refresh()
 
     def show_config_window(self) -> None:
         """Show the configuration window."""
+        from src.ui_config_window import ConfigWindow  # noqa: PLC0415
+
         self.config_window = ConfigWindow(self)
         self.config_window.show()
 
@@ -225,3 +251,69 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """Show the vacation window."""
         self.vacation_window = VacationWindow(self)
         self.vacation_window.show()
+
+    def run_command(self, request: dict[str, Any]) -> tuple[bool, str]:
+        """Run a command forwarded by another process, return if it succeeded and the message for the user.
+
+        Later launches of the app and the command line send their commands to the running app (see InstanceServer),
+        so all writes go through this process and its caches stay up to date.
+        """
+        command = self.remote_commands.get(request["command"])
+        if command is None:
+            return False, f"Unknown command: {request['command']}"
+        return command(request)
+
+    def _remote_event(self, request: dict[str, Any]) -> tuple[bool, str]:
+        entry_datetime = datetime.datetime.now().replace(microsecond=0)
+        if request.get("at"):
+            entry_datetime = datetime.datetime.fromisoformat(request["at"])
+        message = self.save_event(request["command"], entry_datetime)
+        self.notify_later(message, "Event Added")
+        self.update_other_windows()
+        return True, message
+
+    def _remote_pause(self, request: dict[str, Any]) -> tuple[bool, str]:
+        entry_date = datetime.date.fromisoformat(request["date"]) if request.get("date") else datetime.date.today()
+        message = self.save_pause(int(request["minutes"]), entry_date)
+        self.notify_later(message, "Pause Added")
+        self.update_other_windows()
+        return True, message
+
+    def _remote_status(self, request: dict[str, Any]) -> tuple[bool, str]:
+        now = datetime.datetime.now()
+        return True, day_status(DB_CONTROLLER.get_last_event(), *DB_CONTROLLER.get_day_data(now.date()), now)
+
+    def _remote_show(self, request: dict[str, Any]) -> tuple[bool, str]:
+        self.restore_window()
+        return True, "Showing the app"
+
+    def _remote_data(self, request: dict[str, Any]) -> tuple[bool, str]:
+        self.show_data_window()
+        self.data_window.activateWindow()  # type: ignore
+        return True, "Showing the data"
+
+    def _remote_time_off_add(self, request: dict[str, Any]) -> tuple[bool, str]:
+        day = datetime.date.fromisoformat(request["date"])
+        if any(entry.date == day for entry in TIME_OFF_CACHE.get_year(day.year)):
+            return False, f"{day.strftime('%d-%m-%Y')} is already time off"
+        TIME_OFF_CACHE.add(day, request["reason"])
+        self.update_time_off_views()
+        return True, f"Added {request['reason']} on {day.strftime('%d-%m-%Y')}"
+
+    def _remote_time_off_remove(self, request: dict[str, Any]) -> tuple[bool, str]:
+        day = datetime.date.fromisoformat(request["date"])
+        if not any(entry.date == day for entry in TIME_OFF_CACHE.get_year(day.year)):
+            return False, f"{day.strftime('%d-%m-%Y')} is no time off"
+        TIME_OFF_CACHE.remove(day)
+        self.update_time_off_views()
+        return True, f"Removed time off on {day.strftime('%d-%m-%Y')}"
+
+    def notify_later(self, message: str, title: str) -> None:
+        """Show the notification after the response was sent, it is a blocking dialog on some systems."""
+        QTimer.singleShot(0, lambda: UIC.show_notification(self.tray_icon, message, title))
+
+    def update_time_off_views(self) -> None:
+        """Update the time off list and the data window after a time off change."""
+        if self.vacation_window is not None and self.vacation_window.isVisible():
+            self.vacation_window.time_off_model.set_year(self.vacation_window.year)
+        self.update_other_windows()
@@ -1,5 +1,3 @@
-from git import Repo
-
 from src.filepath import ROOT_PATH
 
 
@@ -11,6 +9,8 @@ class Updater:
     # TODO: Build more complex Structure to test for new release first and only update to release
     # TODO: Also prompt user if he wants to upgrade to release version x.x.x from x.x.x
     def update(self) -> None:
+        from git import Repo  # noqa: PLC0415
+
         repo = Repo(self.git_path)
         repo.remotes.origin.pull()
 
@@ -0,0 +1,90 @@
+"""Work time of a single day out of its start / stop events.
+
+Only uses the standard library, so the command line can compute the current day without numpy or pandas.
+"""
+
+import datetime
+
+# end of an unfinished day (midnight of the next day) as minute of the day
+END_OF_DAY_MINUTE = 24 * 60
+
+
+def day_work_time(
+    events: list[tuple[str, str]],
+    day: datetime.date,
+    now: datetime.datetime | None = None,
+) -> tuple[int, int | None, int | None]:
+    """Calculate the total work time of the day, along with the first start and last end time.
+
+    Args:
+        events (list[tuple[str, str]]): (iso datetime, event) rows of the day, sorted by time.
+        day (datetime.date): The day of the events.
+        now (datetime.datetime | None): Current time, used if the day is today and still running.
+
+    Returns:
+        tuple[int, int | None, int | None]: The total work time in seconds,
+        the earliest start time, and the latest end time as minute of the day.
+
+    """
+    if not events:
+        return 0, None, None
+
+    total_time = datetime.timedelta()
+    start_time: datetime.datetime | None = None
+    earliest_start = None
+    latest_end = None
+
+    for event_time, event in events:
+        if start_time is None and event == "start":
+            start_time = datetime.datetime.fromisoformat(event_time)
+            if earliest_start is None:
+                earliest_start = _minute_of_day(start_time)
+        elif start_time is not None and event == "stop":
+            end_time = datetime.datetime.fromisoformat(event_time)
+            latest_end = _minute_of_day(end_time)
+            total_time += end_time - start_time
+            start_time = None
+
+    # a start without stop: either the user forgot to stop the clock or the day is currently ongoing (today)
+    if start_time is None:
+        return int(total_time.total_seconds()), earliest_start, latest_end
+    if now is None:
+        now = datetime.datetime.now()
+    if day == now.date():
+        total_time += now - start_time
+        latest_end = _minute_of_day(now)
+    # else, use the midnight of this day as end
+    else:
+        end_of_day = datetime.datetime.combine(start_time.date() + datetime.timedelta(days=1), datetime.time.min)
+        total_time += end_of_day - start_time
+        latest_end = END_OF_DAY_MINUTE
+    return int(total_time.total_seconds()), earliest_start, latest_end
+
+
+def _minute_of_day(time: datetime.datetime) -> int:
+    return time.hour * 60 + time.minute
+
+
+def day_status(
+    last_event: tuple[str, str] | None,
+    events: list[tuple[str, str]],
+    pauses: list[tuple[str, int]],
+    now: datetime.datetime,
+) -> str:
+    """Describe if the time is currently tracked and the work and pause of today.
+
+    Args:
+        last_event (tuple[str, str] | None): Last (iso datetime, event) row of all events.
+        events (list[tuple[str, str]]): (iso datetime, event) rows of today.
+        pauses (list[tuple[str, int]]): (iso date, minutes) row of today.
+        now (datetime.datetime): Current time.
+
+    """
+    if last_event is None:
+        return "No events yet"
+    last_time = datetime.datetime.fromisoformat(last_event[0]).strftime("%d-%m-%Y %H:%M")
+    state = f"Tracking since {last_time}" if last_event[1] == "start" else f"Not tracking, last stop at {last_time}"
+    worked_seconds, _, _ = day_work_time(events, now.date(), now)
+    pause_minutes = pauses[0][1] if pauses else 0
+    work_hours = max(worked_seconds - pause_minutes * 60, 0) / 3600
+    return f"{state}\nToday: {work_hours:.2f} h work, {pause_minutes} min pause"
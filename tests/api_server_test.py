@@ -0,0 +1,173 @@
+import asyncio
+import datetime
+import http.client
+import json
+from collections.abc import Generator
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from src.api_server import ApiServer
+from src.database_controller import DatabaseController
+from src.datastore import Store
+
+
+@pytest.fixture
+def controller(tmp_path: Path) -> DatabaseController:
+    # the server reads in worker threads, which would each get their own in memory database
+    controller = DatabaseController(db_url=str(tmp_path / "api.db"))
+    for day in range(3, 8):
+        controller.add_event("start", datetime.datetime(2025, 3, day, 8, 0))
+        controller.add_event("stop", datetime.datetime(2025, 3, day, 16, 30))
+    controller.add_pause(30, datetime.date(2025, 3, 4))
+    return controller
+
+
+@pytest.fixture
+def api(controller: DatabaseController) -> Generator[ApiServer, None, None]:
+    def send(command: str, at: str | None = None) -> dict[str, Any]:
+        controller.add_event(command, datetime.datetime.fromisoformat(at) if at else datetime.datetime.now())
+        return {"ok": True, "message": f"Added event {command}"}
+
+    with patch("src.datastore.DB_CONTROLLER", controller):
+        server = ApiServer(controller, Store(), send=send)
+        assert server.start()
+        yield server
+        server.stop()
+
+
+def _request(
+    api: ApiServer, path: str, method: str = "GET", headers: dict[str, str] | None = None, body: bytes | None = None
+) -> tuple[int, dict[str, str], Any]:
+    connection = http.client.HTTPConnection(api.host, api.port, timeout=5)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        data = response.read()
+        return response.status, dict(response.getheaders()), json.loads(data) if data else None
+    finally:
+        connection.close()
+
+
+def test_month_and_day(api: ApiServer) -> None:
+    status, headers, month = _request(api, "/api/month?month=2025-03")
+    assert status == HTTPStatus.OK
+    assert headers["Content-Type"] == "application/json"
+    assert "Server-Timing" in headers
+    assert len(month["days"]) == 31  # noqa: PLR2004
+    assert month["totals"]["work"] == 5 * 8.5 - 0.5
+    _, _, day = _request(api, "/api/day?date=2025-03-04")
+    assert day == month["days"][3]
+    assert (day["start"], day["end"], day["pause"], day["work"]) == ("08:00", "16:30", 0.5, 8.0)
+    _, _, events = _request(api, "/api/events?date=2025-03-04")
+    assert events["events"] == [
+        {"time": "2025-03-04T08:00:00", "event": "start"},
+        {"time": "2025-03-04T16:30:00", "event": "stop"},
+    ]
+    assert events["pause"] == 30  # noqa: PLR2004
+    _, _, year = _request(api, "/api/year?year=2025")
+    assert [month["month"] for month in year["months"]] == ["2025-03"]
+    assert year["totals"]["work"] == month["totals"]["work"]
+
+
+def test_polling_does_not_query_the_database(api: ApiServer, controller: DatabaseController) -> None:
+    paths = ["/api/month?month=2025-03", "/api/status", "/api/overtime", "/api/day?date=2025-03-04"]
+    first = {path: _request(api, path) for path in paths}
+    call_count = controller.call_count
+    for _ in range(20):
+        for path in paths:
+            status, headers, body = _request(api, path)
+            assert (status, headers["ETag"], body) == (first[path][0], first[path][1]["ETag"], first[path][2])
+    assert controller.call_count == call_count
+    # the client already has the current data
+    etag = first["/api/month?month=2025-03"][1]["ETag"]
+    status, _, body = _request(api, "/api/month?month=2025-03", headers={"If-None-Match": etag})
+    assert (status, body) == (HTTPStatus.NOT_MODIFIED, None)
+
+    # a change of the data invalidates the cached responses
+    status, _, response = _request(
+        api,
+        "/api/start",
+        "POST",
+        {"Content-Type": "application/json"},
+        json.dumps({"at": "2025-03-10T09:00:00"}).encode(),
+    )
+    assert (status, response["ok"]) == (HTTPStatus.OK, True)
+    status, headers, month = _request(api, "/api/month?month=2025-03", headers={"If-None-Match": etag})
+    assert status == HTTPStatus.OK
+    assert headers["ETag"] != etag
+    assert month["days"][9]["start"] == "09:00"
+    assert controller.call_count > call_count
+
+
+def test_concurrent_load(api: ApiServer, controller: DatabaseController) -> None:
+    paths = ["/api/status", "/api/month?month=2025-03", "/api/day?date=2025-03-05", "/api/overtime"]
+    clients, requests_per_client = 16, 25
+
+    async def client(index: int) -> list[int]:
+        reader, writer = await asyncio.open_connection(api.host, api.port)
+        statuses = []
+        for i in range(requests_per_client):
+            path = paths[(index + i) % len(paths)]
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{api.port}\r\n\r\n".encode())
+            await writer.drain()
+            statuses.append(int((await reader.readline()).split()[1]))
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            await reader.readexactly(int(headers["content-length"]))
+        writer.close()
+        return statuses
+
+    async def run() -> list[list[int]]:
+        return await asyncio.gather(*(client(index) for index in range(clients)))
+
+    for path in paths:
+        _request(api, path)
+    call_count = controller.call_count
+    results = asyncio.run(run())
+    assert all(status == HTTPStatus.OK for statuses in results for status in statuses)
+    assert controller.call_count == call_count
+    _, _, metrics = _request(api, "/api/metrics")
+    routes = metrics["routes"]
+    assert sum(routes[path.partition("?")[0]]["count"] for path in paths) == clients * requests_per_client + len(paths)
+    assert metrics["cache"]["misses"] == len(paths)
+    assert all(0 < routes[route]["p50_ms"] <= routes[route]["p95_ms"] <= routes[route]["max_ms"] for route in routes)
+
+
+def test_errors(api: ApiServer) -> None:
+    assert _request(api, "/api/unknown")[0] == HTTPStatus.NOT_FOUND
+    assert _request(api, "/api/month", "POST")[0] == HTTPStatus.METHOD_NOT_ALLOWED
+    assert _request(api, "/api/start")[0] == HTTPStatus.METHOD_NOT_ALLOWED
+    status, _, body = _request(api, "/api/day?date=03.03.2025")
+    assert (status, body["error"]) == (HTTPStatus.BAD_REQUEST, "Invalid date 03.03.2025, use YYYY-MM-DD")
+    # other hosts could be a website using DNS rebinding
+    assert _request(api, "/api/status", headers={"Host": "example.com"})[0] == HTTPStatus.FORBIDDEN
+    # a website could send a form to another origin without asking first
+    assert (
+        _request(api, "/api/stop", "POST", {"Content-Type": "text/plain"}, b'{"at": null}')[0]
+        == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+    )
+
+
+def test_start_needs_json_content_type(api: ApiServer, controller: DatabaseController) -> None:
+    data_version = controller.data_version
+    # a cross site form or no-cors request can send an empty body, but not the content type
+    status, _, body = _request(api, "/api/start", "POST")
+    assert (status, body["error"]) == (HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Use the content type application/json")
+    origin = {"Content-Type": "application/json", "Origin": "https://example.com"}
+    assert _request(api, "/api/start", "POST", origin)[0] == HTTPStatus.FORBIDDEN
+    assert controller.data_version == data_version
+    local = {"Content-Type": "application/json", "Origin": f"http://localhost:{api.port}"}
+    assert _request(api, "/api/start", "POST", local)[0] == HTTPStatus.OK
+    assert controller.data_version == data_version + 1
+
+
+def test_start_without_app(api: ApiServer) -> None:
+    api.send = lambda *_, **__: None
+    status, _, body = _request(api, "/api/stop", "POST", {"Content-Type": "application/json"})
+    assert (status, body["error"]) == (HTTPStatus.SERVICE_UNAVAILABLE, "The app does not answer")
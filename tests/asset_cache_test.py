@@ -0,0 +1,37 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from src.asset_cache import AssetCache
+
+STYLESHEET = "QWidget { color: red; }"
+
+
+def test_stylesheet_is_generated_once(tmp_path: Path) -> None:
+    folder = tmp_path / "asset_cache"
+    with patch("qdarktheme.load_stylesheet", return_value=STYLESHEET) as mock_load:
+        assert AssetCache(folder).get_stylesheet("dark") == STYLESHEET
+        # a later start reads the stored stylesheet
+        assert AssetCache(folder).get_stylesheet("dark") == STYLESHEET
+        AssetCache(folder).get_stylesheet("light")
+    assert [call.args for call in mock_load.call_args_list] == [("dark",), ("light",)]
+
+
+def test_other_version_clears_cache(tmp_path: Path) -> None:
+    folder = tmp_path / "asset_cache"
+    with patch("qdarktheme.load_stylesheet", return_value=STYLESHEET) as mock_load:
+        AssetCache(folder).get_stylesheet("dark")
+        with patch("src.asset_cache.__version__", "99.0.0"):
+            cache = AssetCache(folder)
+            assert cache.usable
+            assert not (folder / "stylesheet_dark.qss").exists()
+            cache.get_stylesheet("dark")
+    assert mock_load.call_count == 2  # noqa: PLR2004
+
+
+def test_unusable_folder_still_returns_stylesheet(tmp_path: Path) -> None:
+    blocking_file = tmp_path / "file"
+    blocking_file.write_text("")
+    cache = AssetCache(blocking_file / "asset_cache")
+    with patch("qdarktheme.load_stylesheet", return_value=STYLESHEET):
+        assert cache.get_stylesheet("dark") == STYLESHEET
+    assert not cache.usable
@@ -0,0 +1,107 @@
+import csv
+import datetime
+import json
+from pathlib import Path
+
+import pytest
+
+from src.batch_report import month_report, run_batch
+from src.config_handler import NEEDED_DATA, Config
+from src.database_controller import DatabaseController
+from src.free_day_calendar import FreeDayCalendar
+from src.schedule import ScheduleHistory, ScheduleSegment
+from src.schema import get_schema_revision
+from src.sqlite_database import SqliteDatabase
+from src.startup import run_db_migrations
+
+MARCH = datetime.date(2025, 3, 1)
+
+
+def _add_days(database: SqliteDatabase | DatabaseController, hours: int) -> None:
+    for day in range(3, 8):
+        database.add_event("start", datetime.datetime(2025, 3, day, 8, 0))
+        database.add_event("stop", datetime.datetime(2025, 3, day, 8 + hours, 0))
+
+
+@pytest.fixture
+def users_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "users"
+    # current database with own config
+    (folder / "alice").mkdir(parents=True)
+    config = {**NEEDED_DATA, "name": "Alice Smith", "country": "DE", "work_hours": 8, "use_hours_per_week": True}
+    (folder / "alice" / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    run_db_migrations(folder / "alice" / "time_data.db", Config.from_kwargs(**config))
+    database = SqliteDatabase(folder / "alice" / "time_data.db")
+    _add_days(database, 9)
+    database.add_time_off(datetime.date(2025, 3, 10), "Vacation")
+    database.close()
+    # database of an older app version, config without name
+    (folder / "bob").mkdir()
+    controller = DatabaseController(db_url=str(folder / "bob" / "time_data.db"))
+    _add_days(controller, 7)
+    controller.add_time_off(datetime.date(2025, 3, 10), "Vacation")
+    controller.engine.dispose()
+    config = {**NEEDED_DATA, "work_hours": 6, "use_hours_per_week": True}
+    (folder / "bob" / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    # broken database and a folder without database
+    (folder / "carol").mkdir()
+    (folder / "carol" / "time_data.db").write_text("no database", encoding="utf-8")
+    (folder / "notes").mkdir()
+    return folder
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(users_folder: Path, tmp_path: Path, workers: int) -> None:
+    bob_database = (users_folder / "bob" / "time_data.db").read_bytes()
+    output = tmp_path / f"output_{workers}"
+    reports = run_batch(users_folder, MARCH, output, workers)
+
+    assert [report.name for report in reports] == ["alice", "bob", "carol"]
+    alice, bob, carol = reports
+    # the vacation counts as the daily hours of the user
+    assert (alice.work, alice.worked_days, alice.days_off) == (5 * 9.0 + 8, 6, 1)
+    assert Path(alice.report) == output / "alice" / "Alice_Smith_03_2025_time.xlsx"
+    assert Path(alice.report).exists()
+    # without name in the config, the name of the folder is used
+    assert Path(bob.report).name == "bob_03_2025_time.xlsx"
+    # the database of the old version is migrated in a copy, the schedule is seeded with the config of the user
+    assert (bob.work, bob.worked_days, bob.error) == (5 * 7.0 + 6, 6, "")
+    assert (users_folder / "bob" / "time_data.db").read_bytes() == bob_database
+    assert get_schema_revision(users_folder / "bob" / "time_data.db") is None
+    assert carol.error
+    assert not carol.report
+
+    with (output / "summary_03_2025.csv").open(encoding="utf-8") as summary_file:
+        rows = list(csv.DictReader(summary_file))
+    assert [row["name"] for row in rows] == ["alice", "bob", "carol"]
+    assert float(rows[0]["overtime"]) == alice.overtime
+    assert rows[2]["error"] == carol.error
+
+
+def test_holidays_of_own_config() -> None:
+    # each user has its own config, so the holidays must not come from the one of the app
+    config = Config.from_kwargs(**{**NEEDED_DATA, "country": "DE"})
+    # the 1st of May is a holiday in Germany, but not in the US
+    assert datetime.date(2025, 5, 1) in config.get_holidays(2025)
+    config.country = "US"
+    assert datetime.date(2025, 5, 1) not in config.get_holidays(2025)
+
+
+def test_month_report_uses_free_day_calendar(tmp_path: Path) -> None:
+    # the free days of the batch reports come from the same calendar as the ones of the app
+    config = Config.from_kwargs(**{**NEEDED_DATA, "country": "DE", "work_hours": 8, "use_hours_per_week": False})
+    run_db_migrations(tmp_path / "time_data.db", config)
+    database = SqliteDatabase(tmp_path / "time_data.db")
+    database.add_event("start", datetime.datetime(2025, 5, 5, 8, 0))
+    database.add_event("stop", datetime.datetime(2025, 5, 5, 16, 0))
+    # friday and saturday, the 1st of May is a holiday
+    database.add_time_off(datetime.date(2025, 5, 2), "Vacation")
+    database.add_time_off(datetime.date(2025, 5, 3), "Vacation")
+    report, days_off = month_report(database, config, datetime.date(2025, 5, 1))
+    calendar = FreeDayCalendar(ScheduleHistory([ScheduleSegment.from_config(config)]), database, config)
+    assert days_off.tolist() == calendar.month_mask(2025, 5, workdays_only=False).tolist()
+    database.close()
+    assert days_off[:3].tolist() == [True, True, True]
+    # the free workdays are credited, other workdays without work are missing time
+    assert report.overtime_s[:3].tolist() == [0, 0, 0]
+    assert report.overtime_s[5] < 0
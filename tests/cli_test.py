@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# packages of the app and the data, the quick commands must not load them
+HEAVY_PACKAGES = ("PyQt6", "sqlalchemy", "alembic", "numpy", "pandas", "matplotlib", "seaborn", "holidays")
+SLOW_MODULES = ("src.config_handler", "logging.config")
+
+
+def _run(tmp_path: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess[str]:
+    """Run the command line in a fresh interpreter, with the app data in the temporary folder."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "cli.py", *args],
+        cwd=ROOT,
+        env={**os.environ, "XDG_CONFIG_HOME": str(tmp_path), "APPDATA": str(tmp_path), "HOME": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=check,
+    )
+
+
+def _loaded_modules(result: subprocess.CompletedProcess[str]) -> set[str]:
+    # lines look like "import time:  self [us] | cumulative | imported package"
+    lines = [line for line in result.stderr.splitlines() if line.startswith("import time:")]
+    return {line.split("|")[2].strip() for line in lines}
+
+
+def _loaded_packages(result: subprocess.CompletedProcess[str]) -> set[str]:
+    return {name.split(".")[0] for name in _loaded_modules(result)}
+
+
+def test_commands(tmp_path: Path) -> None:
+    _run(tmp_path, "start", "--at", "2025-03-03 08:00")
+    _run(tmp_path, "stop", "--at", "2025-03-03 16:30")
+    _run(tmp_path, "pause", "30", "--date", "2025-03-03")
+    assert "Not tracking, last stop at 03-03-2025 16:30" in _run(tmp_path, "status").stdout
+    assert (
+        "Added Sick Leave on 04-03-2025"
+        in _run(tmp_path, "timeoff", "add", "2025-03-04", "--reason", "Sick Leave").stdout
+    )
+    assert _run(tmp_path, "timeoff", "add", "2025-03-04", check=False).returncode == 1
+
+    report = _run(tmp_path, "report", "--month", "2025-03").stdout.splitlines()
+    assert report[0] == "March 2025"
+    assert report[4].split()[:5] == ["03.03.2025", "08:00", "16:30", "0.50", "8.00"]
+    # the time off counts as worked
+    time_off = report[5].split()
+    assert time_off[4] == time_off[5]
+    assert "No data for January 2025" in _run(tmp_path, "report", "--month", "2025-01").stdout
+    assert _run(tmp_path, "timeoff", "remove", "2025-03-04").returncode == 0
+    # commands only the running app can do
+    result = _run(tmp_path, "show", check=False)
+    assert (result.returncode, result.stdout) == (1, "The app is not running\n")
+
+
+def test_quick_commands_do_not_load_heavy_packages(tmp_path: Path) -> None:
+    # the first call also creates and migrates the database
+    _run(tmp_path, "status")
+    for args in (("start",), ("status",), ("pause", "15"), ("stop",), ("timeoff", "add", "2025-03-04")):
+        result = _run(tmp_path, *args)
+        packages = _loaded_packages(result)
+        assert packages.isdisjoint(HEAVY_PACKAGES), packages.intersection(HEAVY_PACKAGES)
+        # the config and logging.config take a good part of the start, the quick commands do not need them
+        assert _loaded_modules(result).isdisjoint(SLOW_MODULES), _loaded_modules(result).intersection(SLOW_MODULES)
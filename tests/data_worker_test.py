@@ -0,0 +1,117 @@
+import datetime
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from PyQt6.QtCore import QCoreApplication
+
+from src.data_worker import (
+    DataRequest,
+    DataResult,
+    DataWorker,
+    PrefetchWorker,
+    RefreshScheduler,
+    adjacent_periods,
+    adjust_df_for_plot,
+    compute_data,
+)
+
+REQUEST = DataRequest(generation=1, selected_date=datetime.date(2025, 5, 20), plot_month=False, plot=True, table=True)
+
+
+def test_outdated_worker_does_not_compute() -> None:
+    worker = DataWorker(REQUEST, lambda _: False)
+    finished = MagicMock()
+    worker.signals.finished.connect(finished)
+    with patch("src.data_worker.compute_data") as mock_compute:
+        worker.run()
+    mock_compute.assert_not_called()
+    finished.assert_not_called()
+
+
+def test_worker_emits_result_of_current_request() -> None:
+    worker = DataWorker(REQUEST, lambda generation: generation == REQUEST.generation)
+    finished = MagicMock()
+    worker.signals.finished.connect(finished)
+    with patch("src.data_worker.compute_data") as mock_compute:
+        worker.run()
+    finished.assert_called_once_with(mock_compute.return_value)
+
+
+def test_compute_data_stops_if_outdated_before_plot() -> None:
+    with patch("src.data_worker.store") as mock_store:
+        result = compute_data(REQUEST, lambda _: False)
+        assert result is None
+        mock_store.update_data.assert_called_once_with(REQUEST.selected_date)
+        mock_store.get_year_data.assert_not_called()
+
+
+def test_compute_data_returns_snapshot_without_plot() -> None:
+    request = DataRequest(1, datetime.date(2025, 5, 20), plot_month=True, plot=False, table=True)
+    with patch("src.data_worker.store") as mock_store:
+        mock_store.daily_data = [("2025-05-20T08:00:00", "start")]
+        mock_store.total_overtime = 1.5
+        mock_store.overtime_by_year = {2025: 1.5}
+        result = compute_data(request, lambda _: True)
+    assert isinstance(result, DataResult)
+    assert result.daily_data == mock_store.daily_data
+    assert result.daily_data is not mock_store.daily_data
+    assert result.plot_df.empty
+    # the export uses the days off of the snapshot, not the store
+    assert result.days_off is mock_store.calendar.mask.return_value
+    mock_store.calendar.mask.assert_called_once_with(mock_store.df.index.to_numpy(), workdays_only=False)
+
+
+def test_adjust_df_for_plot_creates_dummy_year() -> None:
+    plot_df = adjust_df_for_plot(pd.DataFrame(), plot_month=False, current_date=datetime.date(2025, 5, 20))
+    assert len(plot_df) == 12  # noqa: PLR2004
+    assert not plot_df["is_free_day"].any()
+    assert (plot_df["color"] == "positive").all()
+
+
+def test_adjacent_periods_cover_neighbour_months_and_previous_year() -> None:
+    months, years = adjacent_periods(datetime.date(2025, 1, 20), plot_month=True)
+    assert months == [datetime.date(2024, 12, 1), datetime.date(2025, 2, 1)]
+    assert years == []
+    _, years = adjacent_periods(datetime.date(2025, 1, 20), plot_month=False)
+    assert years == [2024]
+
+
+def test_prefetch_fills_store_cache() -> None:
+    with patch("src.data_worker.store") as mock_store:
+        PrefetchWorker(1, datetime.date(2025, 5, 20), False, lambda _: True).run()
+    assert mock_store.generate_month_data.call_count == 2  # noqa: PLR2004
+    mock_store.get_year_data.assert_called_once_with(2024)
+
+
+def test_prefetch_stops_when_outdated() -> None:
+    generations = iter([True, False])
+    with patch("src.data_worker.store") as mock_store:
+        PrefetchWorker(1, datetime.date(2025, 5, 20), False, lambda _: next(generations)).run()
+    mock_store.generate_month_data.assert_called_once_with(datetime.date(2025, 4, 1))
+    mock_store.get_year_data.assert_not_called()
+
+
+def test_refresh_scheduler_coalesces_requests() -> None:
+    app = QCoreApplication.instance() or QCoreApplication([])
+    scheduler = RefreshScheduler(lambda: (datetime.date(2025, 5, 20), True))
+    finished = MagicMock()
+    scheduler.finished.connect(finished)
+    with (
+        patch(
+            "src.data_worker.compute_data", side_effect=lambda request, _: MagicMock(request=request)
+        ) as mock_compute,
+        patch("src.data_worker.PrefetchWorker"),
+    ):
+        scheduler.request(plot=True, table=False)
+        scheduler.request(plot=False, table=True)
+        scheduler.request(plot=False, table=True)
+        deadline = time.monotonic() + 5
+        while scheduler.is_pending and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.005)
+        scheduler.thread_pool.waitForDone()
+    mock_compute.assert_called_once()
+    request = mock_compute.call_args.args[0]
+    assert (request.generation, request.plot, request.table) == (3, True, True)
+    finished.assert_called_once()
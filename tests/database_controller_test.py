@@ -134,3 +134,15 @@ class TestController:
     ) -> None:
         result = db_controller.get_months_with_data(year)
         assert (len(result) > 0) == has_data
+
+    def test_set_work_schedule_replaces_later_schedules(self, db_controller: DatabaseController) -> None:
+        db_controller.set_work_schedule(datetime.date(2025, 1, 1), [0, 1, 2, 3, 4], [8.0] * 5 + [0.0] * 2)
+        db_controller.set_work_schedule(datetime.date(2025, 6, 1), [0, 1, 2], [6.0] * 3 + [0.0] * 4)
+        db_controller.set_work_schedule(datetime.date(2025, 3, 1), [0, 1], [4.0] * 2 + [0.0] * 5)
+        schedules = db_controller.get_work_schedules()
+        assert [schedule.effective_from for schedule in schedules] == [
+            datetime.date(2025, 1, 1),
+            datetime.date(2025, 3, 1),
+        ]
+        assert schedules[-1].get_workdays() == [0, 1]
+        assert schedules[-1].get_daily_hours() == [4.0] * 2 + [0.0] * 5
@@ -0,0 +1,176 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine import (
+    HOUR_COLUMNS,
+    MonthColumns,
+    MonthReport,
+    build_month_base,
+    build_month_base_from_columns,
+    build_month_report,
+    daily_target_seconds,
+    free_day_mask,
+    month_days,
+    month_totals,
+    sum_by_year,
+)
+from src.schedule import ScheduleHistory, ScheduleSegment
+from src.work_time import day_work_time
+
+SCHEDULE = ScheduleHistory([ScheduleSegment(datetime.date(2025, 1, 1), (0, 1, 2, 3, 4), (8, 8, 8, 8, 6, 0, 0))])
+FREE_DAYS = [datetime.date(2025, 3, 3), datetime.date(2025, 3, 8), datetime.date(2025, 3, 14)]
+TODAY = datetime.date(2025, 3, 20)
+
+
+def _events(year: int, month: int) -> list[tuple[str, str]]:
+    events = []
+    for day in range(1, 29):
+        date = datetime.date(year, month, day)
+        if date.weekday() > 4:  # noqa: PLR2004
+            continue
+        events.append((f"{date}T07:{day:02d}:13.250000", "start"))
+        if day % 3 == 0:
+            events.append((f"{date}T12:00:00", "stop"))
+            events.append((f"{date}T12:45:00", "start"))
+        # forgotten stops run until midnight
+        if day % 5 != 0:
+            events.append((f"{date}T16:{day:02d}:00", "stop"))
+    return events
+
+
+def _pandas_report(events: list[tuple[str, str]], pauses: list[tuple[str, int]], month: int) -> pd.DataFrame:
+    """Compute the display frame of a month with pandas, independent of the engine and without running days."""
+    days = pd.date_range(f"2025-{month:02d}-01", periods=len(month_days(2025, month)), freq="D", name="day")
+    frame = pd.DataFrame(events, columns=["datetime", "event"])
+    frame["datetime"] = pd.to_datetime(frame["datetime"], format="ISO8601")
+    frame["day"] = frame["datetime"].dt.normalize()
+    # repeated starts / stops and stops before the first start of the day do not change the state
+    frame = frame[frame["event"] != frame.groupby("day")["event"].shift(fill_value="stop")].copy()
+    frame["pair"] = frame.groupby(["day", "event"]).cumcount()
+    pairs = frame.set_index(["day", "pair", "event"])["datetime"].unstack()
+    # a missing stop runs until midnight
+    open_end = pairs["stop"].isna()
+    pairs["stop"] = pairs["stop"].fillna(pairs["start"].dt.normalize() + pd.Timedelta(days=1))
+    minutes = pairs.apply(lambda column: column.dt.hour * 60 + column.dt.minute)
+    minutes.loc[open_end, "stop"] = 24 * 60
+    seconds = (pairs["stop"] - pairs["start"]).dt.total_seconds()
+    worked = np.floor(seconds.groupby(level="day").sum()).reindex(days, fill_value=0)
+    start = minutes["start"].groupby(level="day").min().reindex(days)
+    end = minutes["stop"].groupby(level="day").max().reindex(days)
+    pause = pd.Series({pd.Timestamp(day): time * 60 for day, time in pauses}, dtype=float).reindex(days, fill_value=0)
+
+    daily = pd.Series(SCHEDULE.daily_hours(days.values) * 3600, index=days)
+    is_free_day = days.isin(pd.DatetimeIndex(FREE_DAYS)) & SCHEDULE.workday_mask(days.values)
+    total = worked + daily.where(is_free_day, 0)
+    work = (total - pause).clip(lower=0)
+    break_time = ((end - start) * 60 - total).clip(lower=0).fillna(0)
+    target = daily.where(days <= pd.Timestamp(TODAY), 0)
+    overtime = (work - target).where(days < pd.Timestamp(TODAY), (work - target).clip(lower=0))
+
+    def to_times(minutes: pd.Series) -> list[datetime.time | None]:
+        return [
+            None if pd.isna(minute) else datetime.time(int(minute) // 60 % 24, int(minute) % 60) for minute in minutes
+        ]
+
+    return pd.DataFrame(
+        {
+            "total_time": (total / 3600).round(2),
+            "start_time": to_times(start),
+            "end_time": to_times(end),
+            "pause": (pause / 3600).round(2),
+            "work": (work / 3600).round(2),
+            "break_time": (break_time / 3600).round(2),
+            "target_time": (target / 3600).round(2),
+            "overtime": (overtime / 3600).round(2),
+        },
+        index=days,
+    )
+
+
+def _month_report(month: int) -> MonthReport:
+    events = _events(2025, month)
+    pauses = [(f"2025-{month:02d}-04", 30), (f"2025-{month:02d}-11", 45)]
+    base = build_month_base(events, pauses, 2025, month)
+    is_free_day = free_day_mask(base.days, FREE_DAYS, SCHEDULE.workday_mask(base.days))
+    return build_month_report(base, daily_target_seconds(SCHEDULE.daily_hours(base.days)), is_free_day, TODAY)
+
+
+@pytest.mark.parametrize("month", [2, 3, 4])
+def test_month_matches_pandas(month: int) -> None:
+    events = _events(2025, month)
+    pauses = [(f"2025-{month:02d}-04", 30), (f"2025-{month:02d}-11", 45)]
+    pd.testing.assert_frame_equal(_month_report(month).to_display_frame(), _pandas_report(events, pauses, month))
+
+
+def test_month_totals_match_pandas() -> None:
+    reports = [_month_report(month) for month in (2, 4)]
+    totals = month_totals([MonthReport.empty(), *reports])
+    assert totals.months.tolist() == [datetime.date(2025, 2, 1), datetime.date(2025, 3, 1), datetime.date(2025, 4, 1)]
+    # months without data between the first and last month are included as zero, like a monthly resample
+    frame = pd.concat(
+        pd.DataFrame({name: getattr(report, column) for column, name in HOUR_COLUMNS.items()}, index=report.days)
+        for report in reports
+    )
+    expected = (frame.set_axis(pd.DatetimeIndex(frame.index, name="day")).resample("MS").sum() / 3600).round(2)
+    expected.index = expected.index.to_period("M")
+    pd.testing.assert_frame_equal(totals.to_display_frame(), expected)
+    assert month_totals([MonthReport.empty()]).to_display_frame().empty
+
+
+def test_sum_by_year() -> None:
+    months = [(2024, 5), (2025, 4), (2025, 5)]
+    values = np.array([[100.0, -1.0], [50.0, 2.0], [20.5, 0.5]])
+    years, sums = sum_by_year(months, values)
+    assert years.tolist() == [2024, 2025]
+    np.testing.assert_array_equal(sums, [[100.0, -1.0], [70.5, 2.5]])
+
+
+def test_month_without_events() -> None:
+    base = build_month_base([], [("2025-03-04", 30)], 2025, 3)
+    report = build_month_report(base, np.array([], dtype=np.int32), np.array([], dtype=bool))
+    assert len(report) == 0
+    assert report.hours("work_s") == 0
+    assert report.to_display_frame().empty
+
+
+def test_free_day_mask() -> None:
+    days = month_days(2025, 3)
+    assert len(days) == 31  # noqa: PLR2004
+    mask = free_day_mask(days, FREE_DAYS, SCHEDULE.workday_mask(days))
+    # the 8th is a Saturday
+    assert days[mask].tolist() == [datetime.date(2025, 3, 3), datetime.date(2025, 3, 14)]
+
+
+def test_future_days_have_no_target() -> None:
+    events = [("2025-03-03T08:00:00", "start"), ("2025-03-03T12:00:00", "stop")]
+    base = build_month_base(events, [], 2025, 3)
+    daily_seconds = daily_target_seconds(SCHEDULE.daily_hours(base.days))
+    report = build_month_report(base, daily_seconds, np.zeros(len(base), dtype=bool), today=datetime.date(2025, 3, 3))
+    assert report.hours("target_s") == 8  # noqa: PLR2004
+    # missing hours of today do not count as negative overtime
+    assert report.hours("overtime_s") == 0
+
+
+def test_day_work_time_running_day() -> None:
+    day = datetime.date(2025, 3, 3)
+    events = [("2025-03-03T08:00:00", "start"), ("2025-03-03T12:00:00", "stop"), ("2025-03-03T13:00:00", "start")]
+    now = datetime.datetime(2025, 3, 3, 15, 30)
+    assert day_work_time(events, day, now) == (6.5 * 3600, 8 * 60, 15 * 60 + 30)
+    # not today, so the start runs until midnight
+    assert day_work_time(events, day, now + datetime.timedelta(days=1)) == (15 * 3600, 8 * 60, 24 * 60)
+    assert day_work_time([], day, now) == (0, None, None)
+
+
+def test_month_columns_keep_the_rows() -> None:
+    events = _events(2025, 3)
+    pauses = [("2025-03-04", 30), ("2025-03-05", 15)]
+    columns = MonthColumns.from_rows(events, pauses)
+    assert columns.event_times.dtype == "datetime64[us]"
+    assert columns.to_rows() == (events, pauses)
+    base = build_month_base_from_columns(columns, 2025, 3)
+    expected = build_month_base(events, pauses, 2025, 3)
+    for name in ("days", "worked_s", "start_min", "end_min", "pause_s"):
+        np.testing.assert_array_equal(getattr(base, name), getattr(expected, name))
@@ -0,0 +1,61 @@
+import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.database_controller import DatabaseController
+from src.free_day_calendar import FreeDayCalendar
+from src.schedule import SCHEDULE_START, ScheduleHistory, ScheduleSegment
+
+FULL_TIME = ScheduleSegment(SCHEDULE_START, (0, 1, 2, 3, 4), (8.0, 8.0, 8.0, 8.0, 8.0, 0.0, 0.0))
+# thursday 1st may and saturday 3rd may
+HOLIDAYS = [datetime.date(2025, 5, 1), datetime.date(2025, 5, 3)]
+
+
+@pytest.fixture
+def free_day_calendar(db_controller: DatabaseController) -> FreeDayCalendar:
+    mock_config = MagicMock(country="DE", subdiv=None)
+    mock_config.get_holidays.return_value = HOLIDAYS
+    return FreeDayCalendar(ScheduleHistory([FULL_TIME]), db_controller, mock_config)
+
+
+def test_free_days_only_on_workdays(free_day_calendar: FreeDayCalendar, db_controller: DatabaseController) -> None:
+    db_controller.add_time_off(datetime.date(2025, 7, 1), "vacation")
+    db_controller.add_time_off(datetime.date(2025, 7, 5), "vacation")
+    assert free_day_calendar.is_free_day(datetime.date(2025, 5, 1))
+    assert not free_day_calendar.is_free_day(datetime.date(2025, 5, 3))
+    assert free_day_calendar.is_free_day(datetime.date(2025, 5, 3), workdays_only=False)
+    assert datetime.date(2025, 7, 1) in free_day_calendar.free_days(2025)
+    assert datetime.date(2025, 7, 5) not in free_day_calendar.free_days(2025)
+
+
+def test_mask_matches_single_lookups_across_years(free_day_calendar: FreeDayCalendar) -> None:
+    days = np.arange(np.datetime64("2024-12-20"), np.datetime64("2025-07-10"))
+    expected = [free_day_calendar.is_free_day(day.astype(datetime.date)) for day in days]
+    assert free_day_calendar.mask(days).tolist() == expected
+    assert len(free_day_calendar.month_mask(2024, 2)) == 29  # noqa: PLR2004
+
+
+def test_time_off_changes_are_picked_up(free_day_calendar: FreeDayCalendar, db_controller: DatabaseController) -> None:
+    day = datetime.date(2025, 5, 5)
+    assert not free_day_calendar.is_free_day(day)
+    db_controller.add_time_off(day, "vacation")
+    assert free_day_calendar.is_free_day(day)
+    db_controller.remove_time_off(day)
+    assert not free_day_calendar.is_free_day(day)
+
+
+def test_set_schedule_does_not_access_database(
+    free_day_calendar: FreeDayCalendar, db_controller: DatabaseController
+) -> None:
+    db_controller.add_time_off(datetime.date(2025, 7, 2), "vacation")
+    db_controller.add_time_off(datetime.date(2025, 7, 3), "vacation")
+    free_day_calendar.free_days(2025)
+    part_time = ScheduleSegment(datetime.date(2025, 6, 1), (0, 1, 2), (6.0, 6.0, 6.0, 0.0, 0.0, 0.0, 0.0))
+    with patch.object(db_controller, "get_time_off_days") as mock_time_off:
+        free_day_calendar.set_schedule(ScheduleHistory([FULL_TIME, part_time]))
+        # thursday 3rd july is no longer a workday
+        assert not free_day_calendar.is_free_day(datetime.date(2025, 7, 3))
+        assert free_day_calendar.is_free_day(datetime.date(2025, 7, 2))
+    mock_time_off.assert_not_called()
@@ -0,0 +1,41 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import holidays
+
+from src.holiday_catalog import load_country_catalog
+
+COUNTRIES = {"DE": ("BB", "BE"), "US": ("AK",)}
+
+
+def test_catalog_is_built_once_and_stored(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.json"
+    with patch("holidays.list_supported_countries", return_value=COUNTRIES) as mock_list:
+        assert load_country_catalog(path) == {"DE": ["BB", "BE"], "US": ["AK"]}
+        assert load_country_catalog(path) == {"DE": ["BB", "BE"], "US": ["AK"]}
+    mock_list.assert_called_once()
+    assert json.loads(path.read_text())["holidays_version"] == holidays.__version__
+
+
+def test_catalog_of_other_version_is_built_again(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"holidays_version": "0.0", "countries": {"XX": []}}))
+    with patch("holidays.list_supported_countries", return_value=COUNTRIES):
+        assert list(load_country_catalog(path)) == ["DE", "US"]
+    assert "XX" not in json.loads(path.read_text())["countries"]
+
+
+def test_broken_catalog_is_built_again(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.json"
+    path.write_text("{not json")
+    with patch("holidays.list_supported_countries", return_value=COUNTRIES):
+        assert list(load_country_catalog(path)) == ["DE", "US"]
+
+
+def test_stored_catalog_does_not_import_holidays(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"holidays_version": holidays.__version__, "countries": {"DE": ["BB"]}}))
+    with patch.dict(sys.modules, {"holidays": None}):
+        assert load_country_catalog(path) == {"DE": ["BB"]}
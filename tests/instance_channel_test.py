@@ -0,0 +1,71 @@
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from src.instance_channel import send_command
+from src.instance_server import InstanceServer
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="uses unix socket paths")
+
+
+@pytest.fixture
+def app() -> QCoreApplication:
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _send_while_serving(
+    app: QCoreApplication, server_name: str, command: str, **arguments: Any
+) -> dict[str, Any] | None:
+    """Send the command from a thread, while the event loop of the server runs in this one."""
+    responses = []
+    client = threading.Thread(target=lambda: responses.append(send_command(command, server_name, **arguments)))
+    client.start()
+    deadline = time.monotonic() + 5
+    while client.is_alive() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    client.join()
+    return responses[0]
+
+
+def test_no_running_app(tmp_path: Path) -> None:
+    assert send_command("status", str(tmp_path / "instance.sock")) is None
+    # socket left over by a crashed app
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(stale))
+    assert send_command("status", str(stale)) is None
+
+
+def test_commands_are_handled_by_server(app: QCoreApplication, tmp_path: Path) -> None:
+    requests = []
+
+    def handler(request: dict[str, Any]) -> tuple[bool, str]:
+        requests.append(request)
+        if request["command"] == "fail":
+            raise ValueError("broken")
+        return True, f"Did {request['command']}"
+
+    server_name = str(tmp_path / "instance.sock")
+    # the socket file of a crashed app is replaced
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(server_name)
+    server = InstanceServer(handler, server_name)
+    assert server.listen()
+    try:
+        response = _send_while_serving(app, server_name, "start", at="2025-03-03T08:00:00")
+        assert response == {"ok": True, "message": "Did start"}
+        assert requests == [{"command": "start", "at": "2025-03-03T08:00:00"}]
+        response = _send_while_serving(app, server_name, "fail")
+        assert response is not None
+        assert not response["ok"]
+        assert "broken" in response["message"]
+    finally:
+        server.close()
+    assert send_command("status", server_name) is None
@@ -0,0 +1,67 @@
+import pandas as pd
+from matplotlib.figure import Figure
+
+from src.plot_renderer import OffscreenPlot, PlotColors, PlotContent, WorkTimePlot
+
+COLORS = PlotColors(background="#ffffff", text="#000000")
+
+
+def _plot_df(days: int, work: float = 8.5) -> pd.DataFrame:
+    index = pd.date_range("2025-05-01", periods=days, freq="D")
+    work_values = [work if day.weekday() < 5 else 0.0 for day in index]  # noqa: PLR2004
+    return pd.DataFrame(
+        {
+            "work": work_values,
+            "overtime": [value - 8.0 if value else 0.0 for value in work_values],
+            "color": "positive",
+            "target_time": [8.0 if value else 0.0 for value in work_values],
+            "is_free_day": [day.day == 1 for day in index],
+        },
+        index=index,
+    )
+
+
+def test_update_reuses_artists_for_same_number_of_bars() -> None:
+    plot = WorkTimePlot(Figure(), COLORS)
+    plot.update(_plot_df(31), plot_month=True, title="May")
+    work_bars = plot.work.bars if plot.work else None
+    plot.update(_plot_df(31, work=6.0), plot_month=True, title="May")
+    assert plot.work is not None
+    assert plot.work.bars is work_bars
+    assert plot.work.bars[1].get_height() == 6.0  # noqa: PLR2004
+    assert plot.overtime is not None
+    assert plot.overtime.bars[1].get_height() == -2.0  # noqa: PLR2004
+    assert not plot.work.labels[2].get_visible()
+    assert plot.ax_work.get_ylim()[1] >= 8.0  # noqa: PLR2004
+
+
+def test_target_lines_only_for_worked_days() -> None:
+    plot = WorkTimePlot(Figure(), COLORS)
+    df = _plot_df(30)
+    plot.update(df, plot_month=True, title="June")
+    assert len(plot.target_lines.get_segments()) == (df["work"] > 0).sum()
+
+
+def test_bars_are_created_again_if_number_changes() -> None:
+    plot = WorkTimePlot(Figure(), COLORS)
+    plot.update(_plot_df(31), plot_month=True, title="May")
+    plot.update(_plot_df(28), plot_month=True, title="February")
+    assert plot.work is not None
+    assert len(plot.work.bars) == len(plot.ax_work.patches) == 28  # noqa: PLR2004
+    assert plot.ax_work.get_xlim() == (-0.5, 27.5)
+
+
+def test_offscreen_plot_renders_pixels_and_png() -> None:
+    plot = OffscreenPlot(COLORS)
+    content = PlotContent(_plot_df(31), plot_month=True, title="May")
+    rgba = plot.render_rgba(content, 640, 480)
+    assert len(rgba) == 640 * 480 * 4
+    png = plot.render_png(content, 5.0, 4.0, dpi=100)
+    assert png.startswith(b"\x89PNG")
+
+
+def test_content_version_changes_with_data() -> None:
+    content = PlotContent(_plot_df(31), plot_month=True, title="May")
+    assert content.version == PlotContent(_plot_df(31), plot_month=True, title="May").version
+    assert content.version != PlotContent(_plot_df(31, work=6.0), plot_month=True, title="May").version
+    assert content.version != PlotContent(_plot_df(31), plot_month=True, title="June").version
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.plot_renderer import OffscreenPlot, PlotColors, PlotContent
+from src.plot_worker import RenderJob, RenderWorker, render_image
+
+COLORS = PlotColors(background="#ffffff", text="#000000")
+
+
+def _content() -> PlotContent:
+    index = pd.date_range("2025-01-31", periods=12, freq="ME")
+    df = pd.DataFrame(
+        {"work": 160.0, "overtime": 2.0, "color": "positive", "target_time": 158.0, "is_free_day": False},
+        index=index,
+    )
+    return PlotContent(df, plot_month=False, title="2025")
+
+
+def _job(generation: int = 1, dpi: float = 128, save_path: Path | None = None) -> RenderJob:
+    key = (False, "2025", 0, ("#ffffff", "#000000"), (400, 300, dpi))
+    return RenderJob(generation, key, _content(), 400, 300, dpi, save_path=save_path)
+
+
+def test_render_image_uses_device_pixel_ratio() -> None:
+    image = render_image(OffscreenPlot(COLORS), _job(dpi=256))
+    assert (image.width(), image.height()) == (400, 300)
+    assert image.devicePixelRatio() == 2.0  # noqa: PLR2004
+
+
+def test_outdated_display_job_is_not_rendered() -> None:
+    worker = RenderWorker(_job(generation=1), OffscreenPlot(COLORS), lambda generation: generation == 2)  # noqa: PLR2004
+    rendered = []
+    worker.signals.rendered.connect(lambda job, image: rendered.append(image))
+    worker.run()
+    assert rendered == []
+
+
+def test_save_job_writes_png(tmp_path: Path) -> None:
+    path = tmp_path / "plot.png"
+    # saving is done even if the displayed plot changed meanwhile
+    worker = RenderWorker(_job(dpi=300, save_path=path), OffscreenPlot(COLORS), lambda _: False)
+    saved: list[Path] = []
+    worker.signals.saved.connect(saved.append)
+    worker.run()
+    assert saved == [path]
+    assert path.read_bytes().startswith(b"\x89PNG")
@@ -0,0 +1,36 @@
+import datetime
+
+import numpy as np
+
+from src.schedule import SCHEDULE_START, ScheduleHistory, ScheduleSegment
+
+FULL_TIME = ScheduleSegment(SCHEDULE_START, (0, 1, 2, 3, 4), (8.0, 8.0, 8.0, 8.0, 8.0, 0.0, 0.0))
+PART_TIME = ScheduleSegment(datetime.date(2025, 6, 1), (0, 1, 2), (6.0, 6.0, 6.0, 0.0, 0.0, 0.0, 0.0))
+
+
+def test_daily_hours_uses_schedule_at_date() -> None:
+    history = ScheduleHistory([PART_TIME, FULL_TIME])
+    # friday 30th may, monday 2nd june, thursday 5th june
+    days = np.array([datetime.date(2025, 5, 30), datetime.date(2025, 6, 2), datetime.date(2025, 6, 5)])
+    assert history.daily_hours(days).tolist() == [8.0, 6.0, 0.0]
+    assert history.workday_mask(days).tolist() == [True, True, False]
+
+
+def test_days_before_first_schedule_use_first_schedule() -> None:
+    history = ScheduleHistory([PART_TIME])
+    assert history.segment_at(datetime.date(2020, 1, 1)) == PART_TIME
+
+
+def test_fingerprint_only_changes_for_affected_range() -> None:
+    history = ScheduleHistory([FULL_TIME])
+    changed = history.with_segment(PART_TIME)
+    may = (datetime.date(2025, 5, 1), datetime.date(2025, 5, 31))
+    june = (datetime.date(2025, 6, 1), datetime.date(2025, 6, 30))
+    assert history.fingerprint(*may) == changed.fingerprint(*may)
+    assert history.fingerprint(*june) != changed.fingerprint(*june)
+
+
+def test_with_segment_replaces_later_schedules() -> None:
+    history = ScheduleHistory([FULL_TIME, PART_TIME])
+    replaced = history.with_segment(ScheduleSegment(datetime.date(2025, 1, 1), (0,), (1.0,) * 7))
+    assert [segment.effective_from for segment in replaced.segments] == [SCHEDULE_START, datetime.date(2025, 1, 1)]
@@ -0,0 +1,60 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from unittest.mock import patch
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from src.filepath import ALEMBIC_INI_PATH, ALEMBIC_SCRIPT_PATH
+from src.schema import SCHEMA_BASE, SCHEMA_HEAD, get_schema_revision, get_table_names, is_schema_current
+from src.startup import run_db_migrations
+
+
+def _schedule_rows(path: Path) -> int:
+    with closing(sqlite3.connect(path)) as connection:
+        return connection.execute("SELECT COUNT(*) FROM WorkSchedule").fetchone()[0]
+
+
+def test_schema_revisions_match_migrations() -> None:
+    config = Config(str(ALEMBIC_INI_PATH))
+    config.set_main_option("script_location", str(ALEMBIC_SCRIPT_PATH))
+    script = ScriptDirectory.from_config(config)
+    assert script.get_current_head() == SCHEMA_HEAD
+    assert script.get_base() == SCHEMA_BASE
+
+
+def test_migrate_new_database(tmp_path: Path) -> None:
+    path = tmp_path / "time_data.db"
+    assert get_schema_revision(path) is None
+    run_db_migrations(path)
+    assert is_schema_current(path)
+    assert {"Events", "Pause", "TimeOff", "WorkSchedule"} <= get_table_names(path)
+    assert _schedule_rows(path) == 1
+    # the named unique index is the only one on the start dates
+    with closing(sqlite3.connect(path)) as connection:
+        query = "SELECT name FROM sqlite_master WHERE tbl_name = 'WorkSchedule' AND type = 'index'"
+        assert [name for (name,) in connection.execute(query)] == ["idx_effective_from"]
+
+
+def test_migrate_legacy_database(tmp_path: Path) -> None:
+    path = tmp_path / "time_data.db"
+    with closing(sqlite3.connect(path)) as connection:
+        connection.executescript(
+            "CREATE TABLE Events (ID INTEGER PRIMARY KEY, Date DATETIME NOT NULL, Action TEXT NOT NULL);"
+            "CREATE TABLE Pause (ID INTEGER PRIMARY KEY, Date DATE NOT NULL UNIQUE, Time INTEGER NOT NULL);"
+            "CREATE TABLE Vacation (ID INTEGER PRIMARY KEY, Date DATE NOT NULL UNIQUE);"
+            "INSERT INTO Vacation (Date) VALUES ('2025-05-02');"
+        )
+    run_db_migrations(path)
+    assert is_schema_current(path)
+    with closing(sqlite3.connect(path)) as connection:
+        assert connection.execute("SELECT Date, Reason FROM TimeOff").fetchall() == [("2025-05-02", "Vacation")]
+
+
+def test_current_database_does_not_run_alembic(tmp_path: Path) -> None:
+    path = tmp_path / "time_data.db"
+    run_db_migrations(path)
+    with patch("alembic.command.upgrade") as mock_upgrade:
+        run_db_migrations(path)
+    mock_upgrade.assert_not_called()
@@ -0,0 +1,94 @@
+import datetime
+import sqlite3
+from collections.abc import Generator
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from src.database_controller import DatabaseController
+from src.schedule import ScheduleSegment
+from src.sqlite_database import SqliteDatabase
+
+# tables written by both, the ID is left out since it only depends on the order of the inserts
+STORED_COLUMNS = {"Events": "Date, Action", "Pause": "Date, Time", "TimeOff": "Date, Reason"}
+
+
+@pytest.fixture
+def databases(tmp_path: Path) -> Generator[tuple[SqliteDatabase, DatabaseController], None, None]:
+    path = tmp_path / "time_data.db"
+    controller = DatabaseController(db_url=str(path))
+    database = SqliteDatabase(path)
+    yield database, controller
+    database.close()
+
+
+def _stored_rows(path: Path) -> dict[str, list[tuple]]:
+    with closing(sqlite3.connect(path)) as connection:
+        return {
+            table: connection.execute(f"SELECT {columns} FROM {table} ORDER BY {columns}").fetchall()
+            for table, columns in STORED_COLUMNS.items()
+        }
+
+
+def test_writes_are_stored_like_controller(tmp_path: Path) -> None:
+    # the same changes through both layers need to end up in the same rows, in the storage format of sqlalchemy
+    controller = DatabaseController(db_url=str(tmp_path / "controller.db"))
+    DatabaseController(db_url=str(tmp_path / "sqlite.db")).engine.dispose()
+    database = SqliteDatabase(tmp_path / "sqlite.db")
+    for writer in (controller, database):
+        writer.add_event("start", datetime.datetime(2025, 3, 3, 8, 0))
+        writer.add_event("stop", datetime.datetime(2025, 3, 3, 16, 30, 15, 250))
+        writer.add_pause(30, datetime.date(2025, 3, 3))
+        writer.add_pause(-5, datetime.date(2025, 3, 3))
+        writer.add_pause(15, datetime.date(2025, 3, 4))
+        writer.add_time_off(datetime.date(2025, 5, 2), "Sick Leave")
+        # an existing day is kept as it is
+        writer.add_time_off(datetime.date(2025, 5, 2), "Vacation")
+        writer.add_time_off(datetime.date(2025, 12, 31), "Vacation")
+        writer.remove_time_off(datetime.date(2025, 12, 31))
+    database.close()
+    controller.engine.dispose()
+    assert _stored_rows(tmp_path / "sqlite.db") == _stored_rows(tmp_path / "controller.db")
+    assert _stored_rows(tmp_path / "sqlite.db")["Pause"] == [("2025-03-03", 25), ("2025-03-04", 15)]
+
+
+def test_events_and_pauses_match_controller(databases: tuple[SqliteDatabase, DatabaseController]) -> None:
+    database, controller = databases
+    controller.add_event("start", datetime.datetime(2025, 3, 3, 8, 0))
+    database.add_event("stop", datetime.datetime(2025, 3, 3, 16, 30, 15))
+    database.add_event("start", datetime.datetime(2025, 3, 31, 23, 59, 59, 500))
+    controller.add_event("stop", datetime.datetime(2025, 4, 1, 0, 30))
+    controller.add_pause(30, datetime.date(2025, 3, 3))
+    database.add_pause(15, datetime.date(2025, 3, 3))
+    database.add_pause(-5, datetime.date(2025, 3, 31))
+    controller.add_pause(10, datetime.date(2025, 4, 1))
+
+    march, april = datetime.date(2025, 3, 1), datetime.date(2025, 4, 1)
+    for month in (march, april):
+        assert database.get_month_data(month) == controller.get_month_data(month)
+    assert database.get_month_data(march)[1][:2] == [("2025-03-03", 45), ("2025-03-31", -5)]
+    for day in (datetime.date(2025, 3, 3), datetime.date(2025, 3, 4), april):
+        assert database.get_day_data(day) == controller.get_day_data(day)
+    assert database.get_period_work(march, april) == controller.get_period_work(march, april)
+    assert database.get_period_pause(march, april) == controller.get_period_pause(march, april)
+    assert database.get_last_event() == controller.get_last_event() == ("2025-04-01T00:30:00", "stop")
+
+
+def test_time_off_and_schedules_match_controller(databases: tuple[SqliteDatabase, DatabaseController]) -> None:
+    database, controller = databases
+    assert database.get_last_event() is controller.get_last_event() is None
+    assert database.add_time_off(datetime.date(2025, 5, 2), "Sick Leave")
+    assert not database.add_time_off(datetime.date(2025, 5, 2), "Vacation")
+    controller.add_time_off(datetime.date(2025, 12, 31), "Vacation")
+    controller.add_time_off(datetime.date(2026, 1, 1), "Vacation")
+    assert database.get_time_off_days(2025) == controller.get_time_off_days(2025)
+    assert database.remove_time_off(datetime.date(2025, 12, 31))
+    assert not database.remove_time_off(datetime.date(2025, 12, 31))
+    assert controller.get_time_off_days(2025) == [datetime.date(2025, 5, 2)]
+    assert [time_off.reason for time_off in controller.get_time_off(2025)] == ["Sick Leave"]
+
+    controller.set_work_schedule(datetime.date(2025, 1, 1), [0, 1, 2, 3], [8.5, 8, 8, 8, 0, 0, 0])
+    controller.set_work_schedule(datetime.date(2024, 1, 1), [], [0] * 7)
+    schedules = [ScheduleSegment(*row) for row in database.get_work_schedules()]
+    assert schedules == [ScheduleSegment.from_model(model) for model in controller.get_work_schedules()]
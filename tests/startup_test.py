@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# packages only needed for the data, config and export, not for the tray
+HEAVY_PACKAGES = ("pandas", "matplotlib", "seaborn", "xlsxwriter", "holidays", "git")
+# share of the own modules in the import of the main window, the rest is mostly Qt and sqlalchemy (about 15 %)
+OWN_IMPORT_SHARE = 0.3
+
+
+def _import_times(module: str, tmp_path: Path) -> dict[str, tuple[int, int]]:
+    """Import the module in a fresh interpreter and return the own and cumulative import time (us) of all modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env={**os.environ, "XDG_CONFIG_HOME": str(tmp_path), "APPDATA": str(tmp_path), "HOME": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    # lines look like "import time:  self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def _loaded_packages(times: dict[str, tuple[int, int]]) -> set[str]:
+    return {name.split(".")[0] for name in times}
+
+
+def test_main_window_does_not_load_plotting(tmp_path: Path) -> None:
+    packages = _loaded_packages(_import_times("src.ui_mainwindow", tmp_path))
+    assert "PyQt6" in packages
+    assert "matplotlib" not in packages
+    assert "seaborn" not in packages
+
+
+def test_main_window_does_not_load_heavy_packages(tmp_path: Path) -> None:
+    packages = _loaded_packages(_import_times("src.ui_mainwindow", tmp_path))
+    assert packages.isdisjoint(HEAVY_PACKAGES), packages.intersection(HEAVY_PACKAGES)
+
+
+def test_store_does_not_load_pandas(tmp_path: Path) -> None:
+    # the store computes with numpy, frames are only built for display and export
+    packages = _loaded_packages(_import_times("src.datastore", tmp_path))
+    assert "numpy" in packages
+    assert "pandas" not in packages
+
+
+def test_main_window_own_import_share(tmp_path: Path) -> None:
+    # compared to the whole import in the same interpreter, so the budget does not depend on the speed of the machine
+    times = _import_times("src.ui_mainwindow", tmp_path)
+    own = sum(own for name, (own, _) in times.items() if name.split(".")[0] == "src")
+    assert own < OWN_IMPORT_SHARE * times["src.ui_mainwindow"][1]
@@ -1,21 +1,27 @@
 import datetime
 from collections.abc import Generator
+from concurrent.futures import ProcessPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
 
-from src.datastore import MonthData, Store
+from src.config_handler import CONFIG_HANDLER
+from src.datastore import MonthData, MonthSummary, Store
+from src.engine import NO_MINUTE
+from src.schedule import SCHEDULE_START, ScheduleHistory, ScheduleSegment
 
 
 @pytest.fixture
 def mock_db_controller() -> MagicMock:
     mock = MagicMock()
     # Default: no data
+    mock.data_version = 0
     mock.get_time_off_days.return_value = []
     mock.get_day_data.return_value = ([], [])
     mock.get_month_data.return_value = ([], [])
     mock.get_months_with_data.return_value = []
+    mock.get_work_schedules.return_value = []
     return mock
 
 
@@ -39,7 +45,7 @@ def test_update_data_with_data(store_and_controller: tuple[Store, MagicMock]) ->
     store_instance, mock_db_controller = store_and_controller
     test_date = datetime.date(2025, 5, 20)
     # Simulate a work event and a pause
-    mock_db_controller.get_day_data.return_value = (
+    mock_db_controller.get_month_data.return_value = (
         [("2025-05-20T08:00:00", "start"), ("2025-05-20T16:00:00", "stop")],
         [("2025-05-20", 60)],
     )
@@ -52,7 +58,7 @@ def test_update_data_with_data(store_and_controller: tuple[Store, MagicMock]) ->
 def test_update_data_none_date(store_and_controller: tuple[Store, MagicMock]) -> None:
     store_instance, mock_db_controller = store_and_controller
     # Should use current_date if None
-    mock_db_controller.get_day_data.return_value = ([("2025-05-20T08:00:00", "start")], [])
+    mock_db_controller.get_month_data.return_value = ([("2025-05-20T08:00:00", "start")], [])
     store_instance.update_data(None)
     assert store_instance.current_date == store_instance.current_date
 
@@ -61,9 +67,8 @@ def test_get_free_days_with_vacation_and_holiday(store_and_controller: tuple[Sto
     store_instance, mock_db_controller = store_and_controller
     # Simulate vacation and holiday
     mock_db_controller.get_time_off_days.return_value = [datetime.date(2025, 5, 1)]
-    with patch("src.datastore.CONFIG_HANDLER") as mock_config:
-        mock_config.config.get_holidays.return_value = [datetime.date(2025, 5, 2)]
-        mock_config.config.workdays = [0, 1, 2, 3, 4]
+    with patch.object(store_instance.calendar, "config") as mock_config:
+        mock_config.get_holidays.return_value = [datetime.date(2025, 5, 2)]
         free_days = store_instance.get_free_days(2025)
         assert datetime.date(2025, 5, 1) in free_days or datetime.date(2025, 5, 2) in free_days
 
@@ -89,11 +94,35 @@ def test_get_year_data_returns_dataframe(store_and_controller: tuple[Store, Magi
 def test_generate_daily_data_with_pause(store_and_controller: tuple[Store, MagicMock]) -> None:
     store_instance, mock_db_controller = store_and_controller
     test_date = datetime.date(2025, 5, 20)
-    mock_db_controller.get_day_data.return_value = ([("2025-05-20T08:00:00", "start")], [("2025-05-20", 30)])
+    mock_db_controller.get_month_data.return_value = ([("2025-05-20T08:00:00", "start")], [("2025-05-20", 30)])
     store_instance.generate_daily_data(test_date)
     assert any("Pause" in entry for entry in store_instance.daily_data)
 
 
+def test_update_data_slices_day_from_month_events(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    mock_db_controller.get_month_data.return_value = (
+        [
+            ("2025-05-19T08:00:00", "start"),
+            ("2025-05-19T16:00:00", "stop"),
+            ("2025-05-20T09:00:00", "start"),
+            ("2025-05-20T17:00:00", "stop"),
+            ("2025-05-31T10:00:00", "start"),
+        ],
+        [("2025-05-20", 30)],
+    )
+    store_instance.update_data(datetime.date(2025, 5, 20))
+    mock_db_controller.get_day_data.assert_not_called()
+    assert store_instance.daily_data == [
+        ("2025-05-20T09:00:00", "start"),
+        ("2025-05-20T17:00:00", "stop"),
+        ("Pause", "30"),
+    ]
+    month_data = store_instance.all_data[(2025, 5)]
+    assert month_data.get_day_data(datetime.date(2025, 5, 31)) == ([("2025-05-31T10:00:00", "start")], [])
+    assert month_data.get_day_data(datetime.date(2025, 5, 1)) == ([], [])
+
+
 def test_generate_month_data_empty_work(store_and_controller: tuple[Store, MagicMock]) -> None:
     store_instance, mock_db_controller = store_and_controller
     test_date = datetime.date(2025, 5, 1)
@@ -128,3 +157,215 @@ def test_calculate_overtime_totals_with_data(store_and_controller: tuple[Store,
     store_instance.calculate_overtime_totals()
     assert isinstance(store_instance.total_overtime, float)
     assert isinstance(store_instance.overtime_by_year, dict)
+
+
+def test_generate_month_data_reuses_base_on_config_change(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    test_date = datetime.date(2025, 5, 1)
+    mock_db_controller.get_month_data.return_value = (
+        [("2025-05-01T08:00:00", "start"), ("2025-05-01T16:00:00", "stop")],
+        [],
+    )
+    month_data = store_instance.generate_month_data(test_date)
+    store_instance.all_data[(2025, 5)] = month_data
+    month_data.config_hash = 0
+    with patch.object(store_instance, "_generate_month_base") as mock_base:
+        cached = store_instance.generate_month_data(test_date)
+    mock_base.assert_not_called()
+    assert cached is month_data
+    assert cached.config_hash != 0
+
+
+def test_apply_config_change_does_not_access_database(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    mock_db_controller.get_months_with_data.return_value = [(2025, 5)]
+    mock_db_controller.get_month_data.return_value = (
+        [("2025-05-01T08:00:00", "start"), ("2025-05-01T18:00:00", "stop")],
+        [],
+    )
+    store_instance.calculate_overtime_totals()
+    base = store_instance.all_data[(2025, 5)].base
+    daily_hours = 10.0
+    store_instance.schedule = ScheduleHistory([ScheduleSegment(SCHEDULE_START, (0, 1, 2, 3, 4), (daily_hours,) * 7)])
+    mock_db_controller.reset_mock()
+    store_instance.apply_config_change()
+    assert not mock_db_controller.method_calls
+    month_df = store_instance.all_data[(2025, 5)].df
+    assert store_instance.all_data[(2025, 5)].base is base
+    assert month_df.loc["2025-05-01", "target_time"] == daily_hours
+    assert month_df.loc["2025-05-01", "overtime"] == 0.0
+    assert store_instance.total_overtime == month_df["overtime"].sum().round(2)
+
+
+def test_change_work_schedule_keeps_closed_months(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    mock_db_controller.get_months_with_data.return_value = [(2025, 4), (2025, 5)]
+    mock_db_controller.get_month_data.return_value = ([("2025-04-01T08:00:00", "start")], [])
+    store_instance.calculate_overtime_totals()
+    april_report = store_instance.all_data[(2025, 4)].report
+    may_report = store_instance.all_data[(2025, 5)].report
+    with patch("src.datastore.CONFIG_HANDLER") as mock_config:
+        mock_config.config.country = CONFIG_HANDLER.config.country
+        mock_config.config.subdiv = CONFIG_HANDLER.config.subdiv
+        mock_config.config.get_holidays.return_value = []
+        mock_config.config.workdays = [0, 1, 2, 3]
+        mock_config.config.get_all_daily_hours.return_value = [10.0] * 4 + [0.0] * 3
+        store_instance.change_work_schedule(datetime.date(2025, 5, 1))
+        store_instance.apply_config_change()
+    mock_db_controller.set_work_schedule.assert_called_with(
+        datetime.date(2025, 5, 1), [0, 1, 2, 3], [10.0] * 4 + [0.0] * 3
+    )
+    assert store_instance.all_data[(2025, 4)].report is april_report
+    assert store_instance.all_data[(2025, 5)].report is not may_report
+    # friday 2nd may is no longer a workday
+    assert store_instance.all_data[(2025, 5)].df.loc["2025-05-02", "target_time"] == 0.0
+
+
+def test_month_cache_evicts_least_recently_used(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    store_instance.max_cached_months = 2
+    mock_db_controller.get_month_data.return_value = ([("2025-01-01T08:00:00", "start")], [])
+    for month in (1, 2, 3):
+        store_instance.generate_month_data(datetime.date(2024, month, 1))
+    store_instance.generate_month_data(datetime.date(2024, 2, 1))
+    store_instance.generate_month_data(datetime.date(2024, 4, 1))
+    assert list(store_instance.all_data) == [(2024, 2), (2024, 4)]
+    assert set(store_instance.summaries) == {(2024, month) for month in (1, 2, 3, 4)}
+    assert all(isinstance(summary, MonthSummary) for summary in store_instance.summaries.values())
+
+
+def test_overtime_totals_use_summaries_of_evicted_months(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    store_instance.max_cached_months = 1
+    mock_db_controller.get_months_with_data.return_value = [(2024, 5), (2025, 5)]
+    mock_db_controller.get_month_data.return_value = (
+        [("2025-05-01T08:00:00", "start"), ("2025-05-01T18:00:00", "stop")],
+        [],
+    )
+    store_instance.calculate_overtime_totals()
+    assert list(store_instance.all_data) == [(2025, 5)]
+    summary_2024 = store_instance.summaries[(2024, 5)]
+    assert store_instance.overtime_by_year[2024] == round(summary_2024.overtime, 2)
+    expected_total = round(summary_2024.overtime + store_instance.summaries[(2025, 5)].overtime, 2)
+    assert store_instance.total_overtime == expected_total
+
+
+def test_evicted_months_are_not_built_again(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    store_instance.max_cached_months = 4
+    months = [(2024, month) for month in range(1, 13)]
+
+    def month_data(selected_date: datetime.date) -> tuple[list[tuple[str, str]], list[tuple[str, int]]]:
+        day = selected_date.replace(day=2).isoformat()
+        return [(f"{day}T08:00:00", "start"), (f"{day}T17:00:00", "stop")], []
+
+    mock_db_controller.get_months_with_data.return_value = months
+    mock_db_controller.get_month_data.side_effect = month_data
+    store_instance.calculate_overtime_totals()
+    total_overtime = store_instance.total_overtime
+    assert len(store_instance.all_data) == store_instance.max_cached_months
+    with patch.object(store_instance, "_generate_month_base", wraps=store_instance._generate_month_base) as mock_base:
+        store_instance.calculate_overtime_totals()
+        assert mock_base.call_count == 0
+        assert store_instance.total_overtime == total_overtime
+        # only the changed month is built again
+        mock_db_controller.get_month_data.side_effect = lambda selected_date: (
+            ([("2024-01-02T08:00:00", "start"), ("2024-01-02T18:00:00", "stop")], [])
+            if selected_date.month == 1
+            else month_data(selected_date)
+        )
+        store_instance.calculate_overtime_totals()
+        assert mock_base.call_count == 1
+    assert store_instance.total_overtime == total_overtime + 1
+
+
+def test_get_years_data_sums_month_summaries(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, _ = store_and_controller
+    store_instance.summaries = {
+        (2024, 5): MonthSummary(overtime=-1.0, work=100.0, target_time=101.0, data_hash=0, config_hash=0),
+        (2025, 4): MonthSummary(overtime=2.0, work=50.0, target_time=48.0, data_hash=0, config_hash=0),
+        (2025, 5): MonthSummary(overtime=0.5, work=20.5, target_time=20.0, data_hash=0, config_hash=0),
+    }
+    years_df = store_instance.get_years_data()
+    assert list(years_df.index) == [2024, 2025]
+    assert years_df.loc[2025, "work"] == 70.5  # noqa: PLR2004
+    assert years_df.loc[2025, "overtime"] == 2.5  # noqa: PLR2004
+    assert years_df.loc[2024, "target_time"] == 101.0  # noqa: PLR2004
+
+
+def test_month_report_uses_compact_dtypes(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    mock_db_controller.get_month_data.return_value = (
+        [
+            ("2025-05-01T08:00:00", "start"),
+            ("2025-05-01T12:00:00", "stop"),
+            ("2025-05-01T12:30:00", "start"),
+            ("2025-05-01T16:30:00", "stop"),
+        ],
+        [("2025-05-01", 15)],
+    )
+    month_data = store_instance.generate_month_data(datetime.date(2025, 5, 1))
+    report = month_data.report
+    assert report.work_s.dtype == "int32"
+    assert report.overtime_s.dtype == "int32"
+    assert report.start_min.dtype == "int16"
+    assert report.start_min[0] == 8 * 60
+    assert (report.end_min == NO_MINUTE).sum() == len(report) - 1
+    first_day = month_data.df.loc["2025-05-01"]
+    assert first_day["start_time"] == datetime.time(8, 0)
+    assert first_day["end_time"] == datetime.time(16, 30)
+    assert first_day["work"] == 7.75  # noqa: PLR2004
+    assert first_day["break_time"] == 0.5  # noqa: PLR2004
+    assert month_data.df.loc["2025-05-02", "start_time"] is None
+
+
+def test_parallel_month_generation_matches_serial(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    months = [(2024, month) for month in range(1, 13)] + [(2025, 1)]
+
+    def month_data(selected_date: datetime.date) -> tuple[list[tuple[str, str]], list[tuple[str, int]]]:
+        day = selected_date.replace(day=selected_date.month + 1).isoformat()
+        return [(f"{day}T08:00:00", "start"), (f"{day}T17:30:00", "stop")], [(day, 30)]
+
+    mock_db_controller.get_months_with_data.return_value = months
+    mock_db_controller.get_month_data.side_effect = month_data
+    store_instance.calculate_overtime_totals()
+    serial_frames = {key: store_instance.all_data[key].df for key in months}
+    serial_total = store_instance.total_overtime
+
+    parallel_store = Store()
+    with (
+        patch.object(CONFIG_HANDLER.config, "compute_workers", 2),
+        patch("src.datastore.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as mock_executor,
+    ):
+        parallel_store.calculate_overtime_totals()
+    mock_executor.assert_called_once()
+    assert mock_executor.call_args.kwargs["max_workers"] == 2  # noqa: PLR2004
+    # forking the multithreaded Qt process is not safe
+    assert mock_executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+    assert parallel_store.total_overtime == serial_total
+    for key, frame in serial_frames.items():
+        pd.testing.assert_frame_equal(parallel_store.all_data[key].df, frame)
+
+
+def test_day_change_within_cached_month_does_not_query(store_and_controller: tuple[Store, MagicMock]) -> None:
+    store_instance, mock_db_controller = store_and_controller
+    mock_db_controller.get_month_data.return_value = (
+        [("2025-05-05T08:00:00", "start"), ("2025-05-05T16:00:00", "stop"), ("2025-05-06T09:00:00", "start")],
+        [("2025-05-05", 30)],
+    )
+    store_instance.update_data(datetime.date(2025, 5, 5))
+    mock_db_controller.get_month_data.reset_mock()
+    store_instance.update_data(datetime.date(2025, 5, 6))
+    mock_db_controller.get_month_data.assert_not_called()
+    assert store_instance.daily_data == [("2025-05-06T09:00:00", "start")]
+    store_instance.update_data(datetime.date(2025, 5, 5))
+    mock_db_controller.get_month_data.assert_not_called()
+    assert store_instance.daily_data[-1] == ("Pause", "30")
+
+    # any change of the database is read again
+    mock_db_controller.data_version += 1
+    mock_db_controller.get_month_data.return_value = ([("2025-05-07T08:00:00", "start")], [])
+    store_instance.update_data(datetime.date(2025, 5, 7))
+    mock_db_controller.get_month_data.assert_called_once()
+    assert store_instance.daily_data == [("2025-05-07T08:00:00", "start")]
@@ -0,0 +1,66 @@
+import datetime
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.table_models import DataTableModel, TableData, TableMode
+
+
+def _month_df(days: int, work: float = 8.0) -> pd.DataFrame:
+    return pd.DataFrame({"work": [work] * days}, index=pd.date_range("2025-05-01", periods=days, freq="D"))
+
+
+def _text(model: DataTableModel, row: int, column: int) -> str:
+    return model.data(model.index(row, column))
+
+
+def test_month_table_formats_cells_on_request() -> None:
+    model = DataTableModel()
+    model.set_table(TableData.month(_month_df(31, work=8.26)))
+    assert model.rowCount() == 31  # noqa: PLR2004
+    assert model.columnCount() == 2  # noqa: PLR2004
+    assert _text(model, 0, 0) == "01/05/2025"
+    assert _text(model, 0, 1) == "8.3"
+    assert model.row_values(1)[0] == datetime.date(2025, 5, 2)
+
+
+def test_only_changed_rows_are_announced() -> None:
+    model = DataTableModel()
+    model.set_table(TableData.month(_month_df(31)))
+    changed, reset = MagicMock(), MagicMock()
+    model.dataChanged.connect(changed)
+    model.modelReset.connect(reset)
+    df = _month_df(31)
+    df.iloc[[3, 5], 0] = 6.0
+    model.set_table(TableData.month(df))
+    first, last = changed.call_args.args[:2]
+    assert (first.row(), last.row(), last.column()) == (3, 5, 1)
+    reset.assert_not_called()
+
+
+def test_rows_are_removed_for_shorter_month() -> None:
+    model = DataTableModel()
+    model.set_table(TableData.month(_month_df(31)))
+    removed = MagicMock()
+    model.rowsRemoved.connect(removed)
+    model.set_table(TableData.month(_month_df(28)))
+    assert removed.call_args.args[1:] == (28, 30)
+    assert model.rowCount() == 28  # noqa: PLR2004
+
+
+def test_mode_change_resets_model() -> None:
+    model = DataTableModel()
+    model.set_table(TableData.month(_month_df(31)))
+    reset = MagicMock()
+    model.modelReset.connect(reset)
+    years_df = pd.DataFrame({"work": [1500.0], "overtime": [-12.25]}, index=[2025])
+    model.set_table(TableData.years(years_df))
+    reset.assert_called_once()
+    assert model.columnCount() == 3  # noqa: PLR2004
+    assert [_text(model, 0, column) for column in range(3)] == ["2025", "1500.0", "-12.2"]
+
+
+def test_table_modes_cycle() -> None:
+    assert TableMode.MONTH.next == TableMode.DAY
+    assert TableMode.DAY.next == TableMode.YEARS
+    assert TableMode.YEARS.next == TableMode.MONTH
@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock, patch
+
+from PyQt6.QtCore import QEvent
+
+from src.theme import ThemeService
+
+
+def test_theme_is_queried_once() -> None:
+    theme = ThemeService()
+    with patch("src.theme.darkdetect.isLight", return_value=True) as mock_is_light:
+        assert theme.is_light
+        assert theme.background_color == "#f8f9fa"
+        assert theme.font_color == "#4d5157"
+        assert theme.style_name == "light"
+    mock_is_light.assert_called_once()
+
+
+def test_refresh_only_signals_switched_theme() -> None:
+    theme = ThemeService()
+    changed = MagicMock()
+    theme.changed.connect(changed)
+    with patch("src.theme.darkdetect.isLight", side_effect=[True, True, None]):
+        assert theme.is_light
+        assert not theme.refresh()
+        assert theme.refresh()
+    changed.assert_called_once()
+    assert theme.version == 1
+    assert theme.font_color == "#e4e7eb"
+
+
+def test_palette_change_refreshes_theme() -> None:
+    # before Qt 6.5 only the palette change event tells about a switched OS theme
+    theme = ThemeService()
+    with patch("src.theme.darkdetect.isLight", side_effect=[True, False]):
+        assert theme.is_light
+        theme.eventFilter(None, QEvent(QEvent.Type.ApplicationPaletteChange))
+    assert not theme.is_light
@@ -0,0 +1,61 @@
+import datetime
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from src.database_controller import DatabaseController
+from src.time_off_list import TimeOffCache, TimeOffEntry, TimeOffListModel
+
+
+@pytest.fixture
+def cache(db_controller: DatabaseController) -> Generator[TimeOffCache, None, None]:
+    with patch("src.time_off_list.DB_CONTROLLER", db_controller):
+        db_controller.add_time_off(datetime.date(2025, 7, 1), "Vacation")
+        db_controller.add_time_off(datetime.date(2025, 7, 22), "Sick Leave")
+        yield TimeOffCache()
+
+
+def test_years_are_queried_once(cache: TimeOffCache, db_controller: DatabaseController) -> None:
+    with patch.object(db_controller, "get_time_off", wraps=db_controller.get_time_off) as mock_get:
+        assert [entry.date.day for entry in cache.get_year(2025)] == [22, 1]
+        cache.get_year(2024)
+        cache.get_year(2025)
+    assert mock_get.call_count == 2  # noqa: PLR2004
+
+
+def test_own_changes_keep_cache(cache: TimeOffCache, db_controller: DatabaseController) -> None:
+    cache.get_year(2025)
+    with patch.object(db_controller, "get_time_off", wraps=db_controller.get_time_off) as mock_get:
+        cache.add(datetime.date(2025, 7, 10), "Personal Day")
+        cache.remove(datetime.date(2025, 7, 1))
+        cache.change_reason(datetime.date(2025, 7, 22), "Other")
+        entries = cache.get_year(2025)
+    mock_get.assert_not_called()
+    assert entries == [
+        TimeOffEntry(datetime.date(2025, 7, 22), "Other"),
+        TimeOffEntry(datetime.date(2025, 7, 10), "Personal Day"),
+    ]
+    assert [time_off.reason for time_off in db_controller.get_time_off(2025)] == ["Personal Day", "Other"]
+
+
+def test_add_existing_day_changes_reason(cache: TimeOffCache, db_controller: DatabaseController) -> None:
+    cache.add(datetime.date(2025, 7, 1), "Sick Leave")
+    stored = [TimeOffEntry(time_off.date, time_off.reason) for time_off in db_controller.get_time_off(2025)]
+    assert cache.get_year(2025) == sorted(stored, key=lambda entry: entry.date, reverse=True)
+    assert TimeOffEntry(datetime.date(2025, 7, 1), "Sick Leave") in stored
+
+
+def test_other_changes_drop_cache(cache: TimeOffCache, db_controller: DatabaseController) -> None:
+    cache.get_year(2025)
+    db_controller.add_time_off(datetime.date(2025, 8, 1), "Vacation")
+    assert len(cache.get_year(2025)) == 3  # noqa: PLR2004
+
+
+def test_model_removes_row(cache: TimeOffCache) -> None:
+    model = TimeOffListModel(cache)
+    model.set_year(2025)
+    assert model.data(model.index(1, 0)) == "07-01 | July 1st"
+    model.remove_entry(0)
+    assert model.rowCount() == 1
+    assert [entry.date for entry in cache.get_year(2025)] == [datetime.date(2025, 7, 1)]
@@ -305,6 +305,22 @@ class Ui_ConfigWindow(object):
         self.input_different_times.setChecked(False)
         self.input_different_times.setObjectName("input_different_times")
         self.gridLayout_2.addWidget(self.input_different_times, 2, 1, 1, 3)
+        self.label_12 = QtWidgets.QLabel(parent=self.scrollAreaWidgetContents)
+        self.label_12.setMaximumSize(QtCore.QSize(16777215, 50))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.label_12.setFont(font)
+        self.label_12.setObjectName("label_12")
+        self.gridLayout_2.addWidget(self.label_12, 7, 0, 1, 1)
+        self.input_valid_from = QtWidgets.QDateEdit(parent=self.scrollAreaWidgetContents)
+        self.input_valid_from.setMinimumSize(QtCore.QSize(0, 35))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.input_valid_from.setFont(font)
+        self.input_valid_from.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.input_valid_from.setCalendarPopup(True)
+        self.input_valid_from.setObjectName("input_valid_from")
+        self.gridLayout_2.addWidget(self.input_valid_from, 7, 1, 1, 3)
         self.verticalLayout_3.addLayout(self.gridLayout_2)
         self.scrollArea.setWidget(self.scrollAreaWidgetContents)
         self.verticalLayout.addWidget(self.scrollArea)
@@ -341,6 +357,9 @@ class Ui_ConfigWindow(object):
         self.radio_weekday_5.setText(_translate("ConfigWindow", "Sat"))
         self.radio_weekday_6.setText(_translate("ConfigWindow", "Sun"))
         self.input_different_times.setText(_translate("ConfigWindow", "Define different times for each day"))
+        self.label_12.setText(_translate("ConfigWindow", "Valid From:"))
+        self.input_valid_from.setToolTip(_translate("ConfigWindow", "Work hours and workdays only apply from this date on, previous months keep their targets"))
+        self.input_valid_from.setDisplayFormat(_translate("ConfigWindow", "dd/MM/yyyy"))
         self.apply_button.setText(_translate("ConfigWindow", "Apply"))
 
 
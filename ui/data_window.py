@@ -31,7 +31,6 @@ class Ui_DataWindow(object):
         font = QtGui.QFont()
         font.setPointSize(20)
         self.switch_button.setFont(font)
-        self.switch_button.setCheckable(True)
         self.switch_button.setObjectName("switch_button")
         self.horizontalLayout_3.addWidget(self.switch_button)
         self.verticalLayout.addLayout(self.horizontalLayout_3)
@@ -43,29 +42,17 @@ class Ui_DataWindow(object):
         self.label_overtime.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         self.label_overtime.setObjectName("label_overtime")
         self.verticalLayout.addWidget(self.label_overtime)
-        self.tableWidget = QtWidgets.QTableWidget(parent=DataWindow)
-        self.tableWidget.setMinimumSize(QtCore.QSize(500, 0))
-        self.tableWidget.setMaximumSize(QtCore.QSize(600, 16777215))
-        self.tableWidget.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        self.tableWidget.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.tableWidget.setColumnCount(2)
-        self.tableWidget.setObjectName("tableWidget")
-        self.tableWidget.setRowCount(0)
-        item = QtWidgets.QTableWidgetItem()
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        item.setFont(font)
-        self.tableWidget.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        item.setFont(font)
-        self.tableWidget.setHorizontalHeaderItem(1, item)
-        self.tableWidget.horizontalHeader().setDefaultSectionSize(200)
-        self.tableWidget.horizontalHeader().setMinimumSectionSize(100)
-        self.tableWidget.horizontalHeader().setStretchLastSection(True)
-        self.tableWidget.verticalHeader().setSortIndicatorShown(False)
-        self.verticalLayout.addWidget(self.tableWidget)
+        self.table_view = QtWidgets.QTableView(parent=DataWindow)
+        self.table_view.setMinimumSize(QtCore.QSize(500, 0))
+        self.table_view.setMaximumSize(QtCore.QSize(600, 16777215))
+        self.table_view.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+        self.table_view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setObjectName("table_view")
+        self.table_view.horizontalHeader().setDefaultSectionSize(200)
+        self.table_view.horizontalHeader().setMinimumSectionSize(100)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.verticalHeader().setSortIndicatorShown(False)
+        self.verticalLayout.addWidget(self.table_view)
         self.delete_event_button = QtWidgets.QPushButton(parent=DataWindow)
         self.delete_event_button.setMinimumSize(QtCore.QSize(0, 50))
         self.delete_event_button.setMaximumSize(QtCore.QSize(600, 50))
@@ -151,10 +138,6 @@ class Ui_DataWindow(object):
         self.export_button.setText(_translate("DataWindow", "Export"))
         self.switch_button.setText(_translate("DataWindow", "Month"))
         self.label_overtime.setText(_translate("DataWindow", "Overtime: +/- X hours"))
-        item = self.tableWidget.horizontalHeaderItem(0)
-        item.setText(_translate("DataWindow", "Date"))
-        item = self.tableWidget.horizontalHeaderItem(1)
-        item.setText(_translate("DataWindow", "Worktime (h)"))
         self.delete_event_button.setText(_translate("DataWindow", "Delete Event"))
         self.button_month_prev.setText(_translate("DataWindow", "<"))
         self.date_edit.setDisplayFormat(_translate("DataWindow", "dd/MM/yyyy"))
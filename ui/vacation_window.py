@@ -81,14 +81,14 @@ class Ui_VacationWindow(object):
         self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.scrollAreaWidgetContents)
         self.verticalLayout_3.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_3.setObjectName("verticalLayout_3")
-        self.list_widget_dates = QtWidgets.QListWidget(parent=self.scrollAreaWidgetContents)
+        self.list_view_dates = QtWidgets.QListView(parent=self.scrollAreaWidgetContents)
         font = QtGui.QFont()
         font.setPointSize(12)
-        self.list_widget_dates.setFont(font)
-        self.list_widget_dates.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.list_widget_dates.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
-        self.list_widget_dates.setObjectName("list_widget_dates")
-        self.verticalLayout_3.addWidget(self.list_widget_dates)
+        self.list_view_dates.setFont(font)
+        self.list_view_dates.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.list_view_dates.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.list_view_dates.setObjectName("list_view_dates")
+        self.verticalLayout_3.addWidget(self.list_view_dates)
         self.scrollArea.setWidget(self.scrollAreaWidgetContents)
         self.verticalLayout.addWidget(self.scrollArea)
 
@@ -103,7 +103,6 @@ class Ui_VacationWindow(object):
         self.date_edit.setDisplayFormat(_translate("VacationWindow", "dd/MM/yyyy"))
         self.save_button.setText(_translate("VacationWindow", "Add"))
         self.label_list_view.setText(_translate("VacationWindow", "List of time off days in year x"))
-        self.list_widget_dates.setSortingEnabled(False)
 
 
 if __name__ == "__main__":